@@ -3,35 +3,32 @@
 # ============================================================
 
 from typing import Optional, Literal, cast
-from fastapi import APIRouter, Depends, HTTPException, Response, Header, Cookie, Request
+from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, EmailStr, Field, model_validator
-from sqlalchemy.orm import Session
-from jose import jwt, JWTError, ExpiredSignatureError  # type: ignore
-from authlib.integrations.starlette_client import OAuth, OAuthError  # type: ignore
-import httpx  # type: ignore
-from app.db.database import get_db
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from authlib.integrations.starlette_client import OAuthError  # type: ignore
+from app.db.database import get_async_db
 from app.db import models
-from app.core.security import hash_password, create_access_token, verify_password
+from app.db.sql import dialect_insert, unique_violation
+from app.api.deps import Principal, get_current_principal, get_current_user_from_cookie
+from app.core.auth_cache import UserSnapshot, auth_cache
+from app.core.security import (
+    PasswordHasherBusyError,
+    create_access_token,
+    hash_password_async,
+    make_unusable_password,
+    verify_password_async,
+)
 from app.core.config import settings
+from app.core.http import http_client
+from app.core.oauth import get_oauth_client
 from app.core.utils import capitalize_name
 
 router = APIRouter()
 
-# Initialize OAuth (lazy initialization to avoid import errors)
-oauth = None
-
-def get_oauth():
-    """Get or create OAuth instance."""
-    global oauth
-    if oauth is None:
-        try:
-            oauth = OAuth()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"OAuth initialization failed: {str(e)}")
-    return oauth
-
-
 class RegisterRequest(BaseModel):
     email: Optional[EmailStr] = None
     username: Optional[str] = None
@@ -57,59 +54,93 @@ class LoginRequest(BaseModel):
         return self
 
 
+def password_hasher_busy_exception(e: PasswordHasherBusyError) -> HTTPException:
+    """503 with a Retry-After hint when the bcrypt pool is saturated."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def unique_field(e: IntegrityError) -> Optional[str]:
+    """Which users field a unique violation was on: "provider" (OAuth identity), "email" or "username"."""
+    violated = unique_violation(e)
+    if violated is None:
+        return None
+    for field in ("provider", "email", "username"):
+        if field in violated:
+            return field
+    return None
+
+
 @router.post("/register")
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a local account in one INSERT ... RETURNING; duplicates are detected
+    by the unique indexes on email/username (race-free) and mapped to 400s.
+    """
     try:
-        # Check for duplicate email if email is provided
-        if payload.email:
-            existing_email = db.query(models.User).filter(models.User.email == payload.email).first()
-            if existing_email:
-                raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Check for duplicate username if username is provided
-        if payload.username:
-            existing_username = db.query(models.User).filter(models.User.username == payload.username).first()
-            if existing_username:
-                raise HTTPException(status_code=400, detail="Username already taken")
-
-        new_user = models.User(
-            email=payload.email,
-            username=payload.username,
-            name=capitalize_name(payload.name),
-            hashed_password=hash_password(payload.password)
+        hashed_password = await hash_password_async(payload.password)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception(e)
+
+    try:
+        await db.scalar(
+            insert(models.User)
+            .values(
+                email=payload.email,
+                username=payload.username,
+                name=capitalize_name(payload.name),
+                hashed_password=hashed_password,
+                provider="local",
+            )
+            .returning(models.User.id)
         )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
         return {"message": "User registered successfully"}
-    except Exception as e:
-        db.rollback()
-        # Log the actual error for debugging
-        error_msg = str(e)
+    except IntegrityError as e:
+        await db.rollback()
+        field = unique_field(e)
+        if field == "email":
+            raise HTTPException(status_code=400, detail="Email already registered")
+        if field == "username":
+            raise HTTPException(status_code=400, detail="Username already taken")
+
+        error_msg = str(e.orig)
         print(f"❌ Registration error: {error_msg}")
-        
+
         # Check if it's a database constraint error (email NOT NULL)
         if "not null" in error_msg.lower() or "null value" in error_msg.lower():
             raise HTTPException(
                 status_code=500,
                 detail="Database schema needs to be updated. Please run: ALTER TABLE users ALTER COLUMN email DROP NOT NULL;"
             )
-        
-        # Re-raise HTTPExceptions as-is
-        if isinstance(e, HTTPException):
-            raise e
-        
-        # Generic error
+        raise HTTPException(status_code=500, detail=f"Registration failed: {error_msg}")
+    except Exception as e:
+        await db.rollback()
+        # Log the actual error for debugging
+        error_msg = str(e)
+        print(f"❌ Registration error: {error_msg}")
         raise HTTPException(status_code=500, detail=f"Registration failed: {error_msg}")
 
 
 @router.post("/login")
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    q = db.query(models.User)
-    db_user = q.filter(models.User.email == payload.email).first() if payload.email else q.filter(models.User.username == payload.username).first()
+async def login(payload: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    query = select(models.User.id, models.User.hashed_password).limit(1)
+    if payload.email:
+        query = query.where(models.User.email == payload.email)
+    else:
+        query = query.where(models.User.username == payload.username)
+    db_user = (await db.execute(query)).first()
+    # Release the connection before the (slow) bcrypt check
+    await db.close()
 
-    if not db_user or not verify_password(payload.password, db_user.hashed_password):
-        raise HTTPException(status_code=400, detail="Invalid credentials")
+    try:
+        if not db_user or not await verify_password_async(payload.password, db_user.hashed_password):
+            raise HTTPException(status_code=400, detail="Invalid credentials")
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception(e)
 
     token = create_access_token({"sub": str(db_user.id)})
 
@@ -149,37 +180,13 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
 
 
 @router.get("/me")
-def read_me(
-        authorization: Optional[str] = Header(None),
-        access_token: Optional[str] = Cookie(None),
-        db: Session = Depends(get_db)
-):
-    token = None
-    if authorization and authorization.lower().startswith("bearer "):
-        token = authorization.split(" ", 1)[1]
-    elif access_token:
-        token = access_token
-
-    if not token:
-        raise HTTPException(status_code=401, detail="Authentication required")
-
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id = int(payload.get("sub"))
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except (JWTError, ValueError, TypeError):
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    user = db.get(models.User, user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
+def read_me(current_user: UserSnapshot = Depends(get_current_user_from_cookie)):
+    """Current user's profile (served from the auth cache on repeat requests)."""
     return {
-        "id": user.id,
-        "email": user.email,
-        "username": user.username,
-        "name": capitalize_name(user.name)
+        "id": current_user.id,
+        "email": current_user.email,
+        "username": current_user.username,
+        "name": capitalize_name(current_user.name)
     }
 
 
@@ -189,42 +196,26 @@ class ChangePasswordRequest(BaseModel):
 
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     payload: ChangePasswordRequest,
-    authorization: Optional[str] = Header(None),
-    access_token: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password. Requires old password verification."""
-    token = None
-    if authorization and authorization.lower().startswith("bearer "):
-        token = authorization.split(" ", 1)[1]
-    elif access_token:
-        token = access_token
-
-    if not token:
-        raise HTTPException(status_code=401, detail="Authentication required")
+    user = await current_user.load_user_async(db)
 
     try:
-        payload_jwt = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id = int(payload_jwt.get("sub"))
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except (JWTError, ValueError, TypeError):
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    user = db.get(models.User, user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-
-    # Verify old password
-    if not verify_password(payload.old_password, user.hashed_password):
-        raise HTTPException(status_code=400, detail="Current password is incorrect")
-
-    # Update password
-    user.hashed_password = hash_password(payload.new_password)
-    db.commit()
-    db.refresh(user)
+        # Verify old password
+        if not await verify_password_async(payload.old_password, user.hashed_password):
+            raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+        # Update password
+        user.hashed_password = await hash_password_async(payload.new_password)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception(e)
+
+    await db.commit()
+    auth_cache.invalidate_user(user.id)
 
     return {"message": "Password changed successfully"}
 
@@ -264,78 +255,94 @@ def set_auth_cookie(response: Response, token: str):
         )
 
 
-def get_or_create_oauth_user(
-    db: Session,
+async def get_or_create_oauth_user(
+    db: AsyncSession,
     email: str,
     provider: str,
     provider_id: str,
     name: Optional[str] = None,
     username: Optional[str] = None
 ) -> models.User:
-    """Get existing OAuth user or create a new one."""
-    # First, try to find by provider_id
-    user = db.query(models.User).filter(
-        models.User.provider == provider,
-        models.User.provider_id == provider_id
-    ).first()
-    
-    if user:
-        # Update email/name if changed
-        if email and user.email != email:
-            user.email = email
-        if name and user.name != name:
-            user.name = capitalize_name(name)
-        db.commit()
-        db.refresh(user)
-        return user
-    
-    # If not found by provider_id, check by email
-    user = db.query(models.User).filter(models.User.email == email).first()
-    
-    if user:
-        # Link OAuth to existing account
-        user.provider = provider
-        user.provider_id = provider_id
+    """
+    Resolve an OAuth sign-in to an account:
+
+    1. A known (provider, provider_id) identity signs in to its own account,
+       with email and name refreshed from the provider (UPDATE ... RETURNING).
+    2. A new identity goes through INSERT ... ON CONFLICT (email) DO UPDATE
+       ... RETURNING, which creates the account, or links the identity to the
+       account that already owns the email.
+
+    Concurrent first sign-ins of one identity hit the (provider, provider_id)
+    index, and the loser falls back to step 1.
+    """
+    name = capitalize_name(name)
+    identity = (models.User.provider == provider, models.User.provider_id == provider_id)
+
+    async def sign_in_identity() -> Optional[models.User]:
+        values = {"email": email}
         if name:
-            user.name = capitalize_name(name)
-        db.commit()
-        db.refresh(user)
-        return user
-    
-    # Create new user
-    # OAuth users don't need a password, but we'll set a random one for safety
-    # (they'll never use it since they login via OAuth)
-    random_password = hash_password(f"oauth_{provider}_{provider_id}_no_password")
-    
-    new_user = models.User(
-        email=email,
-        name=capitalize_name(name),
-        username=username,
-        hashed_password=random_password,
-        provider=provider,
-        provider_id=provider_id
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+            values["name"] = name
+        return await db.scalar(
+            update(models.User).where(*identity).values(**values).returning(models.User),
+            execution_options={"populate_existing": True},
+        )
+
+    async def upsert(username: Optional[str]) -> models.User:
+        stmt = dialect_insert(models.User).values(
+            email=email,
+            name=name,
+            username=username,
+            # OAuth users log in through the provider, so no password can match
+            hashed_password=make_unusable_password(),
+            provider=provider,
+            provider_id=provider_id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.User.email],
+            set_={
+                "provider": stmt.excluded.provider,
+                "provider_id": stmt.excluded.provider_id,
+                "name": func.coalesce(stmt.excluded.name, models.User.name),
+            },
+        ).returning(models.User)
+        return await db.scalar(stmt, execution_options={"populate_existing": True})
+
+    user = await sign_in_identity()
+    while user is None:
+        try:
+            user = await upsert(username)
+        except IntegrityError as e:
+            await db.rollback()
+            field = unique_field(e)
+            if field == "username" and username:
+                # The provider login is taken by another account; sign up without one
+                username = None
+                continue
+            if field == "provider":
+                user = await sign_in_identity()
+                if user is not None:
+                    break
+            raise
+
+    await db.commit()
+    auth_cache.invalidate_user(user.id)
+    return user
 
 
 # ============================================================
 # 🔵 Google OAuth
 # ============================================================
 
-# Register Google OAuth
-# Note: We'll register it dynamically in the route to handle missing config gracefully
+# Google is registered once at startup (app.core.oauth) when configured
 
 
 @router.get("/google/login")
 async def google_login(request: Request):
     """Initiate Google OAuth login."""
     try:
-        oauth_instance = get_oauth()
+        oauth_client = get_oauth_client("google")
         
-        if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
+        if oauth_client is None:
             raise HTTPException(
                 status_code=500, 
                 detail="Google OAuth not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables."
@@ -372,23 +379,9 @@ async def google_login(request: Request):
         print(f"🔐 Session ID before OAuth: {session.get('_id', 'not set')}")
         print(f"🔐 Session keys before redirect: {list(session.keys())}")
         
-        # Register Google OAuth if not already registered
-        try:
-            _ = oauth_instance.google
-        except (AttributeError, KeyError):
-            oauth_instance.register(
-                name="google",
-                client_id=settings.GOOGLE_CLIENT_ID,
-                client_secret=settings.GOOGLE_CLIENT_SECRET,
-                server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-                client_kwargs={
-                    "scope": "openid email profile"
-                }
-            )
-        
         # ✅ Use authorize_redirect which will set the state in the session
         # Create a response object to ensure session is saved
-        response = await oauth_instance.google.authorize_redirect(request, redirect_uri)
+        response = await oauth_client.authorize_redirect(request, redirect_uri)
         
         # ✅ Explicitly ensure session is saved before redirect
         # The session middleware should handle this, but we'll verify it's in the response
@@ -405,11 +398,11 @@ async def google_login(request: Request):
 
 
 @router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Handle Google OAuth callback."""
-    oauth_instance = get_oauth()
+    oauth_client = get_oauth_client("google")
     
-    if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
+    if oauth_client is None:
         raise HTTPException(
             status_code=500, 
             detail="Google OAuth not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables."
@@ -441,34 +434,19 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     print(f"🔐 Session keys in callback: {list(session.keys())}")
     print(f"🔐 All cookies received: {list(request.cookies.keys())}")
     
-    # Ensure Google OAuth is registered
-    try:
-        _ = oauth_instance.google
-    except (AttributeError, KeyError):
-        oauth_instance.register(
-            name="google",
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-            client_kwargs={
-                "scope": "openid email profile"
-            }
-        )
-    
     try:
         # ✅ authorize_access_token will verify the state from the session
-        token = await oauth_instance.google.authorize_access_token(request)
+        token = await oauth_client.authorize_access_token(request)
         user_info = token.get("userinfo")
         
         if not user_info:
             # Fetch user info if not in token
             access_token = token.get("access_token")
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                user_info = resp.json()
+            resp = await http_client.client.get(
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            user_info = resp.json()
         
         email = user_info.get("email")
         provider_id = user_info.get("sub") or str(user_info.get("id", ""))
@@ -478,7 +456,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Email not provided by Google")
         
         # Get or create user
-        user = get_or_create_oauth_user(
+        user = await get_or_create_oauth_user(
             db=db,
             email=email,
             provider="google",
@@ -508,16 +486,16 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
 # 🐙 GitHub OAuth
 # ============================================================
 
-# Register GitHub OAuth dynamically in routes
+# GitHub is registered once at startup (app.core.oauth) when configured
 
 
 @router.get("/github/login")
 async def github_login(request: Request):
     """Initiate GitHub OAuth login."""
     try:
-        oauth_instance = get_oauth()
+        oauth_client = get_oauth_client("github")
         
-        if not settings.GITHUB_CLIENT_ID or not settings.GITHUB_CLIENT_SECRET:
+        if oauth_client is None:
             raise HTTPException(
                 status_code=500, 
                 detail="GitHub OAuth not configured. Please set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET environment variables."
@@ -547,23 +525,7 @@ async def github_login(request: Request):
         print(f"🔐 GitHub OAuth redirect URI: {redirect_uri}")
         print(f"🔐 Environment: {settings.ENV}")
         
-        # Register GitHub OAuth if not already registered
-        try:
-            _ = oauth_instance.github
-        except (AttributeError, KeyError):
-            oauth_instance.register(
-                name="github",
-                client_id=settings.GITHUB_CLIENT_ID,
-                client_secret=settings.GITHUB_CLIENT_SECRET,
-                access_token_url="https://github.com/login/oauth/access_token",
-                authorize_url="https://github.com/login/oauth/authorize",
-                api_base_url="https://api.github.com/",
-                client_kwargs={
-                    "scope": "user:email"
-                }
-            )
-        
-        return await oauth_instance.github.authorize_redirect(request, redirect_uri)
+        return await oauth_client.authorize_redirect(request, redirect_uri)
     except HTTPException:
         raise
     except Exception as e:
@@ -574,11 +536,11 @@ async def github_login(request: Request):
 
 
 @router.get("/github/callback")
-async def github_callback(request: Request, db: Session = Depends(get_db)):
+async def github_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Handle GitHub OAuth callback."""
-    oauth_instance = get_oauth()
+    oauth_client = get_oauth_client("github")
     
-    if not settings.GITHUB_CLIENT_ID or not settings.GITHUB_CLIENT_SECRET:
+    if oauth_client is None:
         raise HTTPException(
             status_code=500, 
             detail="GitHub OAuth not configured. Please set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET environment variables."
@@ -604,46 +566,30 @@ async def github_callback(request: Request, db: Session = Depends(get_db)):
     
     print(f"🔐 GitHub OAuth callback - redirect URI: {redirect_uri}")
     
-    # Ensure GitHub OAuth is registered
-    try:
-        _ = oauth_instance.github
-    except (AttributeError, KeyError):
-        oauth_instance.register(
-            name="github",
-            client_id=settings.GITHUB_CLIENT_ID,
-            client_secret=settings.GITHUB_CLIENT_SECRET,
-            access_token_url="https://github.com/login/oauth/access_token",
-            authorize_url="https://github.com/login/oauth/authorize",
-            api_base_url="https://api.github.com/",
-            client_kwargs={
-                "scope": "user:email"
-            }
-        )
-    
     try:
-        token = await oauth_instance.github.authorize_access_token(request)
+        token = await oauth_client.authorize_access_token(request)
         access_token = token.get("access_token")
         
-        # Fetch user info from GitHub API
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                "https://api.github.com/user",
+        # Fetch user info from GitHub API over the shared pool: both calls reuse one keep-alive connection
+        client = http_client.client
+        resp = await client.get(
+            "https://api.github.com/user",
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        user_info = resp.json()
+        
+        # Get email (may need to fetch from emails endpoint)
+        email = user_info.get("email")
+        if not email:
+            # Try to get primary email from emails endpoint
+            emails_resp = await client.get(
+                "https://api.github.com/user/emails",
                 headers={"Authorization": f"Bearer {access_token}"}
             )
-            user_info = resp.json()
-            
-            # Get email (may need to fetch from emails endpoint)
-            email = user_info.get("email")
-            if not email:
-                # Try to get primary email from emails endpoint
-                emails_resp = await client.get(
-                    "https://api.github.com/user/emails",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                emails = emails_resp.json()
-                primary_email = next((e.get("email") for e in emails if e.get("primary")), None)
-                email = primary_email or (emails[0].get("email") if emails else None)
-        
+            emails = emails_resp.json()
+            primary_email = next((e.get("email") for e in emails if e.get("primary")), None)
+            email = primary_email or (emails[0].get("email") if emails else None)
+
         provider_id = str(user_info.get("id", ""))
         name = user_info.get("name") or user_info.get("login")
         username = user_info.get("login")
@@ -652,7 +598,7 @@ async def github_callback(request: Request, db: Session = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Email not provided by GitHub")
         
         # Get or create user
-        user = get_or_create_oauth_user(
+        user = await get_or_create_oauth_user(
             db=db,
             email=email,
             provider="github",
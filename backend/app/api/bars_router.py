@@ -0,0 +1,67 @@
+# backend/app/api/bars_router.py
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.api.deps import Principal, get_current_principal
+from app.core.config import settings
+from app.market.bars import bar_store
+from app.market.polygon import MarketDataError, MarketDataNotConfiguredError
+from app.market.symbols import symbol_directory
+from app.schemas import market
+
+router = APIRouter()
+
+
+@router.get("/bars/{symbol}", response_model=market.BarsResponse)
+async def get_bars(
+    symbol: str,
+    from_date: Optional[date] = Query(None, alias="from", description="First day (default: a year before `to`)"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day (default: today, UTC)"),
+    timespan: Literal["day", "minute"] = "day",
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    OHLCV bars for a symbol from the local bar store. Only bars newer than the
+    last stored one (or an older range never fetched) are requested upstream,
+    so repeated chart views are disk reads. Minute bars are limited to the
+    last BARS_MINUTE_MAX_DAYS days.
+    """
+    valid, _ = symbol_directory.validate([symbol])
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown symbol: {symbol.strip().upper()}"
+        )
+    symbol = valid[0]
+
+    today = datetime.now(timezone.utc).date()
+    to_date = to_date or today
+    from_date = from_date or to_date - timedelta(days=365)
+    max_days = settings.BARS_DAY_MAX_DAYS if timespan == "day" else settings.BARS_MINUTE_MAX_DAYS
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`from` must not be after `to`"
+        )
+    if (to_date - from_date).days > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_days} days of {timespan} bars per request"
+        )
+    if timespan == "minute" and (today - from_date).days > settings.BARS_MINUTE_MAX_DAYS:
+        # A symbol's first request backfills from `from` up to today, so an old
+        # window would pull every minute bar since then; cap the lookback instead
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Minute bars are only available for the last {settings.BARS_MINUTE_MAX_DAYS} days"
+        )
+
+    try:
+        bars = await bar_store.get_bars(symbol, timespan, from_date, to_date)
+    except MarketDataNotConfiguredError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except MarketDataError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Market data unavailable: {e}")
+
+    return market.BarsResponse(symbol=symbol, timespan=timespan, count=len(bars), **bars.columns())
@@ -1,50 +1,133 @@
 # backend/app/api/chat_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user_from_cookie
-from app.db.database import get_db
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import Principal, get_current_principal
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
 from app.db import models
 from app.core.config import settings
+from app.chat.context import context_manager
+from app.chat.persistence import chat_writer
+from app.chat.response_cache import response_cache
+from app.llm import client as llm
+from app.llm.scheduler import LLMBusyError, Priority
+import asyncio
+import json
 import logging
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Lazy initialization of OpenAI client to avoid import-time errors
-_client: Optional[object] = None
+CHAT_MODEL = settings.LLM_CHAT_MODEL
+CHAT_TEMPERATURE = 0.7
+CHAT_MAX_TOKENS = 1000
 
+# System prompt to make the AI act as a trading assistant
+SYSTEM_PROMPT = """You are an expert AI trading assistant for Profit Path, a financial trading platform. 
+Your role is to help users with:
+- Market analysis and insights
+- Trading strategies and techniques
+- Stock recommendations and analysis
+- Risk management advice
+- General financial market questions
+
+Always provide accurate, helpful, and professional responses. If asked about specific stocks, provide balanced analysis 
+and remind users that this is not financial advice. Be concise but informative."""
 
-def get_openai_client():
+
+async def complete_text(messages: list[dict], max_tokens: int) -> str:
     """
-    Lazy initialization of OpenAI client.
-    Only creates the client when needed and if API key is available.
+    Plain (non-streaming) completion used for background work such as summaries.
     """
-    global _client
-    
-    if _client is not None:
-        return _client
-    
-    if not settings.OPENAI_API_KEY or not settings.OPENAI_API_KEY.strip():
-        logger.warning("⚠️ OPENAI_API_KEY not set. Chat functionality will be limited.")
-        return None
-    
+    if not llm.is_configured():
+        return ""
+    return await llm.complete(
+        messages,
+        model=CHAT_MODEL,
+        temperature=0.2,
+        max_tokens=max_tokens,
+        priority=Priority.BATCH,
+    )
+
+
+# Rolling summaries are generated with the same model as chat replies
+context_manager.set_completer(complete_text)
+
+# Stream writes in flight, referenced so they aren't garbage collected mid-write
+_stream_writes: set[asyncio.Task] = set()
+
+
+def _log_stream_write(task: asyncio.Task) -> None:
+    _stream_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"❌ Failed to save streamed chat message: {str(task.exception())}", exc_info=task.exception())
+
+
+async def save_streamed_turns(user_id: int, text: str, ai_response: str) -> None:
+    """
+    Persist a streamed exchange through the write-behind queue. The write runs
+    as its own task, so cancelling the stream (client disconnect) can't drop
+    it; the caller only waits for it.
+    """
+    messages = [models.ChatMessage(user_id=user_id, role="user", content=text)]
+    if ai_response:
+        messages.append(models.ChatMessage(user_id=user_id, role="assistant", content=ai_response))
+    task = asyncio.ensure_future(chat_writer.write(*messages))
+    _stream_writes.add(task)
+    task.add_done_callback(_log_stream_write)
     try:
-        from openai import OpenAI
-        # Initialize without passing proxies to avoid httpx compatibility issues
-        _client = OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            http_client=None  # Let OpenAI SDK create its own client
-        )
-        logger.info("✅ OpenAI client initialized successfully")
-        return _client
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize OpenAI client: {str(e)}", exc_info=True)
+        await asyncio.shield(task)
+    except Exception:
+        pass  # Logged by _log_stream_write
+
+
+async def build_chat_messages(db: AsyncSession, user_id: int, message: str) -> list[dict]:
+    """
+    Build the chat messages array: system prompt, rolling summary,
+    token-budgeted recent history, new message.
+    Generic (cacheable) questions are sent without history so their answer
+    can be shared through the response cache.
+    """
+    if settings.CHAT_CACHE_ENABLED and response_cache.is_cacheable(message):
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": message},
+        ]
+    return await context_manager.build_messages(db, user_id, SYSTEM_PROMPT, message)
+
+
+def get_cached_response(message: str) -> Optional[str]:
+    """Look up a shared answer for a generic question, if caching is enabled."""
+    if not settings.CHAT_CACHE_ENABLED:
         return None
+    return response_cache.get(CHAT_MODEL, message)
+
+
+def cache_response(message: str, response: str) -> None:
+    if settings.CHAT_CACHE_ENABLED:
+        response_cache.set(CHAT_MODEL, message, response)
+
+
+def llm_busy_exception(e: LLMBusyError) -> HTTPException:
+    """429 with a Retry-After hint for requests the LLM scheduler turned away."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a single Server-Sent Events frame."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
 
 
 class ChatMessageRequest(BaseModel):
@@ -77,45 +160,79 @@ class ChatMessageItem(BaseModel):
 
 class ChatMessagesResponse(BaseModel):
     messages: List[ChatMessageItem]
+    has_more: bool = False
+    next_before: Optional[int] = None  # Pass back as `before` to load the previous page
 
 
 @router.get("/chat/messages", response_model=ChatMessagesResponse)
-def get_chat_messages(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie),
+async def get_chat_messages(
+    before: Optional[int] = Query(None, description="Id of the oldest message already loaded (next_before)"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
-    Get all chat messages for the current user.
+    Get a page of chat messages for the current user, oldest first.
+    Without `before` the newest page is returned; follow `next_before` to walk back.
+    Uses keyset pagination on (user_id, created_at, id), so each page is a single
+    index range scan no matter how long the history is.
     Returns empty list for new users.
     """
-    messages = db.query(models.ChatMessage).filter(
-        models.ChatMessage.user_id == current_user.id
-    ).order_by(models.ChatMessage.created_at).all()
-    
-    # Convert to response format with timestamp field
-    message_items = [
-        ChatMessageItem(
-            id=msg.id,
-            role=msg.role,
-            content=msg.content,
-            timestamp=msg.created_at
+    query = (
+        select(
+            models.ChatMessage.id,
+            models.ChatMessage.role,
+            models.ChatMessage.content,
+            models.ChatMessage.created_at,
+        )
+        .where(models.ChatMessage.user_id == current_user.id)
+        .order_by(models.ChatMessage.created_at.desc(), models.ChatMessage.id.desc())
+        .limit(limit + 1)  # One extra row tells us whether an older page exists
+    )
+    if before is not None:
+        # Resolve the cursor row's timestamp inside the same statement (primary key
+        # lookup), so the comparison uses the stored value and costs no extra round trip
+        cursor_created_at = (
+            select(models.ChatMessage.created_at)
+            .where(
+                models.ChatMessage.id == before,
+                models.ChatMessage.user_id == current_user.id,
+            )
+            .scalar_subquery()
         )
-        for msg in messages
+        query = query.where(
+            tuple_(models.ChatMessage.created_at, models.ChatMessage.id)
+            < tuple_(cursor_created_at, before)
+        )
+
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Plain dicts from column rows; the response model validates them once
+    message_items = [
+        {"id": row.id, "role": row.role, "content": row.content, "timestamp": row.created_at}
+        for row in reversed(rows)
     ]
-    
+
     # If no messages, return empty list (frontend will show welcome message)
-    return ChatMessagesResponse(messages=message_items)
+    return {
+        "messages": message_items,
+        "has_more": has_more,
+        "next_before": rows[-1].id if has_more else None,
+    }
 
 
 @router.post("/chat/message", response_model=ChatMessageResponse)
 async def chat_message(
     request: ChatMessageRequest,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
-    Process a chat message using OpenAI API.
-    Stores both user message and AI response in database tied to user account.
+    Process a chat message using the configured LLM provider.
+    Stores both user message and AI response in database tied to user account,
+    in one batched write after the reply (no connection is held during the LLM call).
     Returns an AI-generated response about markets, trading, or general questions.
     """
     if not request.message or not request.message.strip():
@@ -124,112 +241,183 @@ async def chat_message(
             detail="Message cannot be empty"
         )
 
-    # Store user message in database
-    user_message = models.ChatMessage(
-        user_id=current_user.id,
-        role="user",
-        content=request.message.strip()
-    )
-    db.add(user_message)
-    db.flush()  # Flush to get the ID, but don't commit yet
+    user_id = current_user.id
+    text = request.message.strip()
 
-    # Get OpenAI client (lazy initialization)
-    client = get_openai_client()
-    
-    # Check if OpenAI client is configured
-    if not client:
-        logger.error("OpenAI client not initialized - OPENAI_API_KEY missing or invalid")
+    # Serve repeated generic questions from the response cache
+    cached = get_cached_response(text)
+    if cached is not None:
+        await db.close()
+        await chat_writer.write(
+            models.ChatMessage(user_id=user_id, role="user", content=text),
+            models.ChatMessage(user_id=user_id, role="assistant", content=cached),
+        )
+        logger.info(f"✅ Chat message served from cache for user {user_id}")
+        return ChatMessageResponse(response=cached)
+
+    # Build the prompt before storing the new message so it isn't sent twice
+    messages = await build_chat_messages(db, user_id, text)
+
+    # Give the pooled connection back before the (slow) LLM call; both turns
+    # are written afterwards in one batched insert
+    await db.close()
+    user_message = models.ChatMessage(user_id=user_id, role="user", content=text)
+
+    # Check if the LLM provider is configured
+    if not llm.is_configured():
+        logger.error("LLM provider not configured - OPENAI_API_KEY missing or invalid")
         # Store error message in database
-        error_message = models.ChatMessage(
-            user_id=current_user.id,
+        await chat_writer.write(user_message, models.ChatMessage(
+            user_id=user_id,
             role="assistant",
             content="AI service is not configured. Please set OPENAI_API_KEY environment variable."
-        )
-        db.add(error_message)
-        db.commit()
+        ))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="AI service is not configured. Please set OPENAI_API_KEY environment variable."
         )
 
     try:
-        # Get recent conversation history for context (last 10 messages)
-        recent_messages = db.query(models.ChatMessage).filter(
-            models.ChatMessage.user_id == current_user.id
-        ).order_by(models.ChatMessage.created_at.desc()).limit(10).all()
-        
-        # Build conversation history for OpenAI (most recent first, so reverse)
-        conversation_history = []
-        for msg in reversed(recent_messages):
-            conversation_history.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        
-        # System prompt to make the AI act as a trading assistant
-        system_prompt = """You are an expert AI trading assistant for Profit Path, a financial trading platform. 
-Your role is to help users with:
-- Market analysis and insights
-- Trading strategies and techniques
-- Stock recommendations and analysis
-- Risk management advice
-- General financial market questions
+        # Call the LLM provider (identical concurrent prompts share one upstream call)
+        ai_response = await llm.complete(
+            messages,
+            model=CHAT_MODEL,
+            temperature=CHAT_TEMPERATURE,
+            max_tokens=CHAT_MAX_TOKENS,
+            user_id=user_id,
+        )
+    except LLMBusyError as e:
+        # Shed load without recording the turn; the client should retry later
+        logger.warning(f"⚠️ Chat request from user {user_id} rejected by LLM scheduler: {e.detail}")
+        raise llm_busy_exception(e)
+    except Exception as e:
+        logger.error(f"❌ Error processing chat message: {str(e)}", exc_info=True)
 
-Always provide accurate, helpful, and professional responses. If asked about specific stocks, provide balanced analysis 
-and remind users that this is not financial advice. Be concise but informative."""
+        # Store error message in database
+        await chat_writer.write(user_message, models.ChatMessage(
+            user_id=user_id,
+            role="assistant",
+            content=f"Sorry, I encountered an error: {str(e)}. Please try again."
+        ))
 
-        # Build messages array with system prompt, history, and current message
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(conversation_history)
-        messages.append({"role": "user", "content": request.message.strip()})
-
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using gpt-4o-mini for cost efficiency, can be changed to gpt-4 or gpt-3.5-turbo
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1000,
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process chat message: {str(e)}"
         )
 
-        # Extract the response text
-        ai_response = response.choices[0].message.content
+    if not ai_response:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No response from AI service"
+        )
 
-        if not ai_response:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="No response from AI service"
-            )
+    # Store both turns together
+    await chat_writer.write(
+        user_message,
+        models.ChatMessage(user_id=user_id, role="assistant", content=ai_response),
+    )
+    cache_response(text, ai_response)
 
-        # Store assistant response in database
-        assistant_message = models.ChatMessage(
-            user_id=current_user.id,
-            role="assistant",
-            content=ai_response
-        )
-        db.add(assistant_message)
-        db.commit()
+    logger.info(f"✅ Chat message processed for user {user_id}")
+    return ChatMessageResponse(response=ai_response)
 
-        logger.info(f"✅ Chat message processed for user {current_user.id}")
-        return ChatMessageResponse(response=ai_response)
 
-    except HTTPException:
-        db.rollback()
-        raise
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ Error processing chat message: {str(e)}", exc_info=True)
-        
-        # Store error message in database
-        error_message = models.ChatMessage(
-            user_id=current_user.id,
-            role="assistant",
-            content=f"Sorry, I encountered an error: {str(e)}. Please try again."
+@router.post("/chat/message/stream")
+async def chat_message_stream(
+    request: ChatMessageRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Streaming variant of /chat/message over Server-Sent Events.
+    Sends `token` events as the model produces them, then a final `done` event
+    with the full response. The user message and the assistant message are saved
+    together through the write-behind queue once the stream completes, or with
+    the partial answer if the client disconnects first.
+    """
+    text = request.message.strip() if request.message else ""
+    if not text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Message cannot be empty"
         )
-        db.add(error_message)
-        db.commit()
-        
+
+    user_id = current_user.id
+    cached = get_cached_response(text)
+
+    if cached is None and not llm.is_configured():
+        logger.error("LLM provider not configured - OPENAI_API_KEY missing or invalid")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process chat message: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is not configured. Please set OPENAI_API_KEY environment variable."
         )
 
+    deltas: Optional[AsyncIterator[str]] = None
+    if cached is None:
+        messages = await build_chat_messages(db, user_id, text)
+        try:
+            # Admission happens here so an overloaded service answers 429, not a broken stream
+            deltas = llm.stream(
+                messages,
+                model=CHAT_MODEL,
+                temperature=CHAT_TEMPERATURE,
+                max_tokens=CHAT_MAX_TOKENS,
+                user_id=user_id,
+            )
+        except LLMBusyError as e:
+            logger.warning(f"⚠️ Chat stream from user {user_id} rejected by LLM scheduler: {e.detail}")
+            raise llm_busy_exception(e)
+    # The request-scoped session is closed before the stream body runs,
+    # so the pooled connection is not held for the whole completion.
+    await db.close()
+
+    async def event_stream() -> AsyncIterator[str]:
+        parts: list[str] = []
+        failed = False
+        saved = False
+        try:
+            if deltas is None:
+                # Cache hit: the whole answer goes out as a single token event
+                parts.append(cached or "")
+                yield sse_event({"token": cached}, event="token")
+            else:
+                try:
+                    # Identical concurrent prompts share one upstream stream
+                    async for delta in deltas:
+                        parts.append(delta)
+                        yield sse_event({"token": delta}, event="token")
+                except Exception as e:
+                    logger.error(f"❌ Error streaming chat message: {str(e)}", exc_info=True)
+                    failed = True
+                    parts = [f"Sorry, I encountered an error: {str(e)}. Please try again."]
+                    yield sse_event({"detail": f"Failed to process chat message: {str(e)}"}, event="error")
+
+            ai_response = "".join(parts)
+            if not ai_response:
+                failed = True
+                ai_response = "No response from AI service"
+                yield sse_event({"detail": ai_response}, event="error")
+
+            # Persist both turns in one batched write before `done`, so the next turn sees them
+            saved = True
+            await save_streamed_turns(user_id, text, ai_response)
+
+            if not failed and cached is None:
+                cache_response(text, ai_response)
+
+            logger.info(f"✅ Streamed chat message processed for user {user_id}")
+            yield sse_event({"response": ai_response}, event="done")
+        finally:
+            if not saved:
+                # The client went away mid-stream: keep the question and the partial answer
+                logger.info(f"⚠️ Chat stream for user {user_id} interrupted, saving the partial answer")
+                await save_streamed_turns(user_id, text, "".join(parts))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable proxy buffering so tokens flush immediately
+        },
+    )
@@ -5,6 +5,20 @@
 from typing import Literal, cast
 from fastapi import APIRouter, Request, Cookie, Header, Response, Depends
 from app.core.config import settings
+from app.core.auth_cache import auth_cache
+from app.core.security import password_hasher
+from app.core.http import http_client
+from app.core.oauth import oauth_stats
+from app.chat.persistence import chat_writer
+from app.db.pool import connection_budget, pool_stats
+from app.db.instrumentation import sql_report
+from app.market.bars import bar_store
+from app.market.quotes import quote_service
+from app.market.symbols import symbol_directory
+from app.chat.response_cache import response_cache
+from app.llm.providers import get_provider
+from app.llm.scheduler import scheduler
+from app.llm.singleflight import singleflight
 from jose import jwt, JWTError, ExpiredSignatureError  # type: ignore
 
 router = APIRouter(prefix="/debug", tags=["Debug"])
@@ -59,3 +73,80 @@ def set_test_cookie(response: Response):
         path="/",
     )
     return {"message": "Test cookie set"}
+
+
+@router.get("/auth-cache")
+def auth_cache_stats():
+    """Hit/miss counters for the verified-token cache."""
+    return {"ttl_seconds": auth_cache.ttl_seconds, **auth_cache.stats()}
+
+
+@router.get("/password-hasher")
+def password_hasher_stats():
+    """Queue depth and timings of the bcrypt worker pool."""
+    return password_hasher.stats()
+
+
+@router.get("/chat-cache")
+def chat_cache_stats():
+    """Hit/miss counters for the chat response cache."""
+    return {"enabled": settings.CHAT_CACHE_ENABLED, **response_cache.stats()}
+
+
+@router.get("/chat-writes")
+def chat_write_stats():
+    """Batching counters for the chat message write-behind queue."""
+    return chat_writer.stats()
+
+
+@router.get("/llm")
+def llm_stats():
+    """Active provider, LLM scheduler queue/wait metrics and upstream vs coalesced request counters."""
+    return {
+        "provider": get_provider().name,
+        "scheduler": scheduler.stats(),
+        "singleflight": singleflight.stats(),
+    }
+
+
+@router.get("/http")
+def http_stats():
+    """Shared outbound connection pool and cached OAuth provider metadata."""
+    return {
+        "pool": http_client.stats(),
+        "oauth_metadata_ttl_seconds": settings.OAUTH_METADATA_TTL_SECONDS,
+        "oauth": oauth_stats(),
+    }
+
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """Checkout wait, in-use and overflow counters per database engine, plus the connection budget."""
+    return {"engines": pool_stats(), "budget": connection_budget()}
+
+
+@router.get("/sql")
+def sql_stats(reset: bool = False):
+    """Queries, DB time, slow queries and likely N+1 statements per route (`?reset=true` clears it)."""
+    report = {
+        "slow_query_ms": settings.SQL_SLOW_QUERY_MS,
+        "n_plus_one_threshold": settings.SQL_N_PLUS_ONE_THRESHOLD,
+        "routes": sql_report.stats(),
+    }
+    if reset:
+        sql_report.reset()
+    return report
+
+
+@router.get("/market")
+def market_stats():
+    """Quote cache, symbol index freshness and bar store upstream traffic."""
+    return {
+        "configured": quote_service.is_configured(),
+        "base_url": quote_service.source.base_url,
+        "ttl_seconds": quote_service.ttl_seconds,
+        "stale_seconds": quote_service.stale_seconds,
+        "quotes": quote_service.stats(),
+        "symbols": symbol_directory.stats(),
+        "bars": bar_store.stats(),
+    }
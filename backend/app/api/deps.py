@@ -7,24 +7,21 @@
 import logging
 from fastapi import Request, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError, ExpiredSignatureError  # type: ignore
 from app.core.config import settings
-from app.db.database import get_db
+from app.core.auth_cache import UserSnapshot, auth_cache
+from app.db.routing import get_read_db
 from app.db import models
 
 logger = logging.getLogger(__name__)
 COOKIE_NAME = settings.COOKIE_NAME
 
 
-def get_current_user_from_cookie(
-        request: Request,
-        db: Session = Depends(get_db),
-) -> models.User:
+def get_token_from_request(request: Request) -> str:
     """
-    Extracts JWT from either HttpOnly cookie or Authorization header,
-    validates and decodes it, and returns the current user.
+    Extracts the JWT from either the Authorization header or the HttpOnly cookie.
     """
-
     token = None
 
     # 1️⃣ Check Authorization header (for API clients)
@@ -43,7 +40,13 @@ def get_current_user_from_cookie(
             detail="Authentication required",
         )
 
-    # 3️⃣ Decode token
+    return token
+
+
+def decode_token(token: str) -> dict:
+    """
+    Validates and decodes the JWT, returning its claims (with a numeric subject).
+    """
     try:
         payload = jwt.decode(
             token,
@@ -53,19 +56,48 @@ def get_current_user_from_cookie(
         user_id = payload.get("sub")
         if user_id is None:
             raise ValueError("Missing subject claim")
-        user_id = int(user_id)
+        int(user_id)
+        return payload
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
         )
-    except (JWTError, ValueError):
+    except (JWTError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
-    # 4️⃣ Fetch user from DB
+
+def decode_user_id(token: str) -> int:
+    """
+    Validates and decodes the JWT, returning the user id from its subject claim.
+    """
+    return int(decode_token(token)["sub"])
+
+
+def get_current_user_from_cookie(
+        request: Request,
+        db: Session = Depends(get_read_db),
+) -> UserSnapshot:
+    """
+    Extracts JWT from either HttpOnly cookie or Authorization header,
+    validates and decodes it, and returns a snapshot of the current user.
+    Repeat requests with the same token are served from the auth cache
+    without decoding the token or touching the database; misses read from
+    the replica when one is configured.
+    """
+    token = get_token_from_request(request)
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return cached
+
+    claims = decode_token(token)
+    user_id = int(claims["sub"])
+    generation = auth_cache.generation(user_id)
+
+    # Fetch user from DB
     user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(
@@ -73,9 +105,62 @@ def get_current_user_from_cookie(
             detail="User not found",
         )
 
-    return user
+    return auth_cache.set(token, claims, user, generation)
+
+
+# ============================================================
+# 🪪 Lightweight principal (no user row load)
+# ============================================================
+
+class Principal:
+    """
+    The authenticated caller as carried by the token: user id plus the verified
+    claims. Routes that only need `current_user.id` depend on this and make no
+    query for auth; the full User can still be loaded on demand.
+    """
+
+    __slots__ = ("id", "claims")
+
+    def __init__(self, id: int, claims: dict):
+        self.id = id
+        self.claims = claims
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id})"
+
+    def load_user(self, db: Session) -> models.User:
+        """Load the full User row (sync session)."""
+        user = db.get(models.User, self.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        return user
+
+    async def load_user_async(self, db: AsyncSession) -> models.User:
+        """Load the full User row (async session)."""
+        user = await db.get(models.User, self.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        return user
+
+
+async def get_current_principal(request: Request) -> Principal:
+    """
+    Verifies the token and returns a Principal without touching the database.
+    Declared async (it does no I/O) so it runs inline instead of in the threadpool.
+    """
+    token = get_token_from_request(request)
+    claims = auth_cache.get_claims(token)
+    if claims is None:
+        claims = decode_token(token)
+        auth_cache.set_claims(token, claims)
+    return Principal(int(claims["sub"]), claims)
 
 
 # Alias for convenience
 get_current_user = get_current_user_from_cookie
-
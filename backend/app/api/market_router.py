@@ -0,0 +1,55 @@
+# backend/app/api/market_router.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.deps import Principal, get_current_principal
+from app.core.config import settings
+from app.market.polygon import MarketDataError
+from app.market.quotes import normalize_symbols, quote_service
+from app.schemas import market
+
+router = APIRouter()
+
+
+@router.post("/market/quotes", response_model=market.QuotesResponse)
+async def get_quotes(
+    request: market.QuotesRequest,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Latest quotes for many symbols at once. Cached quotes are served directly;
+    the rest are fetched in one bulk upstream call, shared with any concurrent
+    request asking for the same symbols.
+    """
+    symbols, invalid = normalize_symbols(request.symbols)
+
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid symbols: {', '.join(invalid[:10])}"
+        )
+    if not symbols:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one symbol is required"
+        )
+    if len(symbols) > settings.MARKET_QUOTES_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MARKET_QUOTES_MAX_SYMBOLS} symbols per request"
+        )
+
+    if not quote_service.is_configured():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Market data not configured. Please set POLYGON_API_KEY."
+        )
+
+    try:
+        quotes = await quote_service.get_quotes(symbols)
+    except MarketDataError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Market data unavailable: {e}")
+
+    return market.QuotesResponse(
+        quotes={symbol: quote for symbol, quote in quotes.items() if quote is not None},
+        missing=[symbol for symbol, quote in quotes.items() if quote is None],
+    )
@@ -1,7 +1,7 @@
 # Debug endpoint for OAuth testing
 from fastapi import APIRouter, HTTPException
 from app.core.config import settings
-from authlib.integrations.starlette_client import OAuth
+from app.core.oauth import register_oauth_clients
 
 router = APIRouter()
 
@@ -9,7 +9,7 @@ router = APIRouter()
 async def oauth_debug():
     """Debug endpoint to check OAuth configuration."""
     try:
-        oauth_test = OAuth()
+        registered = register_oauth_clients()
         return {
             "status": "ok",
             "google_client_id": settings.GOOGLE_CLIENT_ID[:20] + "..." if settings.GOOGLE_CLIENT_ID else "EMPTY",
@@ -17,6 +17,7 @@ async def oauth_debug():
             "github_client_id": settings.GITHUB_CLIENT_ID[:20] + "..." if settings.GITHUB_CLIENT_ID else "EMPTY",
             "github_client_secret": "SET" if settings.GITHUB_CLIENT_SECRET else "EMPTY",
             "frontend_url": settings.FRONTEND_URL,
+            "registered_providers": registered,
             "authlib_available": True
         }
     except Exception as e:
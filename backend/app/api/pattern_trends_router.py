@@ -1,33 +1,41 @@
 # backend/app/api/pattern_trends_router.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user_from_cookie
-from app.db.database import get_db
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import Principal, get_current_principal
+from app.core.config import settings
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
 from app.db import models
+from app.db.sql import dialect_insert
+from app.market.symbols import symbol_directory
 from app.schemas import pattern_trends
 
 router = APIRouter()
 
 
 @router.get("/pattern-trends", response_model=pattern_trends.PatternTrendsResponse)
-def get_pattern_trends(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+async def get_pattern_trends(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get all pattern trends items for the current user."""
-    items = db.query(models.PatternTrendsItem).filter(
-        models.PatternTrendsItem.user_id == current_user.id
-    ).all()
+    result = await db.execute(
+        select(models.PatternTrendsItem).where(
+            models.PatternTrendsItem.user_id == current_user.id
+        )
+    )
+    items = result.scalars().all()
     
     return pattern_trends.PatternTrendsResponse(items=items)
 
 
 @router.post("/pattern-trends", response_model=pattern_trends.PatternTrendsItemResponse, status_code=status.HTTP_201_CREATED)
-def add_to_pattern_trends(
+async def add_to_pattern_trends(
     item: pattern_trends.PatternTrendsItemCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Add a symbol to the user's pattern trends."""
     symbol = item.symbol.strip().upper()
@@ -38,53 +46,99 @@ def add_to_pattern_trends(
             detail="Symbol cannot be empty"
         )
     
-    # Check if already exists
-    existing = db.query(models.PatternTrendsItem).filter(
-        models.PatternTrendsItem.user_id == current_user.id,
-        models.PatternTrendsItem.symbol == symbol
-    ).first()
-    
-    if existing:
+    # O(1) check against the active-ticker index, so garbage never reaches market data
+    valid, _ = symbol_directory.validate([symbol])
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Symbol already in pattern trends"
+            detail=f"Unknown symbol: {symbol}"
         )
     
-    # Create new pattern trends item
-    pattern_trends_item = models.PatternTrendsItem(
+    # Single INSERT ... ON CONFLICT DO NOTHING on (user_id, symbol): race-free,
+    # and RETURNING hands back the row without a refresh
+    stmt = dialect_insert(models.PatternTrendsItem).values(
         user_id=current_user.id,
         symbol=symbol
     )
+    pattern_trends_item = await db.scalar(
+        stmt.on_conflict_do_nothing(
+            index_elements=[models.PatternTrendsItem.user_id, models.PatternTrendsItem.symbol]
+        ).returning(models.PatternTrendsItem)
+    )
+    
+    if pattern_trends_item is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Symbol already in pattern trends"
+        )
     
-    db.add(pattern_trends_item)
-    db.commit()
-    db.refresh(pattern_trends_item)
+    await db.commit()
     
     return pattern_trends_item
 
 
+@router.post("/pattern-trends/batch", response_model=pattern_trends.PatternTrendsItemBatchResponse)
+async def add_many_to_pattern_trends(
+    request: pattern_trends.PatternTrendsItemBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Add many symbols to the user's pattern trends at once. Unknown symbols are
+    reported rather than failing the batch; the rest go in as one
+    INSERT ... ON CONFLICT DO NOTHING.
+    """
+    if len(request.symbols) > settings.SYMBOLS_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SYMBOLS_BATCH_MAX} symbols per request"
+        )
+    
+    symbols, invalid = symbol_directory.validate(request.symbols)
+    
+    added = []
+    if symbols:
+        stmt = dialect_insert(models.PatternTrendsItem).values(
+            [{"user_id": current_user.id, "symbol": symbol} for symbol in symbols]
+        )
+        result = await db.scalars(
+            stmt.on_conflict_do_nothing(
+                index_elements=[models.PatternTrendsItem.user_id, models.PatternTrendsItem.symbol]
+            ).returning(models.PatternTrendsItem)
+        )
+        added = result.all()
+        await db.commit()
+    
+    added_symbols = {pattern_trends_item.symbol for pattern_trends_item in added}
+    return pattern_trends.PatternTrendsItemBatchResponse(
+        added=added,
+        duplicates=[symbol for symbol in symbols if symbol not in added_symbols],
+        invalid=invalid
+    )
+
+
 @router.delete("/pattern-trends/{symbol}")
-def remove_from_pattern_trends(
+async def remove_from_pattern_trends(
     symbol: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Remove a symbol from the user's pattern trends."""
     symbol = symbol.strip().upper()
     
-    pattern_trends_item = db.query(models.PatternTrendsItem).filter(
-        models.PatternTrendsItem.user_id == current_user.id,
-        models.PatternTrendsItem.symbol == symbol
-    ).first()
+    deleted_id = await db.scalar(
+        delete(models.PatternTrendsItem).where(
+            models.PatternTrendsItem.user_id == current_user.id,
+            models.PatternTrendsItem.symbol == symbol
+        ).returning(models.PatternTrendsItem.id)
+    )
     
-    if not pattern_trends_item:
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Symbol not found in pattern trends"
         )
     
-    db.delete(pattern_trends_item)
-    db.commit()
+    await db.commit()
     
     return {"message": f"Removed {symbol} from pattern trends"}
-
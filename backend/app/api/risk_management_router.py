@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_user_from_cookie
+from app.api.deps import Principal, get_current_principal
 from app.db.database import get_db
 from app.db import models
 from app.schemas import risk_management
@@ -13,7 +13,7 @@ router = APIRouter()
 @router.get("/risk-management/settings", response_model=risk_management.RiskSettingsResponse)
 def get_risk_settings(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get risk management settings for the current user."""
     settings = db.query(models.RiskSettings).filter(
@@ -39,7 +39,7 @@ def get_risk_settings(
 def update_risk_settings(
     settings_data: risk_management.RiskSettingsCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Update risk management settings for the current user."""
     settings = db.query(models.RiskSettings).filter(
@@ -0,0 +1,42 @@
+# backend/app/api/symbols_router.py
+
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.config import settings
+from app.market.symbols import symbol_directory
+from app.schemas import market
+
+router = APIRouter()
+
+
+@router.get("/symbols/search", response_model=market.SymbolSearchResponse)
+async def search_symbols(
+    q: str = Query(..., min_length=1, max_length=64),
+    limit: int = Query(10, ge=1)
+):
+    """
+    Autocomplete over tickers and company names from the local reference index:
+    ticker and name prefixes first, typo-tolerant matches when nothing else fits.
+    Public reference data, so no login is required; never calls upstream.
+    Async on purpose: a sub-millisecond in-memory lookup, not worth a threadpool hop.
+    """
+    results = symbol_directory.index.search(q, min(limit, settings.SYMBOLS_SEARCH_MAX_RESULTS))
+    return market.SymbolSearchResponse(results=results)
+
+
+@router.get("/symbols/names", response_model=market.SymbolNamesResponse)
+async def get_symbol_names(symbols: str = Query(..., description="Comma-separated tickers")):
+    """Company names for many tickers in one call (O(1) lookup each)."""
+    tickers = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+    if len(tickers) > settings.MARKET_QUOTES_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MARKET_QUOTES_MAX_SYMBOLS} symbols per request"
+        )
+
+    index = symbol_directory.index
+    names = {}
+    for ticker in tickers:
+        name = index.name(ticker)
+        if name is not None:
+            names[ticker] = name
+    return market.SymbolNamesResponse(names=names)
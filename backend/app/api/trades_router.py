@@ -5,8 +5,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.api.deps import get_current_user_from_cookie
+from app.core.auth_cache import UserSnapshot
 from app.db.database import get_db
-from app.db import models
 
 router = APIRouter(prefix="/trades", tags=["Trades"])
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/trades", tags=["Trades"])
 @router.get("/")
 def get_trades(
         db: Session = Depends(get_db),
-        current_user: models.User = Depends(get_current_user_from_cookie)
+        current_user: UserSnapshot = Depends(get_current_user_from_cookie)
 ):
     """
     Secure trades endpoint.
@@ -1,33 +1,79 @@
 # backend/app/api/watchlist_router.py
 
+from typing import Union
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_current_user_from_cookie
-from app.db.database import get_db
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import Principal, get_current_principal
+from app.core.config import settings
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
 from app.db import models
+from app.db.sql import dialect_insert
+from app.market.polygon import MarketDataError
+from app.market.quotes import normalize_symbols, quote_service
+from app.market.symbols import symbol_directory
 from app.schemas import watchlist
 
 router = APIRouter()
 
 
-@router.get("/watchlist", response_model=watchlist.WatchlistResponse)
-def get_watchlist(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+@router.get("/watchlist", response_model=Union[watchlist.EnrichedWatchlistResponse, watchlist.WatchlistResponse])
+async def get_watchlist(
+    enrich: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Get all watchlist items for the current user."""
-    items = db.query(models.WatchlistItem).filter(
-        models.WatchlistItem.user_id == current_user.id
-    ).all()
+    """
+    Get all watchlist items for the current user.
+    With `?enrich=true` each item also carries its company name (local symbol
+    index) and last price, change percent and volume (shared quote cache, one
+    batched upstream call for all misses), so the page needs no per-symbol
+    requests.
+    """
+    result = await db.execute(
+        select(models.WatchlistItem).where(
+            models.WatchlistItem.user_id == current_user.id
+        )
+    )
+    items = result.scalars().all()
+    
+    if not enrich:
+        return watchlist.WatchlistResponse(items=items)
+    
+    quotes, quotes_error = {}, None
+    if not quote_service.is_configured():
+        quotes_error = "Market data not configured"
+    elif items:
+        try:
+            # Rows stored before symbols were validated may not be tickers at all
+            symbols, _ = normalize_symbols([item.symbol for item in items])
+            quotes = await quote_service.get_quotes(symbols)
+        except MarketDataError as e:
+            quotes_error = f"Market data unavailable: {e}"
     
-    return watchlist.WatchlistResponse(items=items)
+    index = symbol_directory.index
+    enriched = []
+    for item in items:
+        quote = quotes.get(item.symbol)
+        enriched.append(watchlist.WatchlistItemQuoteResponse(
+            id=item.id,
+            symbol=item.symbol,
+            created_at=item.created_at,
+            name=index.name(item.symbol),
+            price=quote.price if quote else None,
+            change_percent=quote.change_percent if quote else None,
+            volume=quote.volume if quote else None,
+        ))
+    
+    return watchlist.EnrichedWatchlistResponse(items=enriched, quotes_error=quotes_error)
 
 
 @router.post("/watchlist", response_model=watchlist.WatchlistItemResponse, status_code=status.HTTP_201_CREATED)
-def add_to_watchlist(
+async def add_to_watchlist(
     item: watchlist.WatchlistItemCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Add a symbol to the user's watchlist."""
     symbol = item.symbol.strip().upper()
@@ -38,68 +84,117 @@ def add_to_watchlist(
             detail="Symbol cannot be empty"
         )
     
-    # Check if already exists
-    existing = db.query(models.WatchlistItem).filter(
-        models.WatchlistItem.user_id == current_user.id,
-        models.WatchlistItem.symbol == symbol
-    ).first()
-    
-    if existing:
+    # O(1) check against the active-ticker index, so garbage never reaches market data
+    valid, _ = symbol_directory.validate([symbol])
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Symbol already in watchlist"
+            detail=f"Unknown symbol: {symbol}"
         )
     
-    # Create new watchlist item
-    watchlist_item = models.WatchlistItem(
+    # Single INSERT ... ON CONFLICT DO NOTHING on (user_id, symbol): race-free,
+    # and RETURNING hands back the row without a refresh
+    stmt = dialect_insert(models.WatchlistItem).values(
         user_id=current_user.id,
         symbol=symbol
     )
+    watchlist_item = await db.scalar(
+        stmt.on_conflict_do_nothing(
+            index_elements=[models.WatchlistItem.user_id, models.WatchlistItem.symbol]
+        ).returning(models.WatchlistItem)
+    )
     
-    db.add(watchlist_item)
-    db.commit()
-    db.refresh(watchlist_item)
+    if watchlist_item is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Symbol already in watchlist"
+        )
+    
+    await db.commit()
     
     return watchlist_item
 
 
+@router.post("/watchlist/batch", response_model=watchlist.WatchlistItemBatchResponse)
+async def add_many_to_watchlist(
+    request: watchlist.WatchlistItemBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Add many symbols to the user's watchlist at once. Unknown symbols are
+    reported rather than failing the batch; the rest go in as one
+    INSERT ... ON CONFLICT DO NOTHING.
+    """
+    if len(request.symbols) > settings.SYMBOLS_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SYMBOLS_BATCH_MAX} symbols per request"
+        )
+    
+    symbols, invalid = symbol_directory.validate(request.symbols)
+    
+    added = []
+    if symbols:
+        stmt = dialect_insert(models.WatchlistItem).values(
+            [{"user_id": current_user.id, "symbol": symbol} for symbol in symbols]
+        )
+        result = await db.scalars(
+            stmt.on_conflict_do_nothing(
+                index_elements=[models.WatchlistItem.user_id, models.WatchlistItem.symbol]
+            ).returning(models.WatchlistItem)
+        )
+        added = result.all()
+        await db.commit()
+    
+    added_symbols = {watchlist_item.symbol for watchlist_item in added}
+    return watchlist.WatchlistItemBatchResponse(
+        added=added,
+        duplicates=[symbol for symbol in symbols if symbol not in added_symbols],
+        invalid=invalid
+    )
+
+
 @router.delete("/watchlist/{symbol}")
-def remove_from_watchlist(
+async def remove_from_watchlist(
     symbol: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Remove a symbol from the user's watchlist."""
     symbol = symbol.strip().upper()
     
-    watchlist_item = db.query(models.WatchlistItem).filter(
-        models.WatchlistItem.user_id == current_user.id,
-        models.WatchlistItem.symbol == symbol
-    ).first()
+    deleted_id = await db.scalar(
+        delete(models.WatchlistItem).where(
+            models.WatchlistItem.user_id == current_user.id,
+            models.WatchlistItem.symbol == symbol
+        ).returning(models.WatchlistItem.id)
+    )
     
-    if not watchlist_item:
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Symbol not found in watchlist"
         )
     
-    db.delete(watchlist_item)
-    db.commit()
+    await db.commit()
     
     return {"message": f"Removed {symbol} from watchlist"}
 
 
 @router.delete("/watchlist")
-def clear_watchlist(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user_from_cookie)
+async def clear_watchlist(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Clear all items from the user's watchlist."""
-    deleted = db.query(models.WatchlistItem).filter(
-        models.WatchlistItem.user_id == current_user.id
-    ).delete()
+    result = await db.execute(
+        delete(models.WatchlistItem).where(
+            models.WatchlistItem.user_id == current_user.id
+        )
+    )
+    deleted = result.rowcount
     
-    db.commit()
+    await db.commit()
     
     return {"message": f"Cleared {deleted} items from watchlist"}
-
@@ -0,0 +1,332 @@
+# backend/app/chat/context.py
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db import models
+from app.db.sql import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Takes a messages array and a max_tokens limit, returns the completion text
+Completer = Callable[[list[dict], int], Awaitable[str]]
+
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and framing tokens the API adds per message
+MAX_LOADED_TURNS = 200  # Cap on rows read per load, and on turns kept beyond the budget window
+SUMMARY_INPUT_FACTOR = 8  # A summary call folds at most summary_max_tokens x this many tokens of turns
+MAX_SUMMARY_CHUNKS = 4  # Summary calls per background run; any remaining overflow waits for the next turn
+SUMMARY_RETRY_SECONDS = 60  # Back-off after a failed summary before the next attempt
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and a trading assistant.
+Merge the existing summary with the new messages into one updated summary.
+Keep facts the user shared about themselves, symbols and strategies discussed, and open questions.
+Write plain prose, no more than a short paragraph."""
+
+
+# ============================================================
+# 🔢 Token counting
+# ============================================================
+
+_encoding = None
+
+
+def load_encoding() -> None:
+    """
+    Load the tiktoken encoding used by the gpt-4o model family. Blocking: the
+    first call may download the vocabulary (set TIKTOKEN_CACHE_DIR to a
+    persistent path to avoid that), so run it off the event loop.
+    """
+    global _encoding
+
+    if _encoding is None:
+        try:
+            import tiktoken  # type: ignore
+            _encoding = tiktoken.get_encoding("o200k_base")
+            logger.info("✅ tiktoken o200k_base encoding loaded")
+        except Exception as e:
+            logger.warning(f"⚠️ tiktoken unavailable, estimating tokens from length: {e}")
+
+
+async def warm_encoding() -> None:
+    """Load the encoding in a worker thread (called at startup)."""
+    await asyncio.to_thread(load_encoding)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens locally. Falls back to ~4 characters per token without tiktoken
+    or until warm_encoding() has finished, so it never blocks on the load.
+    """
+    encoding = _encoding
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# ============================================================
+# 🧠 Conversation context
+# ============================================================
+
+@dataclass
+class Turn:
+    id: int
+    role: str
+    content: str
+    tokens: int
+
+
+@dataclass
+class ConversationContext:
+    """Cached per-user state: rolling summary plus the unsummarized turns, oldest first."""
+    summary: str = ""
+    summarized_through_id: int = 0
+    turns: list[Turn] = field(default_factory=list)
+    summarizing: bool = False
+    summary_retry_at: float = 0.0  # Monotonic time before which a failed summary isn't retried
+
+    @property
+    def last_id(self) -> int:
+        return self.turns[-1].id if self.turns else self.summarized_through_id
+
+    @property
+    def history_tokens(self) -> int:
+        return sum(turn.tokens + MESSAGE_OVERHEAD_TOKENS for turn in self.turns)
+
+
+class ConversationContextManager:
+    """
+    Builds the prompt for a chat turn within a fixed token budget.
+
+    - The newest turns that fit in `history_budget` are sent verbatim.
+    - Older turns are folded into a per-user rolling summary (ChatSummary table)
+      by a background task once unsummarized history passes `summary_trigger`.
+    - Each user's context is cached in an LRU, so a new turn only reads and
+      counts the rows written since the cached tail.
+    """
+
+    def __init__(
+        self,
+        history_budget: int,
+        summary_trigger: int,
+        summary_max_tokens: int,
+        cache_size: int,
+    ):
+        self.history_budget = history_budget
+        self.summary_trigger = summary_trigger
+        self.summary_max_tokens = summary_max_tokens
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, ConversationContext] = OrderedDict()
+        self._completer: Optional[Completer] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def set_completer(self, completer: Completer) -> None:
+        """Register the LLM call used to update summaries."""
+        self._completer = completer
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached context (it is rebuilt from the database on next use)."""
+        self._cache.pop(user_id, None)
+
+    async def build_messages(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        system_prompt: str,
+        message: str,
+    ) -> list[dict]:
+        """
+        Assemble system prompt, summary, budgeted history and the new message.
+        """
+        ctx = await self._load(db, user_id)
+        window = self._window(ctx)
+
+        messages = [{"role": "system", "content": system_prompt}]
+        if ctx.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n{ctx.summary}",
+            })
+        messages.extend({"role": turn.role, "content": turn.content} for turn in window)
+        messages.append({"role": "user", "content": message})
+
+        if ctx.history_tokens > self.summary_trigger:
+            self._schedule_summary(user_id, ctx)
+
+        return messages
+
+    async def _load(self, db: AsyncSession, user_id: int) -> ConversationContext:
+        """Return the cached context, topped up with any turns written since its tail."""
+        ctx = self._cache.get(user_id)
+        if ctx is None:
+            row = await db.get(models.ChatSummary, user_id)
+            # A concurrent request for the same user may have cached one meanwhile
+            ctx = self._cache.get(user_id)
+            if ctx is None:
+                ctx = ConversationContext(
+                    summary=row.summary if row else "",
+                    summarized_through_id=row.summarized_through_id if row else 0,
+                )
+                self._cache[user_id] = ctx
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(user_id)
+
+        query = (
+            select(models.ChatMessage.id, models.ChatMessage.role, models.ChatMessage.content)
+            .where(
+                models.ChatMessage.user_id == user_id,
+                models.ChatMessage.id > ctx.last_id,
+            )
+            .order_by(models.ChatMessage.created_at.desc(), models.ChatMessage.id.desc())
+            .limit(MAX_LOADED_TURNS)
+        )
+        if ctx.last_id:
+            # Start the (user_id, created_at) index range at the cached tail so
+            # the scan only touches new rows instead of the whole history
+            tail_created_at = (
+                select(models.ChatMessage.created_at)
+                .where(models.ChatMessage.id == ctx.last_id)
+                .scalar_subquery()
+            )
+            query = query.where(models.ChatMessage.created_at >= tail_created_at)
+
+        rows = (await db.execute(query)).all()
+        # Another request (or the summarizer) may have moved the tail during the
+        # await; re-check against it so overlapping loads don't append a turn twice
+        for row in reversed(rows):
+            if row.id > ctx.last_id:
+                ctx.turns.append(Turn(row.id, row.role, row.content, count_tokens(row.content)))
+        self._trim(ctx)
+        return ctx
+
+    def _trim(self, ctx: ConversationContext) -> None:
+        """
+        Bound the cached turns even if summaries keep failing (or come back
+        empty): beyond the budget window, keep at most MAX_LOADED_TURNS
+        overflow turns for the summarizer and drop the oldest. They are never
+        sent verbatim anyway, and stay in the database.
+        """
+        limit = len(self._window(ctx)) + MAX_LOADED_TURNS
+        if len(ctx.turns) > limit:
+            del ctx.turns[: len(ctx.turns) - limit]
+
+    def _window(self, ctx: ConversationContext) -> list[Turn]:
+        """Newest turns that fit in the history budget, oldest first."""
+        window: list[Turn] = []
+        used = 0
+        for turn in reversed(ctx.turns):
+            cost = turn.tokens + MESSAGE_OVERHEAD_TOKENS
+            if used + cost > self.history_budget:
+                break
+            window.append(turn)
+            used += cost
+        window.reverse()
+        return window
+
+    def _schedule_summary(self, user_id: int, ctx: ConversationContext) -> None:
+        """Fold overflow turns into the summary off the request path."""
+        if ctx.summarizing or self._completer is None or time.monotonic() < ctx.summary_retry_at:
+            return
+        ctx.summarizing = True
+        task = asyncio.create_task(self._summarize(user_id, ctx))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _next_chunk(self, ctx: ConversationContext) -> list[Turn]:
+        """
+        Oldest overflow turns (outside the budget window) that fit in one
+        summary prompt; always at least one, so a huge turn can't stall folding.
+        """
+        overflow = ctx.turns[: len(ctx.turns) - len(self._window(ctx))]
+        limit = self.summary_max_tokens * SUMMARY_INPUT_FACTOR
+        chunk: list[Turn] = []
+        used = 0
+        for turn in overflow:
+            cost = turn.tokens + MESSAGE_OVERHEAD_TOKENS
+            if chunk and used + cost > limit:
+                break
+            chunk.append(turn)
+            used += cost
+        return chunk
+
+    async def _summarize(self, user_id: int, ctx: ConversationContext) -> None:
+        try:
+            for _ in range(MAX_SUMMARY_CHUNKS):
+                fold = self._next_chunk(ctx)
+                if not fold or self._completer is None:
+                    return
+                if not await self._fold(user_id, ctx, fold):
+                    return
+        except Exception as e:
+            ctx.summary_retry_at = time.monotonic() + SUMMARY_RETRY_SECONDS
+            logger.error(f"❌ Failed to update chat summary for user {user_id}: {str(e)}", exc_info=True)
+        finally:
+            ctx.summarizing = False
+
+    async def _fold(self, user_id: int, ctx: ConversationContext, fold: list[Turn]) -> bool:
+        """Merge one chunk of turns into the summary; False if folding should stop."""
+        # Character cap for a single oversized turn (~4 characters per token)
+        max_chars = self.summary_max_tokens * SUMMARY_INPUT_FACTOR * 4
+        transcript = "\n".join(f"{turn.role}: {turn.content[:max_chars]}" for turn in fold)
+        messages = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"Existing summary:\n{ctx.summary or '(none)'}\n\nNew messages:\n{transcript}",
+            },
+        ]
+        summary = (await self._completer(messages, self.summary_max_tokens)).strip()
+        if not summary:
+            ctx.summary_retry_at = time.monotonic() + SUMMARY_RETRY_SECONDS
+            return False
+
+        through_id = fold[-1].id
+        stmt = dialect_insert(models.ChatSummary).values(
+            user_id=user_id,
+            summary=summary,
+            summarized_through_id=through_id,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.ChatSummary.user_id],
+            set_={
+                "summary": stmt.excluded.summary,
+                "summarized_through_id": stmt.excluded.summarized_through_id,
+                "updated_at": func.now(),
+            },
+            # A slower worker (another process) must not replace a newer summary
+            where=models.ChatSummary.summarized_through_id < stmt.excluded.summarized_through_id,
+        ).returning(models.ChatSummary.user_id)
+        async with AsyncSessionLocal() as db:
+            written = await db.scalar(stmt)
+            await db.commit()
+
+        if written is None:
+            # Someone else summarized further; reload the stored summary on next use
+            logger.info(f"⚠️ Chat summary for user {user_id} is already past message {through_id}")
+            self.invalidate(user_id)
+            return False
+
+        # Turns may have been appended while the summary was generated,
+        # so drop only what was actually folded in
+        ctx.summary = summary
+        ctx.summarized_through_id = through_id
+        ctx.turns = [turn for turn in ctx.turns if turn.id > through_id]
+        logger.info(f"✅ Chat summary updated for user {user_id} through message {through_id}")
+        return True
+
+
+# Global context manager instance
+context_manager = ConversationContextManager(
+    history_budget=settings.CHAT_HISTORY_TOKEN_BUDGET,
+    summary_trigger=settings.CHAT_SUMMARY_TRIGGER_TOKENS,
+    summary_max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+    cache_size=settings.CHAT_CONTEXT_CACHE_SIZE,
+)
@@ -0,0 +1,170 @@
+# backend/app/chat/persistence.py
+
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db import models
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    rows: list[dict]
+    future: asyncio.Future
+
+
+class ChatWriteBehind:
+    """
+    Write-behind queue for chat messages.
+
+    Request handlers hand over finished turns and await a future instead of
+    holding a session open; a single background worker drains the queue and
+    writes everything pending (across users) in one multi-row INSERT per batch.
+    Batches form naturally under load: whatever arrives while one batch is
+    being written goes out together in the next, so an idle system still
+    writes immediately.
+    """
+
+    def __init__(self, batch_size: int, max_pending: int):
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: deque[_PendingWrite] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushing = False
+
+        # Metrics
+        self.batches = 0
+        self.rows_written = 0
+        self.failed_writes = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (tests, benchmarks): start over on this loop
+            self._loop = loop
+            self._pending.clear()
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Semaphore(self.max_pending)
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            # Fresh context: started from whichever request wrote first, the worker would
+            # otherwise inherit its contextvars and bill every later batch to that request
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def write(self, *messages: models.ChatMessage) -> None:
+        """
+        Queue chat messages for the next batch and wait until they are committed.
+        Messages from one call are written in order, in the same transaction.
+        """
+        if not messages:
+            return
+        self._ensure_worker()
+        await self._space.acquire()  # Backpressure if the database falls behind
+        future = self._loop.create_future()
+        self._pending.append(_PendingWrite(
+            rows=[{"user_id": m.user_id, "role": m.role, "content": m.content} for m in messages],
+            future=future,
+        ))
+        self._wakeup.set()
+        # Shield so a client disconnect doesn't drop a write that is already queued
+        await asyncio.shield(future)
+
+    async def close(self) -> None:
+        """Flush everything still queued and stop the worker (app shutdown)."""
+        if self._worker is None or self._worker.done():
+            return
+        self._wakeup.set()
+        while self._pending or self._flushing:
+            await asyncio.sleep(0.01)
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "avg_batch_rows": round(self.rows_written / self.batches, 2) if self.batches else 0.0,
+            "largest_batch_rows": self.largest_batch,
+            "failed_writes": self.failed_writes,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                self._flushing = True
+                try:
+                    await self._flush(self._take_batch())
+                finally:
+                    self._flushing = False
+
+    def _take_batch(self) -> list[_PendingWrite]:
+        batch: list[_PendingWrite] = []
+        rows = 0
+        while self._pending and (not batch or rows + len(self._pending[0].rows) <= self.batch_size):
+            item = self._pending.popleft()
+            batch.append(item)
+            rows += len(item.rows)
+        return batch
+
+    async def _flush(self, batch: list[_PendingWrite]) -> None:
+        rows = [row for item in batch for row in item.rows]
+        try:
+            await self._insert(rows)
+            self._record(len(rows))
+            for item in batch:
+                self._resolve(item)
+        except Exception as e:
+            logger.warning(f"⚠️ Batched chat write of {len(rows)} rows failed, retrying per request: {e}")
+            # Retry each caller on its own so one bad row doesn't fail the rest
+            for item in batch:
+                try:
+                    await self._insert(item.rows)
+                    self._record(len(item.rows))
+                    self._resolve(item)
+                except Exception as item_error:
+                    self.failed_writes += 1
+                    logger.error(f"❌ Failed to save chat messages: {item_error}", exc_info=True)
+                    self._resolve(item, item_error)
+
+    async def _insert(self, rows: list[dict]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(models.ChatMessage), rows)
+            await db.commit()
+
+    def _record(self, rows: int) -> None:
+        self.batches += 1
+        self.rows_written += rows
+        self.largest_batch = max(self.largest_batch, rows)
+
+    def _resolve(self, item: _PendingWrite, error: Optional[BaseException] = None) -> None:
+        self._space.release()
+        if item.future.done():
+            return
+        if error is None:
+            item.future.set_result(None)
+        else:
+            item.future.set_exception(error)
+
+
+# Global write-behind queue for chat messages
+chat_writer = ChatWriteBehind(
+    batch_size=settings.CHAT_WRITE_BATCH_SIZE,
+    max_pending=settings.CHAT_WRITE_MAX_PENDING,
+)
@@ -0,0 +1,296 @@
+# backend/app/chat/response_cache.py
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Optional
+from app.core.config import settings
+
+# Only self-contained generic questions are shared across users: the prompt must
+# open like one ("what is a stop loss", "how do options work", "define beta")...
+_GENERIC_OPENING = re.compile(
+    r"^(what|what's|whats|how|define|explain|describe|who|when|where|which|is|are|does|do|can|should|list|compare)\b"
+)
+# ...and must not lean on the user (my portfolio) or on the conversation so far
+# ("why?", "how does that compare", "explain it in simpler terms", "yes")
+_CONTEXT_PATTERN = re.compile(
+    r"\b(i|i'm|i've|i'd|me|my|mine|myself|we|our|us|you said|you mentioned|earlier|above|"
+    r"previous|previously|before that|last time|again|continue|elaborate|this|that|these|those|"
+    r"it|its|it's|they|them|their|he|she|him|her|his|why|yes|no|ok|okay|sure|thanks|same|"
+    r"instead|else|also|further|more|simpler|simply|one)\b"
+)
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_WHITESPACE = re.compile(r"\s+")
+
+MAX_CACHEABLE_CHARS = 300  # Long prompts are effectively unique, not worth caching
+MIN_CACHEABLE_WORDS = 3  # Shorter prompts ("why?", "and AMD?") are follow-ups
+
+# Near-duplicate guard: tokens naming what the question is about must match exactly
+_TICKER_TOKEN = re.compile(r"\$?\b[A-Z]{1,5}(?:[.\-][A-Z])?\b")
+_MONTHS = frozenset(
+    "january february march april may june july august september october november december "
+    "jan feb mar apr jun jul aug sep sept oct nov dec".split()
+)
+_STOPWORDS = frozenset(
+    "a an the is are was were be of for to in on at by with about and or what whats what's how "
+    "do does can should please tell explain define describe".split()
+)
+
+# MinHash parameters: 64 permutations split into 16 LSH bands of 4 rows
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SHINGLE_SIZE = 3  # Character n-grams, robust to small rewordings and typos
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def prompt_entities(text: str) -> frozenset[str]:
+    """Ticker-like tokens (AAPL, $KO, BRK.B), numbers and months in a prompt."""
+    entities = {m.group().lstrip("$") for m in _TICKER_TOKEN.finditer(text)}
+    for token in normalize_prompt(text).split():
+        if token in _MONTHS or any(ch.isdigit() for ch in token):
+            entities.add(token)
+    return frozenset(entities)
+
+
+def same_subject(normalized_a: str, normalized_b: str) -> bool:
+    """
+    Whether two near-duplicate prompts ask about the same thing: words present in
+    only one of them may be filler or a typo of a word in the other, but never a
+    short token (tickers are 1-5 letters), a number or a month.
+    """
+    words_a, words_b = set(normalized_a.split()), set(normalized_b.split())
+    for word, others in [(w, words_b) for w in words_a - words_b] + [(w, words_a) for w in words_b - words_a]:
+        if word in _STOPWORDS:
+            continue
+        if len(word) < 6 or word in _MONTHS or any(ch.isdigit() for ch in word):
+            return False
+        if not any(SequenceMatcher(None, word, other).ratio() >= 0.8 for other in others):
+            return False
+    return True
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _permutations() -> list[tuple[int, int]]:
+    """Deterministic (a, b) pairs for the universal hash family a*x + b mod p."""
+    return [
+        (_hash64(f"a{i}") % (_MERSENNE_PRIME - 1) + 1, _hash64(f"b{i}") % _MERSENNE_PRIME)
+        for i in range(_NUM_PERM)
+    ]
+
+
+_PERMUTATIONS = _permutations()
+
+
+def minhash(normalized: str) -> tuple[int, ...]:
+    """MinHash signature over character shingles of a normalized prompt."""
+    padded = f" {normalized} "
+    shingles = {padded[i:i + _SHINGLE_SIZE] for i in range(max(1, len(padded) - _SHINGLE_SIZE + 1))}
+    hashes = [_hash64(s) & _MAX_HASH for s in shingles]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def _similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / _NUM_PERM
+
+
+@dataclass
+class _Entry:
+    response: str
+    expires_at: float
+    signature: Optional[tuple[int, ...]]
+    bands: tuple = ()
+    normalized: str = ""
+    entities: frozenset = frozenset()
+
+
+class ResponseCache:
+    """
+    In-memory cache of LLM answers to generic (non-personal) prompts.
+
+    Entries are keyed on the model plus the normalized prompt, expire after
+    `ttl_seconds` and are evicted least-recently-used beyond `max_entries`.
+    With `near_duplicates` enabled, a miss on the exact key falls back to a
+    MinHash/LSH lookup so rewordings like "what's RSI?" / "what is RSI" hit;
+    a near match only counts if its tickers, numbers and dates are identical
+    (character shingles alone can't tell "dividend of PEP" from "of KO").
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        near_duplicates: bool = False,
+        similarity: float = 0.8,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.near_duplicates = near_duplicates
+        self.similarity = similarity
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bands: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    @staticmethod
+    def is_cacheable(text: str) -> bool:
+        """
+        True only for a self-contained generic question: anything that may depend
+        on the conversation or the user (follow-ups, pronouns, very short
+        prompts) bypasses the cache, since it's answered without history.
+        """
+        if len(text) > MAX_CACHEABLE_CHARS:
+            return False
+        normalized = normalize_prompt(text)
+        if len(normalized.split()) < MIN_CACHEABLE_WORDS:
+            return False
+        return bool(_GENERIC_OPENING.match(normalized)) and not _CONTEXT_PATTERN.search(normalized)
+
+    @staticmethod
+    def _key(model: str, normalized: str) -> str:
+        return hashlib.sha256(f"{model}\x00{normalized}".encode()).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[str]:
+        """Return a cached answer, or None on a miss or a non-cacheable prompt."""
+        if not self.is_cacheable(text):
+            self.bypassed += 1
+            return None
+
+        normalized = normalize_prompt(text)
+        key = self._key(model, normalized)
+        now = time.monotonic()
+
+        entry = self._live_entry(key, now)
+        if entry is not None:
+            self.hits += 1
+            return entry.response
+
+        if self.near_duplicates:
+            signature = minhash(normalized)
+            match = self._near_match(model, signature, normalized, prompt_entities(text), now)
+            if match is not None:
+                self.near_hits += 1
+                return match.response
+
+        self.misses += 1
+        return None
+
+    def set(self, model: str, text: str, response: str) -> None:
+        """Store an answer for a cacheable prompt."""
+        if not response or not self.is_cacheable(text):
+            return
+
+        normalized = normalize_prompt(text)
+        key = self._key(model, normalized)
+        signature = minhash(normalized) if self.near_duplicates else None
+
+        self._remove(key)
+        bands = tuple(self._band_keys(model, signature)) if signature is not None else ()
+        self._entries[key] = _Entry(
+            response, time.monotonic() + self.ttl_seconds, signature, bands, normalized, prompt_entities(text)
+        )
+        for band in bands:
+            self._bands.setdefault(band, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bands.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _live_entry(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _near_match(
+        self,
+        model: str,
+        signature: tuple[int, ...],
+        normalized: str,
+        entities: frozenset,
+        now: float,
+    ) -> Optional[_Entry]:
+        candidates: set[str] = set()
+        for band in self._band_keys(model, signature):
+            candidates |= self._bands.get(band, set())
+
+        best_key, best_score = None, self.similarity
+        for key in candidates:
+            entry = self._entries.get(key)
+            if entry is None or entry.signature is None:
+                continue
+            # Similar wording about a different ticker, figure or date is a different question
+            if entry.entities != entities or not same_subject(normalized, entry.normalized):
+                continue
+            score = _similarity(signature, entry.signature)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        return self._live_entry(best_key, now) if best_key else None
+
+    @staticmethod
+    def _band_keys(model: str, signature: tuple[int, ...]):
+        # The model is part of every band key so answers never cross models
+        for band in range(_BANDS):
+            yield (_hash64(f"{model}:{band}"), signature[band * _ROWS:(band + 1) * _ROWS])
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in entry.bands:
+            keys = self._bands.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._bands[band]
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    ttl_seconds=settings.CHAT_CACHE_TTL_SECONDS,
+    max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+    near_duplicates=settings.CHAT_CACHE_NEAR_DUPLICATES,
+    similarity=settings.CHAT_CACHE_SIMILARITY,
+)
@@ -0,0 +1,168 @@
+# backend/app/core/auth_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from .config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """
+    Immutable, session-free copy of the fields request handlers read from a user.
+    Safe to share between requests and threads; never lazy-loads.
+    """
+    id: int
+    name: Optional[str]
+    email: Optional[str]
+    username: Optional[str]
+    provider: str
+    provider_id: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            username=user.username,
+            provider=user.provider,
+            provider_id=user.provider_id,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    user_id: int
+    claims: dict
+    user: Optional[UserSnapshot]  # None when only the claims were verified
+    expires_at: float
+
+
+class AuthCache:
+    """
+    Bounded TTL/LRU cache of verified tokens.
+
+    Keyed by a SHA-256 of the raw token (the token itself is never stored), each
+    entry holds the decoded claims and, once a route has needed it, a
+    UserSnapshot, so a repeat request skips both the JWT signature check and
+    the user lookup. An entry lives until the earlier of `ttl_seconds` and the
+    token's own `exp`. Call `invalidate_user` whenever a user's account changes;
+    the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._by_user: dict[int, set[bytes]] = {}
+        self._generations: dict[int, int] = {}
+        # Sync dependencies run in the threadpool, so guard the shared state
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        """Cached user for a token, or None on a miss or an expired entry."""
+        entry = self._lookup(token)
+        return entry.user if entry is not None else None
+
+    def get_claims(self, token: str) -> Optional[dict]:
+        """Cached verified claims for a token (with or without a user snapshot)."""
+        entry = self._lookup(token, need_user=False)
+        return entry.claims if entry is not None else None
+
+    def generation(self, user_id: int) -> int:
+        """Read before loading a user; pass to `set` so a concurrent invalidation wins."""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def set(self, token: str, claims: dict, user, generation: int) -> UserSnapshot:
+        """Cache a verified token and return the snapshot of its user."""
+        snapshot = UserSnapshot.from_user(user)
+        self._store(token, snapshot.id, claims, snapshot, generation)
+        return snapshot
+
+    def set_claims(self, token: str, claims: dict) -> None:
+        """Cache a verified token's claims without loading its user."""
+        user_id = int(claims["sub"])
+        self._store(token, user_id, claims, None, self.generation(user_id))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token of a user (password change, OAuth relink, profile update)."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _lookup(self, token: str, need_user: bool = True) -> Optional[_Entry]:
+        if self.ttl_seconds <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None or (need_user and entry.user is None):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, token: str, user_id: int, claims: dict, user: Optional[UserSnapshot], generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+
+        key = self._key(token)
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return  # The user changed while we were loading it
+            self._remove(key)
+            self._entries[key] = _Entry(user_id, claims, user, expires_at)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.user_id]
+
+
+# Global verified-token cache
+auth_cache = AuthCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
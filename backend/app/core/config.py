@@ -8,12 +8,34 @@ from typing import List, Optional
 class Settings(BaseSettings):
     # --- Database ---
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None  # Streaming replica for read-only routes (unset = primary only)
+    DB_READ_PIN_SECONDS: int = 5  # After a write, the client reads from the primary this long (> replica lag)
+    DB_POOL_SIZE: int = 5  # Persistent connections per engine (sync and async each have one)
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under burst load, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Wait for a free connection before erroring
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this (server/LB idle limits)
+    DB_POOL_PRE_PING: bool = False  # Ping on every checkout; off since disconnects are retried instead
+    DB_APP_REPLICAS: int = 1  # Backend instances sharing the database, for the max_connections check
+    DB_MIGRATIONS_ON_BOOT: str = "upgrade"  # "upgrade" | "check" (migrations run as a release step) | "off"
+
+    # --- SQL instrumentation ---
+    SQL_INSTRUMENTATION: bool = True  # Per-request query counts, Server-Timing header and /debug/sql report
+    SQL_SLOW_QUERY_MS: float = 200.0  # Statements at least this slow are logged (parameters redacted)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Identical statements per request before it is flagged as N+1
 
     # --- JWT ---
     JWT_SECRET_KEY: str = "change_me"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 60
 
+    # --- Password hashing ---
+    PASSWORD_HASH_WORKERS: int = 2  # bcrypt worker processes
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Waiting hashes before auth endpoints answer 503
+
+    # --- Auth cache ---
+    AUTH_CACHE_TTL_SECONDS: int = 60  # How long a verified token skips decode + user lookup (0 disables)
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
     # --- Environment ---
     ENV: str = "development"  # "production" on Vercel/Railway
 
@@ -32,6 +54,40 @@ class Settings(BaseSettings):
     # --- OpenAI ---
     OPENAI_API_KEY: str = ""
 
+    # --- LLM provider ---
+    LLM_PROVIDER: str = "openai"  # "openai" | "stub" (local, no network; for load and capacity tests)
+    LLM_CHAT_MODEL: str = "gpt-4o-mini"  # Cost efficient; can be changed to gpt-4o or gpt-4.1
+    LLM_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    LLM_STUB_LATENCY_MS: float = 300.0  # Stub time to first token
+    LLM_STUB_TOKENS_PER_SECOND: float = 50.0  # Stub generation speed after the first token
+    LLM_STUB_RESPONSE_TOKENS: int = 80  # Stub answer length (capped by max_tokens)
+    LLM_STUB_FAILURE_RATE: float = 0.0  # Fraction of stub calls that raise, 0..1
+    LLM_STUB_SEED: int = 0  # Same seed -> same failure sequence
+
+    # --- LLM scheduler ---
+    LLM_MAX_CONCURRENCY: int = 16  # Upstream calls in flight per worker
+    LLM_MAX_QUEUE: int = 100  # Waiting calls before new ones get 429
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    LLM_USER_RATE_PER_MINUTE: float = 20.0  # Per-user token bucket refill rate (0 disables)
+    LLM_USER_BURST: int = 5  # Per-user token bucket capacity
+
+    # --- Chat context ---
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1500  # Tokens of verbatim history sent per turn
+    CHAT_SUMMARY_TRIGGER_TOKENS: int = 3000  # Unsummarized history size that triggers a summary update
+    CHAT_SUMMARY_MAX_TOKENS: int = 300  # Upper bound on the rolling summary length
+    CHAT_CONTEXT_CACHE_SIZE: int = 1024  # Users whose assembled context is kept in memory
+
+    # --- Chat persistence ---
+    CHAT_WRITE_BATCH_SIZE: int = 500  # Max rows per batched chat message INSERT
+    CHAT_WRITE_MAX_PENDING: int = 5000  # Queued writes before callers wait for the database
+
+    # --- Chat response cache ---
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_CACHE_TTL_SECONDS: int = 3600
+    CHAT_CACHE_MAX_ENTRIES: int = 2048
+    CHAT_CACHE_NEAR_DUPLICATES: bool = False  # MinHash match on reworded prompts (tickers, numbers, dates must still match)
+    CHAT_CACHE_SIMILARITY: float = 0.8  # Estimated Jaccard similarity for a near-duplicate hit
+
     # --- OAuth ---
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
@@ -41,6 +97,40 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_SECRET: str = ""
     GITHUB_REDIRECT_URI: str = ""
 
+    OAUTH_METADATA_TTL_SECONDS: int = 3600  # How long OIDC discovery documents and JWKS are reused
+
+    # --- Outbound HTTP ---
+    HTTP_TIMEOUT_SECONDS: float = 10.0  # Read/write/pool timeout for third-party calls
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Idle connections kept open for reuse
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    # --- Market data ---
+    POLYGON_API_KEY: str = ""
+    POLYGON_BASE_URL: str = "https://api.polygon.io"  # Point at a local stand-in for load tests
+    MARKET_QUOTE_TTL_SECONDS: float = 15.0  # How long a quote is served without asking upstream
+    MARKET_QUOTE_STALE_SECONDS: float = 300.0  # Oldest quote served when the upstream is failing
+    MARKET_QUOTE_CACHE_MAX_ENTRIES: int = 10000
+    MARKET_QUOTES_MAX_SYMBOLS: int = 200  # Symbols per POST /market/quotes request
+    MARKET_UPSTREAM_BATCH_SIZE: int = 250  # Symbols per upstream snapshot call
+
+    # --- Symbol reference index ---
+    SYMBOLS_SNAPSHOT_PATH: str = "data/symbols.json"  # Reference snapshot the search index is built from
+    SYMBOLS_REFRESH_SECONDS: int = 86400  # Snapshot age before it is re-downloaded from Polygon
+    SYMBOLS_RELOAD_CHECK_SECONDS: int = 60  # How often the snapshot file is checked for changes
+    SYMBOLS_SEARCH_MAX_RESULTS: int = 25
+    SYMBOLS_VALIDATE_WRITES: bool = True  # Reject watchlist/pattern-trends symbols missing from the index
+    SYMBOLS_BATCH_MAX: int = 200  # Symbols per bulk watchlist/pattern-trends add
+
+    # --- OHLC bar store ---
+    BARS_DATA_DIR: str = "data/bars"  # Memory-mapped column files, one directory per symbol and timespan
+    BARS_TAIL_TTL_SECONDS: int = 60  # How often a symbol's newest bars are re-checked upstream
+    BARS_SETTLE_SECONDS: int = 3600  # A bar is persisted this long after it closes; younger ones stay in memory
+    BARS_DAY_MAX_DAYS: int = 3650  # Longest daily range served
+    BARS_MINUTE_MAX_DAYS: int = 30  # Minute bars only for the last N days: a first request backfills `from`..today (~390 bars/day)
+    BARS_MAX_OPEN_SERIES: int = 128  # Symbols kept mapped (6 file descriptors each)
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # ✅ prevents errors if extra vars are present in .env
@@ -0,0 +1,102 @@
+# backend/app/core/http.py
+
+import asyncio
+from typing import Optional
+import httpx  # type: ignore
+from .config import settings
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that sends through the shared connection pool but never closes it.
+    Handed to short-lived clients (Authlib creates one per OAuth call) so their
+    `async with` teardown leaves the pooled keep-alive connections alone.
+    """
+
+    def __init__(self, pool: "SharedHTTPClient"):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SharedHTTPClient:
+    """
+    App-lifetime outbound HTTP client.
+
+    One connection pool with keep-alive and bounded timeouts for every call the
+    backend makes to third parties (OAuth providers, market data), so repeat
+    requests to a host reuse an open TCP/TLS connection instead of paying for
+    new handshakes each time.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        connect_timeout_seconds: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry_seconds: float,
+    ):
+        self.timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _ensure(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._client is None:
+            # First use, or a new event loop (tests, benchmarks): pooled connections are loop-bound
+            self._loop = loop
+            self._transport = httpx.AsyncHTTPTransport(limits=self.limits, retries=1)
+            self._client = httpx.AsyncClient(transport=self._transport, timeout=self.timeout)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client; do not close it."""
+        self._ensure()
+        return self._client
+
+    @property
+    def transport(self) -> httpx.AsyncHTTPTransport:
+        self._ensure()
+        return self._transport
+
+    def borrowed_transport(self) -> httpx.AsyncBaseTransport:
+        """Transport for third-party clients that insist on owning (and closing) theirs."""
+        return _BorrowedTransport(self)
+
+    async def close(self) -> None:
+        """Close pooled connections (app shutdown)."""
+        client, self._client, self._transport, self._loop = self._client, None, None, None
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict:
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return {
+            "open": self._client is not None,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+        }
+
+
+# Global outbound HTTP client
+http_client = SharedHTTPClient(
+    timeout_seconds=settings.HTTP_TIMEOUT_SECONDS,
+    connect_timeout_seconds=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry_seconds=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+)
@@ -0,0 +1,138 @@
+# backend/app/core/oauth.py
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from authlib.integrations.starlette_client import OAuth  # type: ignore
+from authlib.integrations.starlette_client.apps import StarletteOAuth2App  # type: ignore
+from .config import settings
+from .http import http_client
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+
+
+class CachedOAuth2App(StarletteOAuth2App):
+    """
+    Starlette OAuth client whose provider metadata expires.
+
+    Authlib keeps a discovery document (and the JWKS it stores alongside it)
+    for the life of the process. Here both are reused for
+    OAUTH_METADATA_TTL_SECONDS, refreshed by one request at a time, and kept
+    (stale) if the provider can't be reached when they expire. Unknown signing
+    keys still trigger Authlib's own JWKS refetch.
+    """
+
+    metadata_ttl_seconds = settings.OAUTH_METADATA_TTL_SECONDS
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._registered_metadata = dict(self.server_metadata)
+        self._metadata_lock = asyncio.Lock()
+
+    def metadata_age(self) -> Optional[float]:
+        loaded_at = self.server_metadata.get("_loaded_at")
+        return time.time() - loaded_at if loaded_at is not None else None
+
+    def _metadata_fresh(self) -> bool:
+        age = self.metadata_age()
+        return age is not None and age < self.metadata_ttl_seconds
+
+    async def load_server_metadata(self):
+        if not self._server_metadata_url or self._metadata_fresh():
+            return self.server_metadata
+
+        async with self._metadata_lock:
+            if self._metadata_fresh():
+                return self.server_metadata  # Another request refreshed it
+            stale = self.server_metadata
+            self.server_metadata = dict(self._registered_metadata)
+            try:
+                await super().load_server_metadata()
+            except Exception as e:
+                if "_loaded_at" not in stale:
+                    raise
+                logger.warning(f"⚠️ Refreshing {self.name} OAuth metadata failed, reusing the cached copy: {e}")
+                self.server_metadata = stale
+        return self.server_metadata
+
+    async def warm(self) -> None:
+        """Fetch the discovery document and JWKS ahead of the first login."""
+        metadata = await self.load_server_metadata()
+        if metadata.get("jwks_uri") and not metadata.get("jwks"):
+            await self.fetch_jwk_set()
+
+    def stats(self) -> dict:
+        age = self.metadata_age()
+        return {
+            "discovery": bool(self._server_metadata_url),
+            "metadata_loaded": age is not None,
+            "metadata_age_seconds": round(age, 1) if age is not None else None,
+            "jwks_loaded": bool(self.server_metadata.get("jwks")),
+        }
+
+
+class _OAuth(OAuth):
+    oauth2_client_cls = CachedOAuth2App
+
+
+# Global OAuth registry; clients are registered once by register_oauth_clients()
+oauth = _OAuth()
+
+
+def register_oauth_clients() -> list[str]:
+    """
+    Register every configured provider (idempotent). Token exchanges go through
+    the shared connection pool instead of a fresh client per login.
+    """
+    client_kwargs = {
+        "transport": http_client.borrowed_transport(),
+        "timeout": http_client.timeout,
+    }
+
+    if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET and "google" not in oauth._registry:
+        oauth.register(
+            name="google",
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            server_metadata_url=GOOGLE_DISCOVERY_URL,
+            client_kwargs={**client_kwargs, "scope": "openid email profile"},
+        )
+
+    if settings.GITHUB_CLIENT_ID and settings.GITHUB_CLIENT_SECRET and "github" not in oauth._registry:
+        oauth.register(
+            name="github",
+            client_id=settings.GITHUB_CLIENT_ID,
+            client_secret=settings.GITHUB_CLIENT_SECRET,
+            access_token_url="https://github.com/login/oauth/access_token",
+            authorize_url="https://github.com/login/oauth/authorize",
+            api_base_url="https://api.github.com/",
+            client_kwargs={**client_kwargs, "scope": "user:email"},
+        )
+
+    return list(oauth._registry)
+
+
+def get_oauth_client(name: str) -> Optional[CachedOAuth2App]:
+    """Registered client for a provider, or None if it isn't configured."""
+    register_oauth_clients()
+    return oauth.create_client(name)
+
+
+async def warm_oauth_clients() -> None:
+    """Prefetch provider metadata at startup; a failure only means the first login fetches it."""
+    for name in register_oauth_clients():
+        client = oauth.create_client(name)
+        if not client.stats()["discovery"]:
+            continue  # Static endpoints, nothing to prefetch
+        try:
+            await client.warm()
+            print(f"✅ {name} OAuth metadata cached.")
+        except Exception as e:
+            print(f"⚠️ Could not prefetch {name} OAuth metadata: {e}")
+
+
+def oauth_stats() -> dict:
+    return {name: oauth.create_client(name).stats() for name in oauth._registry}
@@ -1,4 +1,13 @@
+import asyncio
+import math
+import multiprocessing
+import secrets
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from jose import jwt  # type: ignore
 from passlib.context import CryptContext  # type: ignore
 from .config import settings
@@ -6,6 +15,19 @@ from .config import settings
 # Initialize the password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Stored instead of a hash for accounts that can't log in with a password
+# (OAuth sign-ups); never matches anything and costs no bcrypt round
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
+def make_unusable_password() -> str:
+    """Password field value for accounts without a password (see UNUSABLE_PASSWORD_PREFIX)."""
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(16)
+
+
+def is_usable_password(hashed: str) -> bool:
+    return not hashed.startswith(UNUSABLE_PASSWORD_PREFIX)
+
 
 def hash_password(password: str) -> str:
     """
@@ -30,12 +52,148 @@ def verify_password(plain: str, hashed: str) -> bool:
     if plain is None or hashed is None:
         return False
 
+    if not is_usable_password(hashed):
+        return False
+
     if len(plain) > 72:
         plain = plain[:72]
 
     return pwd_context.verify(plain, hashed)
 
 
+# ============================================================
+# 🧮 Bounded bcrypt worker pool
+# ============================================================
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the hashing pool's queue is full; maps to HTTP 503."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Authentication service is busy. Please retry shortly.")
+        self.detail = str(self)
+        self.retry_after = retry_after
+
+
+def _warm_up() -> None:
+    """Runs in a worker so its interpreter and bcrypt backend are loaded ahead of time."""
+    pwd_context.hash("warm-up")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated, size-limited process pool.
+
+    bcrypt costs ~100-300 ms of CPU per call; on the shared threadpool a login
+    storm starves every sync endpoint. Here at most `workers` hashes run at
+    once and at most `max_queue` more wait; past that callers get
+    PasswordHasherBusyError right away, so a burst degrades only the
+    endpoints that hash passwords.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._durations: deque[float] = deque(maxlen=500)
+
+    def start(self) -> None:
+        """Create the pool and spawn its workers (called at app startup)."""
+        if self._pool is None:
+            # spawn, not fork: forking a process that already runs threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            for _ in range(self.workers):
+                self._pool.submit(_warm_up)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        if hashed is None or not is_usable_password(hashed):
+            return False  # Nothing to check; don't spend a worker on it
+        return await self._run(verify_password, plain, hashed)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusyError(self._retry_after())
+
+        self.start()
+        self._pending += 1
+        started = time.monotonic()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next call
+            self.failed += 1
+            self.shutdown()
+            raise
+        except BaseException:
+            # Errors and cancellations aren't service times; keep them out of Retry-After
+            self.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self.completed += 1
+        self._durations.append(time.monotonic() - started)
+        return result
+
+    def _retry_after(self) -> int:
+        service = sum(self._durations) / len(self._durations) if self._durations else 0.3
+        return max(1, math.ceil(self._pending * service / max(1, self.workers)))
+
+    def stats(self) -> dict:
+        durations = sorted(self._durations)
+
+        def percentile(p: float) -> float:
+            if not durations:
+                return 0.0
+            return round(durations[min(len(durations) - 1, int(p * len(durations)))] * 1000, 2)
+
+        return {
+            "workers": self.workers,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": max(0, self._pending - self.workers),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "duration_ms_p50": percentile(0.5),
+            "duration_ms_p95": percentile(0.95),
+        }
+
+
+# Global hashing pool shared by register, login, password change and OAuth sign-up
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the dedicated bcrypt pool (raises PasswordHasherBusyError when full)."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password on the dedicated bcrypt pool (raises PasswordHasherBusyError when full)."""
+    return await password_hasher.verify(plain, hashed)
+
+
 def create_access_token(data: dict) -> str:
     """
     Create a JWT access token with expiration.
@@ -1,17 +1,96 @@
 # backend/app/db/database.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.db.pool import ReconnectingSession, instrument_engine, pool_options
 
 # --- Database Engine ---
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # helps prevent "stale connection" errors
-)
+# Pool sizing comes from Settings; dropped connections are handled by
+# ReconnectingSession instead of a ping on every checkout
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
+instrument_engine("primary", engine)
 
 # --- Session Factory ---
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+SessionLocal = sessionmaker(
+    bind=engine, class_=ReconnectingSession, autocommit=False, autoflush=False
+)
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convert a sync DATABASE_URL into the matching async driver URL.
+    postgresql[+psycopg2] -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite.
+    """
+    u = make_url(url)
+    backend = u.get_backend_name()
+
+    if backend == "postgresql":
+        u = u.set(drivername="postgresql+asyncpg")
+        # asyncpg doesn't understand libpq's sslmode; it takes `ssl` instead
+        sslmode = u.query.get("sslmode")
+        if sslmode:
+            u = u.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    elif backend == "sqlite":
+        u = u.set(drivername="sqlite+aiosqlite")
+
+    return u.render_as_string(hide_password=False)
+
+
+# --- Async Database Engine ---
+# Used by async handlers so queries don't block the event loop
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    **pool_options(settings.DATABASE_URL, is_async=True),
+)
+instrument_engine("primary_async", async_engine.sync_engine)
+
+# --- Async Session Factory ---
+# expire_on_commit=False keeps attributes readable after commit without a
+# lazy reload (lazy IO is not allowed on an AsyncSession)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=ReconnectingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# --- Read Replica (optional) ---
+# Read-only routes opt in through app.db.routing.get_read_db / get_async_read_db;
+# without DATABASE_READ_URL the read factories are the primary ones
+read_replica_configured = bool(settings.DATABASE_READ_URL)
+
+if read_replica_configured:
+    read_engine = create_engine(settings.DATABASE_READ_URL, **pool_options(settings.DATABASE_READ_URL))
+    instrument_engine("replica", read_engine)
+    async_read_engine = create_async_engine(
+        to_async_url(settings.DATABASE_READ_URL),
+        **pool_options(settings.DATABASE_READ_URL, is_async=True),
+    )
+    instrument_engine("replica_async", async_read_engine.sync_engine)
+
+    ReadSessionLocal = sessionmaker(
+        bind=read_engine,
+        class_=ReconnectingSession,
+        autocommit=False,
+        autoflush=False,
+        info={"read_only": True},
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=async_read_engine,
+        sync_session_class=ReconnectingSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={"read_only": True},
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+    ReadSessionLocal = SessionLocal
+    AsyncReadSessionLocal = AsyncSessionLocal
 
 
 # --- Declarative Base ---
@@ -33,4 +112,14 @@ def get_db():
         db.close()
 
 
+# --- Async dependency for FastAPI routes ---
+async def get_async_db():
+    """
+    Yields a new AsyncSession for each request.
+    Ensures it is properly closed after the request ends.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 
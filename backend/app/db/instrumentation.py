@@ -0,0 +1,175 @@
+# backend/app/db/instrumentation.py
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def redact_parameters(parameters, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so logs never carry user data."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return "<redacted>"
+
+
+class RequestSQLStats:
+    """Statements and DB time of one HTTP request."""
+
+    __slots__ = ("queries", "duration", "slow", "statements", "finished")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.slow = 0
+        self.statements: Counter[str] = Counter()
+        self.finished = False  # Background tasks spawned by the request may outlive it
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Identical statements run at least `threshold` times: likely N+1 loops."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    slow = elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS
+    if slow:
+        logger.warning(
+            f"🐢 Slow query ({elapsed * 1000:.1f} ms): {_normalize(statement)[:500]} "
+            f"params={redact_parameters(parameters, executemany)}"
+        )
+
+    stats = _current.get()
+    if stats is None or stats.finished:
+        return
+    stats.queries += 1
+    stats.duration += elapsed
+    stats.slow += slow
+    stats.statements[_normalize(statement)] += 1
+
+
+class SQLReport:
+    """Per-route aggregate of query counts, DB time, slow queries and N+1 suspects."""
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: RequestSQLStats) -> None:
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            sql, count = repeated[0]
+            logger.warning(f"🔁 Possible N+1 on {route}: {count}x {sql[:300]}")
+
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "max_queries": 0,
+                "db_time": 0.0,
+                "slow_queries": 0,
+                "n_plus_one_requests": 0,
+                "n_plus_one_statements": Counter(),
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.queries
+            entry["max_queries"] = max(entry["max_queries"], stats.queries)
+            entry["db_time"] += stats.duration
+            entry["slow_queries"] += stats.slow
+            if repeated:
+                entry["n_plus_one_requests"] += 1
+                for sql, count in repeated:
+                    entry["n_plus_one_statements"][sql[:300]] = max(entry["n_plus_one_statements"][sql[:300]], count)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            routes = {}
+            for route, e in sorted(self._routes.items(), key=lambda item: -item[1]["db_time"]):
+                n = e["requests"]
+                routes[route] = {
+                    "requests": n,
+                    "avg_queries": round(e["queries"] / n, 2),
+                    "max_queries": e["max_queries"],
+                    "avg_db_ms": round(e["db_time"] / n * 1000, 3),
+                    "total_db_ms": round(e["db_time"] * 1000, 1),
+                    "slow_queries": e["slow_queries"],
+                    "n_plus_one_requests": e["n_plus_one_requests"],
+                    "n_plus_one_statements": dict(e["n_plus_one_statements"].most_common(5)),
+                }
+            return routes
+
+
+# Global per-route SQL report
+sql_report = SQLReport(n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    ASGI middleware attributing SQL statements to the request that ran them.
+
+    Adds `Server-Timing: db;dur=<ms>;desc="<n> queries"` covering the work done
+    before the response headers went out, and feeds the full request (including
+    any streamed body) into `sql_report` under its route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_INSTRUMENTATION:
+            return await self.app(scope, receive, send)
+
+        stats = RequestSQLStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.duration * 1000:.1f};desc="{stats.queries} queries"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            stats.finished = True
+            # Route templates keep the report bounded; unmatched paths share one bucket
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            sql_report.record(f"{scope['method']} {path}", stats)
@@ -0,0 +1,231 @@
+# backend/app/db/migrate.py
+"""
+Versioned schema migrations.
+
+Migrations live in app/db/migrations as NNNN_description.py and are applied
+in order, each recorded in the schema_version table. On PostgreSQL the run
+holds an advisory lock, so replicas starting together apply each migration
+exactly once while the others wait.
+
+    python -m app.db.migrate                 # apply pending migrations
+    python -m app.db.migrate upgrade --wait 60
+    python -m app.db.migrate check           # exit 1 if the database is behind
+    python -m app.db.migrate status
+
+The app itself runs this according to DB_MIGRATIONS_ON_BOOT ("upgrade",
+"check" or "off"); production deploys should migrate as a release step and
+boot with "check".
+"""
+
+import argparse
+import importlib
+import re
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from app.db.database import engine as default_engine
+from app.db import migrations as migrations_package
+
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Arbitrary key for pg_advisory_lock; only this runner takes it
+ADVISORY_LOCK_KEY = 7_240_017
+
+schema_version = Table(
+    "schema_version", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than this build expects."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    description: str
+    transactional: bool
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> list[Migration]:
+    """All migrations in the package, ordered by version."""
+    found = []
+    for path in Path(migrations_package.__file__).parent.iterdir():
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{migrations_package.__name__}.{path.stem}")
+        found.append(Migration(
+            version=int(match.group(1)),
+            name=path.stem,
+            description=getattr(module, "description", match.group(2)),
+            transactional=getattr(module, "transactional", True),
+            upgrade=module.upgrade,
+        ))
+    found.sort(key=lambda m: m.version)
+    versions = [m.version for m in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {versions}")
+    return found
+
+
+def head_version() -> int:
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+def applied_versions(conn: Connection) -> set[int]:
+    if not inspect(conn).has_table(schema_version.name):
+        return set()
+    return set(conn.scalars(select(schema_version.c.version)))
+
+
+def current_version(engine: Engine = default_engine) -> int:
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version.name):
+            return 0
+        return conn.scalar(select(func.max(schema_version.c.version))) or 0
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Serialize migration runs across processes (PostgreSQL advisory lock)."""
+    if engine.dialect.name != "postgresql":
+        yield  # SQLite: single local process
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            conn.commit()
+
+
+def upgrade(engine: Engine = default_engine, target: Optional[int] = None) -> list[Migration]:
+    """Apply pending migrations (up to `target`) and return the ones applied."""
+    migrations = discover()
+    applied: list[Migration] = []
+
+    with migration_lock(engine):
+        with engine.begin() as conn:
+            schema_version.create(conn, checkfirst=True)
+        # Read after taking the lock: another replica may have just finished
+        with engine.connect() as conn:
+            done = applied_versions(conn)
+
+        for migration in migrations:
+            if migration.version in done or (target is not None and migration.version > target):
+                continue
+            print(f"🔧 Applying migration {migration.name}: {migration.description}...")
+            start = time.perf_counter()
+            if migration.transactional:
+                with engine.begin() as conn:
+                    migration.upgrade(conn)
+                    _record(conn, migration)
+            else:
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    migration.upgrade(conn)
+                with engine.begin() as conn:
+                    _record(conn, migration)
+            print(f"✅ Migration {migration.name} applied in {(time.perf_counter() - start) * 1000:.0f} ms")
+            applied.append(migration)
+
+    return applied
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(insert(schema_version).values(version=migration.version, description=migration.description))
+
+
+def check(engine: Engine = default_engine) -> int:
+    """Return the schema version, raising SchemaVersionError if migrations are pending."""
+    current, head = current_version(engine), head_version()
+    if current < head:
+        raise SchemaVersionError(
+            f"Database schema is at version {current} but this build needs {head}; "
+            f"run `python -m app.db.migrate upgrade`"
+        )
+    if current > head:
+        # A newer release already migrated; its changes must stay backward compatible
+        print(f"⚠️ Database schema version {current} is ahead of this build ({head})")
+    return current
+
+
+def wait_for_database(engine: Engine = default_engine, timeout_seconds: float = 0) -> None:
+    """Block until the database accepts connections (for release jobs started alongside it)."""
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return
+        except OperationalError as e:
+            if time.monotonic() >= deadline:
+                raise
+            print(f"⏳ Database not ready yet: {e.orig}")
+            time.sleep(1)
+
+
+def run_on_boot(mode: str, engine: Engine = default_engine) -> Optional[int]:
+    """Apply DB_MIGRATIONS_ON_BOOT: "upgrade", "check" or "off"."""
+    mode = mode.lower()
+    if mode == "off":
+        return None
+    start = time.perf_counter()
+    if mode == "upgrade":
+        upgrade(engine)
+        version = current_version(engine)
+    elif mode == "check":
+        version = check(engine)
+    else:
+        raise ValueError(f"DB_MIGRATIONS_ON_BOOT must be upgrade, check or off, not {mode!r}")
+    print(f"✅ Database schema at version {version} ({mode} took {(time.perf_counter() - start) * 1000:.0f} ms)")
+    return version
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrate", description="Versioned schema migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "check", "status"])
+    parser.add_argument("--target", type=int, help="Stop after this version (upgrade only)")
+    parser.add_argument("--wait", type=float, default=0, metavar="SECONDS",
+                        help="Wait up to this long for the database to accept connections")
+    args = parser.parse_args(argv)
+
+    wait_for_database(default_engine, args.wait)
+
+    if args.command == "upgrade":
+        applied = upgrade(default_engine, args.target)
+        print(f"✅ Schema at version {current_version(default_engine)} ({len(applied)} migration(s) applied)")
+        return 0
+
+    if args.command == "check":
+        try:
+            print(f"✅ Schema at version {check(default_engine)}")
+            return 0
+        except SchemaVersionError as e:
+            print(f"❌ {e}")
+            return 1
+
+    with default_engine.connect() as conn:
+        done = applied_versions(conn)
+    for migration in discover():
+        mark = "✅" if migration.version in done else "⏳"
+        print(f"{mark} {migration.name}: {migration.description}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# backend/app/db/migrations/0001_initial_schema.py
+"""
+Baseline tables, frozen as they were when versioned migrations were introduced.
+Tables that already exist (databases built by the old create_all boot) are left alone.
+"""
+
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text, func,
+)
+
+description = "Baseline tables"
+transactional = True
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(120)),
+    Column("email", String(255), unique=True, index=True, nullable=True),
+    Column("username", String(64), unique=True, index=True),
+    Column("hashed_password", String(255), nullable=False),
+    Column("provider", String(32), nullable=False),
+    Column("provider_id", String(255)),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+Table(
+    "watchlist_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("symbol", String(10), nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+Table(
+    "chat_messages", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("role", String(20), nullable=False),
+    Column("content", String(5000), nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now(), index=True),
+)
+
+Table(
+    "chat_summaries", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("summary", Text, nullable=False),
+    Column("summarized_through_id", Integer, nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+Table(
+    "pattern_trends_items", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("symbol", String(10), nullable=False, index=True),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+Table(
+    "risk_settings", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True),
+    Column("max_position_size", Float, nullable=False),
+    Column("stop_loss", Float, nullable=False),
+    Column("take_profit", Float, nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,14 @@
+# backend/app/db/migrations/0002_users_email_nullable.py
+"""Allow username-only registration (was the information_schema check on every boot)."""
+
+from sqlalchemy import text
+
+description = "Make users.email nullable"
+transactional = True
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return  # SQLite tables are created with a nullable email by 0001
+    # A no-op when the column is already nullable
+    conn.execute(text("ALTER TABLE users ALTER COLUMN email DROP NOT NULL"))
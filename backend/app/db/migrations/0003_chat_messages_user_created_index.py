@@ -0,0 +1,11 @@
+# backend/app/db/migrations/0003_chat_messages_user_created_index.py
+"""Composite index serving the per-user history scan and keyset pagination."""
+
+from app.db.migrations import create_index
+
+description = "Index chat_messages (user_id, created_at)"
+transactional = False
+
+
+def upgrade(conn):
+    create_index(conn, "ix_chat_messages_user_id_created_at", "chat_messages", ["user_id", "created_at"])
@@ -0,0 +1,11 @@
+# backend/app/db/migrations/0004_users_provider_identity.py
+"""One account per OAuth identity; arbiter for the sign-in upsert."""
+
+from app.db.migrations import create_index
+
+description = "Unique index users (provider, provider_id)"
+transactional = False
+
+
+def upgrade(conn):
+    create_index(conn, "uq_users_provider_identity", "users", ["provider", "provider_id"], unique=True)
@@ -0,0 +1,43 @@
+# backend/app/db/migrations/0005_symbol_lists_unique_user_symbol.py
+"""
+Unique (user_id, symbol) on the watchlist and pattern trends tables, the
+arbiter for their single-statement add. The old user_id index is dropped
+since the composite index's prefix serves the same lookups.
+
+Existing duplicates are deleted first, but the app keeps writing while the
+index is built CONCURRENTLY, so a duplicate can slip in between and fail the
+build. The migration then drops the INVALID index it left and repeats
+de-dup + build, up to MAX_ATTEMPTS times, before giving up with the error.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app.db.migrations import create_index
+
+description = "Unique (user_id, symbol) on watchlist_items and pattern_trends_items"
+transactional = False
+
+TABLES = ("watchlist_items", "pattern_trends_items")
+MAX_ATTEMPTS = 5
+
+
+def upgrade(conn):
+    concurrently = " CONCURRENTLY" if conn.dialect.name == "postgresql" else ""
+    for table in TABLES:
+        name = f"uq_{table}_user_id_symbol"
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            # The old SELECT-then-INSERT path could race into duplicates; keep the oldest row
+            conn.execute(text(
+                f"DELETE FROM {table} WHERE id NOT IN "
+                f"(SELECT MIN(id) FROM {table} GROUP BY user_id, symbol)"
+            ))
+            try:
+                create_index(conn, name, table, ["user_id", "symbol"], unique=True)
+                break
+            except IntegrityError:
+                # A duplicate was inserted during the build; don't leave the INVALID index behind
+                conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                print(f"⚠️ Duplicate {table} row added while building {name}, retrying ({attempt}/{MAX_ATTEMPTS})")
+        conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS ix_{table}_user_id"))
@@ -0,0 +1,39 @@
+# backend/app/db/migrations/__init__.py
+"""
+Versioned schema migrations, applied in order by app.db.migrate.
+
+Each migration is a module named NNNN_description.py defining:
+
+    description = "what it changes"
+    transactional = True   # False for statements PostgreSQL can't run in a
+                           # transaction (CREATE INDEX CONCURRENTLY)
+
+    def upgrade(conn): ...
+
+Migrations must be self-contained: never import app.db.models here, the
+models describe the latest schema, not the one a migration starts from.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def create_index(conn: Connection, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    """
+    CREATE [UNIQUE] INDEX IF NOT EXISTS, built CONCURRENTLY on PostgreSQL so
+    writes to the table aren't blocked. Run from a non-transactional migration.
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    cols = ", ".join(columns)
+
+    if conn.dialect.name == "postgresql":
+        # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep
+        invalid = conn.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({cols})"))
+    else:
+        conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({cols})"))
@@ -1,12 +1,19 @@
 # backend/app/db/models.py
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, DateTime, func, ForeignKey, Float
+from sqlalchemy import Integer, String, Text, DateTime, func, ForeignKey, Float, Index
 from .database import Base
 
+# Models describe the latest schema; every change here needs a migration in app/db/migrations
+
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # One account per OAuth identity; arbiter for the sign-in upsert
+        # (local users have a NULL provider_id, which never conflicts)
+        Index("uq_users_provider_identity", "provider", "provider_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str | None] = mapped_column(String(120))
@@ -29,6 +36,11 @@ class User(Base):
         "ChatMessage", back_populates="user", cascade="all, delete-orphan", order_by="ChatMessage.created_at"
     )
     
+    # Relationship to rolling chat summary (one-to-one)
+    chat_summary: Mapped["ChatSummary | None"] = relationship(
+        "ChatSummary", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
+    
     # Relationship to pattern trends items
     pattern_trends_items: Mapped[list["PatternTrendsItem"]] = relationship(
         "PatternTrendsItem", back_populates="user", cascade="all, delete-orphan"
@@ -42,9 +54,14 @@ class User(Base):
 
 class WatchlistItem(Base):
     __tablename__ = "watchlist_items"
+    __table_args__ = (
+        # One row per symbol per user; arbiter for the add upsert, and its
+        # user_id prefix serves the per-user listing
+        Index("uq_watchlist_items_user_id_symbol", "user_id", "symbol", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     symbol: Mapped[str] = mapped_column(String(10), nullable=False, index=True)  # e.g., "AAPL", "TSLA"
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -56,6 +73,10 @@ class WatchlistItem(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Serves the per-user history scan and keyset pagination in one index range
+        Index("ix_chat_messages_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -69,11 +90,31 @@ class ChatMessage(Base):
     user: Mapped["User"] = relationship("User", back_populates="chat_messages")
 
 
+class ChatSummary(Base):
+    __tablename__ = "chat_summaries"
+
+    # One rolling summary per user, so the user id is the key
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    summary: Mapped[str] = mapped_column(Text, nullable=False, default="")  # Condensed older turns
+    summarized_through_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Last ChatMessage.id folded in
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    
+    # Relationship to user
+    user: Mapped["User"] = relationship("User", back_populates="chat_summary")
+
+
 class PatternTrendsItem(Base):
     __tablename__ = "pattern_trends_items"
+    __table_args__ = (
+        # One row per symbol per user; arbiter for the add upsert, and its
+        # user_id prefix serves the per-user listing
+        Index("uq_pattern_trends_items_user_id_symbol", "user_id", "symbol", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     symbol: Mapped[str] = mapped_column(String(10), nullable=False, index=True)  # e.g., "AAPL", "TSLA"
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
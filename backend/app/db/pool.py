@@ -0,0 +1,230 @@
+# backend/app/db/pool.py
+
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait, in-use and overflow counters for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self._timed_checkouts = 0  # Only the instrumented pools time their waits
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.checkout_timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.invalidations = 0
+        self.reconnect_retries = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self._timed_checkouts += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+
+    def stats(self, pool) -> dict:
+        timed = self._timed_checkouts
+        stats = {
+            "pool": type(pool).__name__,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "checkouts": self.checkouts,
+            "avg_checkout_wait_ms": round(self.checkout_wait_total / timed * 1000, 3) if timed else 0.0,
+            "max_checkout_wait_ms": round(self.checkout_wait_max * 1000, 3),
+            "checkout_timeouts": self.checkout_timeouts,
+            "connects": self.connects,
+            "overflow_connects": self.overflow_connects,
+            "invalidations": self.invalidations,
+            "reconnect_retries": self.reconnect_retries,
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_in=pool.checkedin(), overflow=pool.overflow())
+        return stats
+
+
+class _TimedCheckout:
+    """Mixin timing how long a checkout waits for a free connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """
+    create_engine pool arguments for a DATABASE_URL.
+
+    PostgreSQL gets a sized, instrumented queue pool from Settings. Other
+    backends (SQLite in development) keep their dialect's default pool.
+    Liveness is checked by error handling (see ReconnectingSession) unless
+    DB_POOL_PRE_PING turns the per-checkout ping back on.
+    """
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "postgresql":
+        return options
+    return {
+        **options,
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        # Hand back the most recently used connection so idle ones age out via recycle
+        "pool_use_lifo": True,
+    }
+
+
+# Metrics per engine, keyed by a short name ("primary", "primary_async", ...)
+pool_metrics: dict[str, PoolMetrics] = {}
+_engines: dict[str, Engine] = {}
+
+
+def instrument_engine(name: str, engine: Engine) -> PoolMetrics:
+    """Publish pool metrics for a (sync) engine; pass `async_engine.sync_engine` for async ones."""
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    _engines[name] = engine
+    engine.pool.metrics = metrics  # Read by the instrumented pools' checkout timer
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+        # QueuePool counts overflow from -pool_size, so > 0 means beyond the pool
+        if isinstance(engine.pool, QueuePool) and engine.pool.overflow() > 0:
+            metrics.overflow_connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with metrics._lock:
+            metrics.checkouts += 1
+            metrics.in_use += 1
+            metrics.peak_in_use = max(metrics.peak_in_use, metrics.in_use)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.in_use = max(0, metrics.in_use - 1)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    return metrics
+
+
+def pool_stats() -> dict:
+    return {name: metrics.stats(_engines[name].pool) for name, metrics in pool_metrics.items()}
+
+
+def connection_budget() -> dict:
+    """Worst-case connections to the primary this deployment can open across DB_APP_REPLICAS."""
+    engines = sum(1 for name in _engines if not name.startswith("replica"))
+    per_engine = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return {
+        "per_engine": per_engine,
+        "per_app_replica": per_engine * engines,
+        "app_replicas": settings.DB_APP_REPLICAS,
+        "total": per_engine * engines * settings.DB_APP_REPLICAS,
+    }
+
+
+def check_connection_budget(engine: Engine) -> Optional[dict]:
+    """
+    Compare the pool budget against PostgreSQL's max_connections and warn when
+    every replica at full overflow would exhaust the server.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    budget = connection_budget()
+    with engine.connect() as conn:
+        max_connections = int(conn.exec_driver_sql("SHOW max_connections").scalar())
+        reserved = int(conn.exec_driver_sql("SHOW superuser_reserved_connections").scalar())
+    budget["server_max_connections"] = max_connections - reserved
+    if budget["total"] > budget["server_max_connections"]:
+        print(
+            f"⚠️ DB pools can open {budget['total']} connections "
+            f"({budget['app_replicas']} app replicas x {budget['per_app_replica']}) but PostgreSQL allows "
+            f"{budget['server_max_connections']}; lower DB_POOL_SIZE/DB_MAX_OVERFLOW or add a pooler."
+        )
+    else:
+        print(f"✅ DB pool budget {budget['total']}/{budget['server_max_connections']} connections")
+    return budget
+
+
+class ReconnectingSession(Session):
+    """
+    Session that survives connections the server has dropped.
+
+    Without a pre-ping, a dead pooled connection surfaces as a disconnect
+    error on the first statement of a transaction. SQLAlchemy then invalidates
+    the pool; if that statement was an explicit execute()/scalar()/scalars()
+    (reads, or core writes) and nothing else ran in the transaction yet, it is
+    retried once on a fresh connection. Failures mid-transaction still raise,
+    since earlier work would be lost.
+
+    ORM flushes (flush(), and commit() flushing pending objects) are not
+    retried: the rollback after a failed flush expunges new objects and
+    expires changed ones, so a second attempt would silently write nothing.
+    """
+
+    def _retry_on_disconnect(self, method, *args, **kwargs):
+        fresh = not self.in_transaction()
+        try:
+            return method(*args, **kwargs)
+        except DBAPIError as e:
+            if not (fresh and e.connection_invalidated):
+                raise
+            logger.warning(f"⚠️ Database connection was lost, retrying on a new one: {e.orig}")
+            self.rollback()
+            metrics = getattr(self.get_bind().pool, "metrics", None)
+            if metrics is not None:
+                metrics.reconnect_retries += 1
+            return method(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._retry_on_disconnect(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._retry_on_disconnect(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._retry_on_disconnect(super().scalars, *args, **kwargs)
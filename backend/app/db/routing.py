@@ -0,0 +1,112 @@
+# backend/app/db/routing.py
+
+import time
+from contextvars import ContextVar
+from typing import Literal, Optional, cast
+from fastapi import Request, Response
+from sqlalchemy import event
+from app.core.config import settings
+from app.db.database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    read_replica_configured,
+)
+from app.db.pool import ReconnectingSession
+
+# Cookie holding the unix time until which this client reads from the primary
+PIN_COOKIE = "db_primary_pin"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class _RequestWrites:
+    """Per-request marker flipped when a primary session commits."""
+
+    __slots__ = ("committed",)
+
+    def __init__(self):
+        self.committed = False
+
+
+_request_writes: ContextVar[Optional[_RequestWrites]] = ContextVar("request_writes", default=None)
+
+
+@event.listens_for(ReconnectingSession, "after_commit")
+def _mark_primary_commit(session) -> None:
+    if session.info.get("read_only"):
+        return
+    marker = _request_writes.get()
+    if marker is not None:
+        marker.committed = True
+
+
+def is_pinned(request: Request) -> bool:
+    """True while the client's own recent write may not have reached the replica yet."""
+    value = request.cookies.get(PIN_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_to_primary(response: Response) -> None:
+    """Route this client's reads to the primary for DB_READ_PIN_SECONDS."""
+    is_production = settings.ENV.lower() == "production"
+    samesite = "none" if is_production else (settings.COOKIE_SAMESITE or "lax").lower()
+    response.set_cookie(
+        key=PIN_COOKIE,
+        value=str(int(time.time() + settings.DB_READ_PIN_SECONDS)),
+        max_age=settings.DB_READ_PIN_SECONDS,
+        httponly=True,
+        samesite=cast(Literal["lax", "strict", "none"], samesite),
+        secure=is_production or bool(settings.COOKIE_SECURE),
+        path="/",
+        domain=settings.COOKIE_DOMAIN if is_production and settings.COOKIE_DOMAIN else None,
+    )
+
+
+async def read_your_writes(request: Request, call_next):
+    """
+    HTTP middleware: after a successful write (an unsafe method, or any request
+    that committed on the primary, e.g. an OAuth callback) pin the client to the
+    primary for a few seconds so its next reads see its own changes despite
+    replication lag. A no-op without a read replica.
+    """
+    if not read_replica_configured:
+        return await call_next(request)
+
+    marker = _RequestWrites()
+    token = _request_writes.set(marker)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_writes.reset(token)
+
+    if response.status_code < 400 and (marker.committed or request.method not in SAFE_METHODS):
+        pin_to_primary(response)
+    return response
+
+
+# --- Read-only dependencies for FastAPI routes (opt in per route) ---
+def get_read_db(request: Request):
+    """
+    Yields a session on the read replica, or on the primary when no replica is
+    configured or the client is pinned after a recent write. Never write with it.
+    """
+    factory = ReadSessionLocal if not is_pinned(request) else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db."""
+    factory = AsyncReadSessionLocal if not is_pinned(request) else AsyncSessionLocal
+    async with factory() as db:
+        yield db
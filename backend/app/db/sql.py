@@ -0,0 +1,43 @@
+# backend/app/db/sql.py
+
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from app.db.database import engine
+
+
+def dialect_insert(entity):
+    """
+    INSERT construct for the configured database that supports
+    on_conflict_do_update / on_conflict_do_nothing (PostgreSQL and SQLite).
+    """
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(entity)
+
+
+def unique_violation(e: IntegrityError) -> Optional[str]:
+    """
+    Identify the unique constraint behind an IntegrityError, or None if it wasn't one.
+
+    Returns the constraint/index name on PostgreSQL (e.g. "ix_users_email") and
+    the column list on SQLite (e.g. "users.email"), lowercased, so callers can
+    map it to the field that clashed.
+    """
+    orig = e.orig
+    # psycopg2 exposes diagnostics; asyncpg errors arrive wrapped by SQLAlchemy's adapter
+    for source in (getattr(orig, "diag", None), getattr(orig, "__cause__", None), orig):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name.lower()
+
+    message = str(orig).lower()
+    if "unique constraint failed:" in message:  # SQLite
+        return message.split("unique constraint failed:", 1)[1].strip()
+    if "duplicate key" in message or "unique" in message:
+        return message
+    return None
@@ -0,0 +1,112 @@
+# backend/app/llm/client.py
+
+import logging
+from typing import AsyncIterator, Optional
+from app.llm.providers import LLMProvider, get_provider
+from app.llm.scheduler import Priority, scheduler
+from app.llm.singleflight import request_key, singleflight
+
+logger = logging.getLogger(__name__)
+
+
+class LLMNotConfiguredError(RuntimeError):
+    """Raised when an LLM call is attempted without a usable provider (e.g. no OPENAI_API_KEY)."""
+
+
+def is_configured() -> bool:
+    """True if the active provider can serve calls."""
+    return get_provider().is_configured
+
+
+def _require_provider() -> LLMProvider:
+    provider = get_provider()
+    if not provider.is_configured:
+        raise LLMNotConfiguredError(
+            "AI service is not configured. Please set OPENAI_API_KEY environment variable."
+        )
+    return provider
+
+
+async def complete(
+    messages: list[dict],
+    *,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    user_id: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> str:
+    """
+    Chat completion returning the full text.
+    The user's rate budget is charged up front (LLMBusyError when exhausted or
+    overloaded); concurrent identical requests then share a single upstream
+    call, which waits for a global scheduler slot.
+    """
+    provider = _require_provider()
+    scheduler.admit(user_id)
+
+    async def call() -> str:
+        async with scheduler.slot(priority):
+            return await provider.complete(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
+    key = request_key(model, messages, temperature=temperature, max_tokens=max_tokens)
+    return await singleflight.do(key, call)
+
+
+def stream(
+    messages: list[dict],
+    *,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    user_id: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> AsyncIterator[str]:
+    """
+    Streaming chat completion yielding text deltas.
+    Admission is checked when this is called (so callers can still answer 429
+    before the response starts); the scheduler slot is held while the stream runs.
+    Concurrent identical requests share one upstream stream.
+    """
+    provider = _require_provider()
+    scheduler.admit(user_id)
+
+    async def deltas() -> AsyncIterator[str]:
+        async with scheduler.slot(priority):
+            async for delta in provider.stream(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ):
+                yield delta
+
+    key = request_key(model, messages, temperature=temperature, max_tokens=max_tokens, stream=True)
+    return singleflight.stream(key, deltas)
+
+
+async def embed(
+    texts: list[str],
+    *,
+    model: str,
+    user_id: Optional[int] = None,
+    priority: Priority = Priority.BATCH,
+) -> list[list[float]]:
+    """
+    Embedding vectors for `texts`, one per input, through the same scheduler
+    and single-flight path as completions.
+    """
+    provider = _require_provider()
+    scheduler.admit(user_id)
+
+    async def call() -> list[list[float]]:
+        async with scheduler.slot(priority):
+            return await provider.embed(texts, model=model)
+
+    key = request_key(model, [{"role": "embed", "content": text} for text in texts], kind="embed")
+    return await singleflight.do(key, call)
@@ -0,0 +1,246 @@
+# backend/app/llm/providers.py
+
+import asyncio
+import hashlib
+import logging
+import random
+import struct
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProviderError(RuntimeError):
+    """Raised by a provider when an upstream call fails."""
+
+
+class LLMProvider(ABC):
+    """
+    Interface the chat code talks to instead of a vendor SDK.
+    Implementations must be safe to share across concurrent requests.
+    """
+
+    name: str = "base"
+
+    @property
+    def is_configured(self) -> bool:
+        """False when the provider can't serve calls (e.g. missing API key)."""
+        return True
+
+    @abstractmethod
+    async def complete(
+        self,
+        messages: list[dict],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Chat completion returning the full text."""
+
+    @abstractmethod
+    def stream(
+        self,
+        messages: list[dict],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[str]:
+        """Streaming chat completion yielding text deltas."""
+
+    @abstractmethod
+    async def embed(self, texts: list[str], *, model: str) -> list[list[float]]:
+        """One embedding vector per input text."""
+
+
+# ============================================================
+# 🤖 OpenAI
+# ============================================================
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client: Optional[object] = None
+
+    @property
+    def is_configured(self) -> bool:
+        return self.client is not None
+
+    @property
+    def client(self):
+        """
+        Lazy initialization of the async OpenAI client.
+        Only creates the client when needed and if API key is available.
+        """
+        if self._client is not None:
+            return self._client
+
+        if not self.api_key or not self.api_key.strip():
+            logger.warning("⚠️ OPENAI_API_KEY not set. Chat functionality will be limited.")
+            return None
+
+        try:
+            from openai import AsyncOpenAI
+            # Initialize without passing proxies to avoid httpx compatibility issues
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=None  # Let OpenAI SDK create its own client
+            )
+            logger.info("✅ OpenAI client initialized successfully")
+            return self._client
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize OpenAI client: {str(e)}", exc_info=True)
+            return None
+
+    async def complete(self, messages, *, model, temperature, max_tokens) -> str:
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content or ""
+
+    async def stream(self, messages, *, model, temperature, max_tokens) -> AsyncIterator[str]:
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def embed(self, texts, *, model) -> list[list[float]]:
+        response = await self.client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in response.data]
+
+
+# ============================================================
+# 🧪 Local stub
+# ============================================================
+
+_STUB_WORDS = (
+    "market", "trend", "support", "resistance", "volume", "momentum", "risk",
+    "position", "price", "signal", "breakout", "average", "volatility", "entry",
+    "exit", "sector", "earnings", "range", "order", "liquidity", "hedge", "yield",
+)
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline provider for load and capacity tests: no network, no cost.
+
+    Answers are derived from a hash of the prompt, so the same prompt always
+    gets the same text. Timing mimics a real model: `latency_ms` before the
+    first token, then `tokens_per_second`. A seeded RNG makes `failure_rate`
+    fail the same sequence of calls on every run.
+    """
+
+    name = "stub"
+    EMBEDDING_DIMENSIONS = 64
+
+    def __init__(
+        self,
+        latency_ms: float,
+        tokens_per_second: float,
+        response_tokens: int,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency_ms / 1000.0
+        self.token_interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+        self.response_tokens = response_tokens
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+
+    def _tokens(self, messages: list[dict], max_tokens: int) -> list[str]:
+        digest = hashlib.sha256(repr(messages).encode()).digest()
+        count = max(1, min(self.response_tokens, max_tokens))
+        return [
+            ("" if i == 0 else " ") + _STUB_WORDS[(digest[i % len(digest)] ^ i) % len(_STUB_WORDS)]
+            for i in range(count)
+        ]
+
+    async def _start(self) -> None:
+        """Count the call, roll for an injected failure, then wait out the first-token latency."""
+        self.calls += 1
+        fail = self._rng.random() < self.failure_rate
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if fail:
+            self.failures += 1
+            raise LLMProviderError("Stub provider injected failure")
+
+    async def complete(self, messages, *, model, temperature, max_tokens) -> str:
+        await self._start()
+        tokens = self._tokens(messages, max_tokens)
+        if self.token_interval:
+            await asyncio.sleep(self.token_interval * (len(tokens) - 1))
+        return "".join(tokens)
+
+    async def stream(self, messages, *, model, temperature, max_tokens) -> AsyncIterator[str]:
+        await self._start()
+        for i, token in enumerate(self._tokens(messages, max_tokens)):
+            if i and self.token_interval:
+                await asyncio.sleep(self.token_interval)
+            yield token
+
+    async def embed(self, texts, *, model) -> list[list[float]]:
+        await self._start()
+        vectors = []
+        for text in texts:
+            digest = hashlib.shake_256(text.encode()).digest(self.EMBEDDING_DIMENSIONS * 2)
+            raw = struct.unpack(f">{self.EMBEDDING_DIMENSIONS}H", digest)
+            vector = [value / 32767.5 - 1.0 for value in raw]
+            norm = sum(v * v for v in vector) ** 0.5 or 1.0
+            vectors.append([v / norm for v in vector])
+        return vectors
+
+
+# ============================================================
+# 🔌 Provider selection
+# ============================================================
+
+_provider: Optional[LLMProvider] = None
+
+
+def build_provider(name: str) -> LLMProvider:
+    if name == "openai":
+        return OpenAIProvider(api_key=settings.OPENAI_API_KEY)
+    if name == "stub":
+        return StubProvider(
+            latency_ms=settings.LLM_STUB_LATENCY_MS,
+            tokens_per_second=settings.LLM_STUB_TOKENS_PER_SECOND,
+            response_tokens=settings.LLM_STUB_RESPONSE_TOKENS,
+            failure_rate=settings.LLM_STUB_FAILURE_RATE,
+            seed=settings.LLM_STUB_SEED,
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER: {name!r} (expected 'openai' or 'stub')")
+
+
+def get_provider() -> LLMProvider:
+    """The provider selected by LLM_PROVIDER, created on first use."""
+    global _provider
+    if _provider is None:
+        _provider = build_provider(settings.LLM_PROVIDER.strip().lower())
+        logger.info(f"✅ LLM provider: {_provider.name}")
+    return _provider
+
+
+def set_provider(provider: Optional[LLMProvider]) -> None:
+    """Swap the active provider (benchmarks, scripts); None re-reads LLM_PROVIDER."""
+    global _provider
+    _provider = provider
@@ -0,0 +1,224 @@
+# backend/app/llm/scheduler.py
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0  # A user is waiting on the answer (chat)
+    BATCH = 1  # Background work (summaries, analysis jobs)
+
+
+class LLMBusyError(Exception):
+    """Base error for requests the scheduler refuses; maps to HTTP 429."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class LLMRateLimitedError(LLMBusyError):
+    """The user has used up their request budget."""
+
+
+class LLMOverloadedError(LLMBusyError):
+    """The global queue is full or the wait for a slot timed out."""
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class LLMScheduler:
+    """
+    Admission control for every upstream LLM call.
+
+    - At most `max_concurrency` calls run at once; the rest wait in a priority
+      queue (interactive ahead of batch, FIFO within a priority).
+    - The queue holds at most `max_queue` waiters and each waits at most
+      `queue_timeout` seconds; beyond that callers get LLMOverloadedError.
+    - Each user has a token bucket (`user_rate_per_minute`, burst `user_burst`)
+      so one user can't crowd out everyone else; overdraw raises LLMRateLimitedError.
+    """
+
+    MAX_BUCKETS = 10000  # Idle full buckets are pruned past this many users
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        user_rate_per_minute: float,
+        user_burst: int,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.user_rate = user_rate_per_minute / 60.0
+        self.user_burst = user_burst
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._buckets: dict[int, _TokenBucket] = {}
+
+        # Metrics
+        self.granted = 0
+        self.rejected_rate_limited = 0
+        self.rejected_queue_full = 0
+        self.queue_timeouts = 0
+        self._waits: deque[float] = deque(maxlen=1000)
+        self._service_times: deque[float] = deque(maxlen=200)
+
+    # --- Per-user fairness ---
+
+    def admit(self, user_id: Optional[int]) -> None:
+        """
+        Cheap up-front check before any work starts: charges the user's bucket
+        and fails fast when the queue is already full.
+        """
+        if user_id is not None and self.user_rate > 0:
+            self._take_token(user_id)
+        if self.queue_depth >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise LLMOverloadedError("AI service is busy. Please retry shortly.", self._retry_after())
+
+    def _take_token(self, user_id: int) -> None:
+        now = time.monotonic()
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._prune_buckets(now)
+            bucket = self._buckets[user_id] = _TokenBucket(float(self.user_burst), now)
+        else:
+            bucket.tokens = min(self.user_burst, bucket.tokens + (now - bucket.updated) * self.user_rate)
+            bucket.updated = now
+
+        if bucket.tokens < 1:
+            self.rejected_rate_limited += 1
+            retry_after = math.ceil((1 - bucket.tokens) / self.user_rate)
+            raise LLMRateLimitedError("Too many AI requests. Please slow down.", max(1, retry_after))
+        bucket.tokens -= 1
+
+    def _prune_buckets(self, now: float) -> None:
+        refill = self.user_burst / self.user_rate
+        for user_id, bucket in list(self._buckets.items()):
+            if now - bucket.updated >= refill:
+                del self._buckets[user_id]
+
+    # --- Global concurrency ---
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE) -> AsyncIterator[None]:
+        """Hold one of the global concurrency slots for the duration of the block."""
+        start = time.monotonic()
+        await self._acquire(priority)
+        acquired = time.monotonic()
+        self.granted += 1
+        self._waits.append(acquired - start)
+        try:
+            yield
+        finally:
+            self._service_times.append(time.monotonic() - acquired)
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        # Drop waiters that timed out or were cancelled so they don't block the fast path
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if self._active < self.max_concurrency and self.queue_depth == 0:
+            self._active += 1
+            return
+
+        if self.queue_depth >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise LLMOverloadedError("AI service is busy. Please retry shortly.", self._retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            raise LLMOverloadedError("AI service is busy. Please retry shortly.", self._retry_after())
+        except asyncio.CancelledError:
+            # The slot may have been handed over just as the caller went away
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter, or free it
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _retry_after(self) -> int:
+        """Rough seconds until a queued request would get a slot."""
+        if self._service_times:
+            service = sum(self._service_times) / len(self._service_times)
+        else:
+            service = 1.0
+        backlog = (self.queue_depth + 1) / max(1, self.max_concurrency)
+        return max(1, math.ceil(backlog * service))
+
+    # --- Metrics ---
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2)
+
+        by_priority = {p.name.lower(): 0 for p in Priority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                by_priority[Priority(priority).name.lower()] += 1
+
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": sum(by_priority.values()),
+            "queue_depth_by_priority": by_priority,
+            "max_queue": self.max_queue,
+            "granted": self.granted,
+            "rejected_rate_limited": self.rejected_rate_limited,
+            "rejected_queue_full": self.rejected_queue_full,
+            "queue_timeouts": self.queue_timeouts,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+        }
+
+
+# Global scheduler shared by every LLM call in the backend
+scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_MAX_QUEUE,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+    user_rate_per_minute=settings.LLM_USER_RATE_PER_MINUTE,
+    user_burst=settings.LLM_USER_BURST,
+)
@@ -0,0 +1,115 @@
+# backend/app/llm/singleflight.py
+
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+
+def request_key(model: str, messages: list[dict], **params: Any) -> str:
+    """
+    Stable key for an LLM request: same model, prompt and parameters -> same key.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _Broadcast:
+    """
+    Fans one upstream stream out to any number of subscribers.
+    Chunks are buffered so a subscriber that joins late replays from the start.
+    """
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+
+    async def run(self, factory: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async for chunk in factory():
+                self.chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError as e:
+            self.error = e
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then arm a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical LLM requests into one upstream call.
+
+    The first caller for a key starts the upstream work as a detached task;
+    callers arriving while it is in flight await the same task (or subscribe
+    to the same stream) and all receive its result or its exception. The key
+    is released as soon as the call finishes, so later requests go upstream
+    again (repeat answers are the response cache's job, not this layer's).
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self._streams: dict[str, _Broadcast] = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _t, k=key: self._calls.pop(k, None))
+        else:
+            self.coalesced += 1
+        # Shield so one caller disconnecting doesn't cancel the call for the rest
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            self.upstream_calls += 1
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            task = asyncio.ensure_future(broadcast.run(factory))
+            task.add_done_callback(lambda _t, k=key: self._streams.pop(k, None))
+        else:
+            self.coalesced += 1
+        return broadcast.subscribe()
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls) + len(self._streams),
+        }
+
+
+# Global single-flight group shared by every LLM call in the backend
+singleflight = SingleFlight()
@@ -12,8 +12,13 @@ from app.api.watchlist_router import router as watchlist_router
 from app.api.chat_router import router as chat_router
 from app.api.pattern_trends_router import router as pattern_trends_router
 from app.api.risk_management_router import router as risk_management_router
+from app.api.market_router import router as market_router
+from app.api.symbols_router import router as symbols_router
+from app.api.bars_router import router as bars_router
 from app.api.oauth_debug import router as oauth_debug_router
-from app.db.database import Base, engine
+from app.db.database import engine
+from app.db.routing import read_your_writes
+from app.db.instrumentation import SQLInstrumentationMiddleware
 from app.core.config import settings
 
 print("🍪 COOKIE_DOMAIN loaded as:", settings.COOKIE_DOMAIN)
@@ -87,6 +92,13 @@ app.add_middleware(
 print("✅ CORS middleware configured with credentials support.")
 
 
+# ============================================================
+# 🔎 SQL Instrumentation (queries + DB time per request)
+# ============================================================
+
+app.add_middleware(SQLInstrumentationMiddleware)
+
+
 # ============================================================
 # 🔒 Enable Proxy Middleware (for Railway/Vercel)
 # ============================================================
@@ -104,47 +116,64 @@ else:
 
 @app.on_event("startup")
 def on_startup():
-    from sqlalchemy.exc import OperationalError
-    from sqlalchemy import text
-    import time
-
-    max_attempts = 10
-    for attempt in range(1, max_attempts + 1):
-        try:
-            print(f"🔧 Initializing database tables... (attempt {attempt}/{max_attempts})")
-            Base.metadata.create_all(bind=engine)
-            print("✅ Database tables are ready.")
-            
-            # Migrate: Make email column nullable if it's not already
-            try:
-                with engine.begin() as conn:
-                    # Check if email column is nullable
-                    result = conn.execute(text("""
-                        SELECT is_nullable 
-                        FROM information_schema.columns 
-                        WHERE table_name = 'users' AND column_name = 'email'
-                    """))
-                    row = result.fetchone()
-                    
-                    if row and row[0] == 'NO':
-                        print("🔧 Migrating: Making email column nullable...")
-                        conn.execute(text("ALTER TABLE users ALTER COLUMN email DROP NOT NULL"))
-                        print("✅ Migration complete: email column is now nullable")
-                    elif row and row[0] == 'YES':
-                        print("✅ Email column is already nullable")
-                    else:
-                        print("⚠️ Could not check email column status (table may not exist yet)")
-            except Exception as migration_error:
-                # Migration failed, but don't crash the app
-                print(f"⚠️ Migration check failed (non-critical): {migration_error}")
-            
-            break
-        except OperationalError as e:
-            print(f"⏳ Database not ready yet (attempt {attempt}): {e}")
-            time.sleep(2)
-        except Exception as e:
-            print(f"❌ Database init failed: {e}")
-            break
+    from app.core.security import password_hasher
+    from app.db.migrate import run_on_boot
+    from app.db.pool import check_connection_budget
+
+    # Spawn the bcrypt workers now so the first logins don't pay for it
+    password_hasher.start()
+
+    # Schema changes are versioned migrations (python -m app.db.migrate); by default
+    # boot applies pending ones behind a lock, "check" only verifies the version
+    run_on_boot(settings.DB_MIGRATIONS_ON_BOOT)
+
+    # Warn if every replica's pools at full overflow would exceed max_connections
+    try:
+        check_connection_budget(engine)
+    except Exception as budget_error:
+        print(f"⚠️ DB pool budget check failed (non-critical): {budget_error}")
+
+
+@app.on_event("startup")
+async def on_startup_oauth():
+    import asyncio
+    from app.core.oauth import register_oauth_clients, warm_oauth_clients
+
+    # Register providers once; prefetch discovery/JWKS in the background so boot isn't blocked
+    register_oauth_clients()
+    app.state.oauth_warmup = asyncio.create_task(warm_oauth_clients())
+
+
+@app.on_event("startup")
+async def on_startup_tokenizer():
+    import asyncio
+    from app.chat.context import warm_encoding
+
+    # The tokenizer vocabulary may need a download; load it in a thread, not on the event loop
+    app.state.tokenizer_warmup = asyncio.create_task(warm_encoding())
+
+
+@app.on_event("startup")
+async def on_startup_symbols():
+    from app.market.symbols import symbol_directory
+
+    # Build the search index from the on-disk snapshot, then keep it fresh in the background
+    await symbol_directory.load_async()
+    symbol_directory.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    from app.chat.persistence import chat_writer
+    from app.core.security import password_hasher
+    from app.core.http import http_client
+    from app.market.symbols import symbol_directory
+
+    await symbol_directory.close()
+    # Don't lose chat messages still waiting in the write-behind queue
+    await chat_writer.close()
+    password_hasher.shutdown()
+    await http_client.close()
 
 
 # ============================================================
@@ -157,6 +186,9 @@ app.include_router(watchlist_router, tags=["Watchlist"])
 app.include_router(chat_router, tags=["Chat"])
 app.include_router(pattern_trends_router, tags=["Pattern Trends"])
 app.include_router(risk_management_router, tags=["Risk Management"])
+app.include_router(market_router, tags=["Market"])
+app.include_router(symbols_router, tags=["Symbols"])
+app.include_router(bars_router, tags=["Market"])
 app.include_router(debug_router)
 app.include_router(oauth_debug_router, tags=["OAuth Debug"])
 
@@ -165,6 +197,10 @@ app.include_router(oauth_debug_router, tags=["OAuth Debug"])
 # 🪵 Log incoming requests (for debugging)
 # ============================================================
 
+# Read-your-writes: pin a client to the primary briefly after it writes
+app.middleware("http")(read_your_writes)
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     print(f"📥 {request.method} {request.url.path} from Origin: {request.headers.get('origin')}")
@@ -0,0 +1,390 @@
+# backend/app/market/bars.py
+"""
+Append-only, memory-mapped columnar store for OHLCV bars.
+
+Each symbol and timespan is a directory under BARS_DATA_DIR holding one file
+per column (t: int64 epoch ms, o/h/l/c/v: float64) plus a small meta.json.
+Reads bisect the timestamp column and slice every column as a memoryview over
+the mapping, so serving a chart is a page-cache read. Upstream is only asked
+for bars newer than the last stored one (at most every BARS_TAIL_TTL_SECONDS),
+and once for any older range that was never fetched.
+
+Bars still forming (closed less than BARS_SETTLE_SECONDS ago) are kept in
+memory and served on top of the stored ones, never written, so the files only
+ever grow. If the bar the store and upstream share no longer matches (a split
+or dividend re-adjusted history), the symbol is rebuilt from upstream.
+
+Writers hold an exclusive flock on the directory's .lock file and readers a
+shared one while mapping, so several workers can share BARS_DATA_DIR. Waiting
+for those locks and the file writes themselves run in a worker thread (under
+the symbol's asyncio lock), so they never stall the event loop.
+"""
+
+import asyncio
+import bisect
+import fcntl
+import json
+import logging
+import mmap
+import os
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+from app.core.config import settings
+from app.market.polygon import MarketDataError, PolygonClient
+
+logger = logging.getLogger(__name__)
+
+# Column -> array typecode; every column is 8 bytes per bar
+COLUMNS = {"t": "q", "o": "d", "h": "d", "l": "d", "c": "d", "v": "d"}
+ITEM_SIZE = 8
+
+# Timestamp last: a crash mid-append leaves extra values in the other columns,
+# which the bar count (shortest column) ignores and the next append truncates
+WRITE_ORDER = ("o", "h", "l", "c", "v", "t")
+
+TIMESPAN_MS = {"day": 86_400_000, "minute": 60_000}
+
+DAY_MS = 86_400_000
+
+
+def day_start_ms(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def ms_to_date(ms: int) -> date:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).date()
+
+
+@dataclass(frozen=True, slots=True)
+class Bars:
+    """One range of bars: zero-copy column slices of the store plus unsettled bars after them."""
+    stored: dict[str, memoryview]
+    live: tuple[dict, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.stored["t"]) + len(self.live)
+
+    def columns(self) -> dict[str, list]:
+        """Plain lists per column, for serialization (the only copy made)."""
+        out = {name: view.tolist() for name, view in self.stored.items()}
+        for row in self.live:
+            for name in COLUMNS:
+                out[name].append(_value(row, name))
+        return out
+
+
+def _value(row: dict, name: str):
+    return int(row["t"]) if name == "t" else float(row.get(name) or 0.0)
+
+
+def _empty_views() -> dict[str, memoryview]:
+    return {name: memoryview(array(code)) for name, code in COLUMNS.items()}
+
+
+class BarSeries:
+    """The column files of one symbol and timespan."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._views = _empty_views()
+        self._signature: Optional[tuple] = None
+        self.meta: dict = {}
+
+    def _column(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def __len__(self) -> int:
+        return len(self._views["t"])
+
+    @property
+    def first_ts(self) -> Optional[int]:
+        return self._views["t"][0] if len(self) else None
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return self._views["t"][-1] if len(self) else None
+
+    @property
+    def covered_from(self) -> Optional[date]:
+        """Earliest day ever fetched from upstream (bars may start later: listing date)."""
+        value = self.meta.get("covered_from")
+        return date.fromisoformat(value) if value else None
+
+    @contextmanager
+    def _flock(self, mode: int):
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / ".lock", "a+b") as lock:
+            fcntl.flock(lock, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _stat_signature(self) -> Optional[tuple]:
+        try:
+            st = self._column("t").stat()
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def refresh(self) -> None:
+        """Remap the columns if they changed on disk (cheap stat otherwise)."""
+        if self._stat_signature() == self._signature:
+            return
+        with self._flock(fcntl.LOCK_SH):
+            self._remap()
+
+    def _remap(self) -> None:
+        # Caller holds the flock
+        signature = self._stat_signature()
+        if signature is None:
+            self._views, self._signature, self.meta = _empty_views(), None, self._read_meta()
+            return
+        count = min(
+            (self._column(name).stat().st_size if self._column(name).exists() else 0) for name in COLUMNS
+        ) // ITEM_SIZE
+        views = {}
+        for name, code in COLUMNS.items():
+            if count == 0:
+                views[name] = memoryview(array(code))
+                continue
+            with open(self._column(name), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), count * ITEM_SIZE, access=mmap.ACCESS_READ)
+            # The view keeps the mapping alive for as long as any slice of it is in use
+            views[name] = memoryview(mapped).cast(code)
+        self._views, self._signature, self.meta = views, signature, self._read_meta()
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.path / "meta.json").read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp = self.path / f".meta.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / "meta.json")
+
+    def slice(self, from_ms: int, to_ms: int) -> dict[str, memoryview]:
+        """Bars with from_ms <= t <= to_ms, as views into the mapped files."""
+        t = self._views["t"]
+        i = bisect.bisect_left(t, from_ms)
+        j = bisect.bisect_right(t, to_ms)
+        return {name: view[i:j] for name, view in self._views.items()}
+
+    def append(self, rows: list[dict], covered_from: Optional[date] = None) -> int:
+        """Append bars newer than the last stored one; returns how many were written."""
+        with self._flock(fcntl.LOCK_EX):
+            self._remap()  # Another worker may have appended since we last looked
+            last = self.last_ts
+            rows = [row for row in rows if last is None or row["t"] > last]
+            if rows:
+                count = len(self)
+                for name in WRITE_ORDER:
+                    with open(self._column(name), "ab") as f:
+                        f.truncate(count * ITEM_SIZE)
+                        f.write(array(COLUMNS[name], (_value(row, name) for row in rows)).tobytes())
+            if covered_from is not None and covered_from != self.covered_from:
+                self._write_meta({**self.meta, "covered_from": covered_from.isoformat()})
+            self._remap()
+        return len(rows)
+
+    def rewrite(self, rows: list[dict], covered_from: date, keep_stored: bool = False) -> int:
+        """
+        Replace the columns with `rows` (followed by the stored bars after them
+        when `keep_stored`, to prepend an older range). Returns the bar count.
+        """
+        with self._flock(fcntl.LOCK_EX):
+            self._remap()
+            first = self.first_ts
+            if keep_stored and first is not None:
+                rows = [row for row in rows if row["t"] < first]
+            for name in WRITE_ORDER:
+                tmp = self.path / f".{name}.bin.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(array(COLUMNS[name], (_value(row, name) for row in rows)).tobytes())
+                    if keep_stored:
+                        f.write(self._views[name].tobytes())
+                os.replace(tmp, self._column(name))
+            self._write_meta({**self.meta, "covered_from": covered_from.isoformat()})
+            self._remap()
+        return len(self)
+
+
+@dataclass
+class _Entry:
+    series: BarSeries
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    tail_checked_at: float = float("-inf")
+    live: tuple[dict, ...] = ()
+
+
+class BarStore:
+    """
+    Serves bar ranges from BarSeries files, filling them from upstream as needed.
+    Concurrent requests for one symbol share its lock, so a cold symbol costs
+    one upstream call however many charts open it at once.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        source: PolygonClient,
+        tail_ttl_seconds: float,
+        settle_seconds: float,
+        max_open_series: int,
+    ):
+        self.root = Path(root)
+        self.source = source
+        self.tail_ttl_seconds = tail_ttl_seconds
+        self.settle_ms = int(settle_seconds * 1000)
+        self.max_open_series = max_open_series
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.requests = 0
+        self.upstream_calls = 0
+        self.upstream_bars = 0
+        self.bars_written = 0
+        self.rebuilds = 0
+        self.stale_served = 0
+        self.errors = 0
+
+    def _entry(self, symbol: str, timespan: str) -> _Entry:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Locks from another event loop (tests, benchmarks) can't be awaited here
+            self._loop = loop
+            self._entries.clear()
+
+        key = (symbol, timespan)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(BarSeries(self.root / timespan / symbol))
+        self._entries.move_to_end(key)
+
+        # Each mapped column holds a file descriptor; cap how many series stay open
+        for old_key in list(self._entries)[:max(0, len(self._entries) - self.max_open_series)]:
+            if not self._entries[old_key].lock.locked():
+                del self._entries[old_key]
+        return entry
+
+    async def get_bars(self, symbol: str, timespan: str, start: date, end: date) -> Bars:
+        """
+        Bars for [start, end] (UTC days). Raises MarketDataError only when
+        upstream fails and nothing for the symbol is stored yet.
+        """
+        self.requests += 1
+        entry = self._entry(symbol, timespan)
+        async with entry.lock:
+            # May wait on another worker's exclusive flock
+            await asyncio.to_thread(entry.series.refresh)
+            try:
+                await self._fill(entry, symbol, timespan, start, end)
+            except MarketDataError as e:
+                self.errors += 1
+                if not len(entry.series):
+                    raise
+                self.stale_served += 1
+                logger.warning(f"⚠️ Serving stored {timespan} bars for {symbol}, upstream failed: {e}")
+
+        from_ms, to_ms = day_start_ms(start), day_start_ms(end) + DAY_MS - 1
+        last = entry.series.last_ts
+        live = tuple(
+            row for row in entry.live
+            if from_ms <= row["t"] <= to_ms and (last is None or row["t"] > last)
+        )
+        return Bars(entry.series.slice(from_ms, to_ms), live)
+
+    async def _fill(self, entry: _Entry, symbol: str, timespan: str, start: date, end: date) -> None:
+        series = entry.series
+        today = datetime.now(timezone.utc).date()
+        covered_from = series.covered_from
+
+        if covered_from is None:
+            # First request for the symbol: everything from `start` up to now
+            settled, entry.live = self._split(await self._fetch(symbol, timespan, start, today), timespan)
+            self.bars_written += await asyncio.to_thread(series.append, settled, covered_from=start)
+            entry.tail_checked_at = time.monotonic()
+            return
+
+        if start < covered_from:
+            # Older range than ever fetched: fetch just that and prepend it (rare)
+            rows, _ = self._split(await self._fetch(symbol, timespan, start, covered_from), timespan)
+            before = len(series)
+            written = await asyncio.to_thread(series.rewrite, rows, covered_from=start, keep_stored=True)
+            self.bars_written += written - before
+
+        last = series.last_ts
+        needs_tail = last is None or end >= ms_to_date(last)
+        if not needs_tail or time.monotonic() - entry.tail_checked_at < self.tail_ttl_seconds:
+            return
+
+        # Only the tail: from the last stored bar (re-fetched as a consistency check) to now
+        tail_from = ms_to_date(last) if last is not None else covered_from
+        rows = await self._fetch(symbol, timespan, tail_from, today)
+        if last is not None and not self._matches_stored(series, rows):
+            logger.warning(f"🔁 {symbol} {timespan} history was re-adjusted upstream, rebuilding")
+            self.rebuilds += 1
+            rows = await self._fetch(symbol, timespan, series.covered_from or covered_from, today)
+            settled, entry.live = self._split(rows, timespan)
+            self.bars_written += await asyncio.to_thread(
+                series.rewrite, settled, covered_from=series.covered_from or covered_from
+            )
+        else:
+            settled, entry.live = self._split(rows, timespan)
+            self.bars_written += await asyncio.to_thread(series.append, settled)
+        entry.tail_checked_at = time.monotonic()
+
+    @staticmethod
+    def _matches_stored(series: BarSeries, rows: list[dict]) -> bool:
+        last = series.last_ts
+        stored_close = series.slice(last, last)["c"][0]
+        for row in rows:
+            if row["t"] == last:
+                close = float(row.get("c") or 0.0)
+                return abs(close - stored_close) <= 1e-9 * max(1.0, abs(stored_close))
+        return True  # Overlap bar missing upstream: nothing to compare
+
+    def _split(self, rows: list[dict], timespan: str) -> tuple[list[dict], tuple[dict, ...]]:
+        """(settled bars to persist, bars still forming to keep in memory)."""
+        cutoff = int(time.time() * 1000) - TIMESPAN_MS[timespan] - self.settle_ms
+        settled = [row for row in rows if row["t"] <= cutoff]
+        live = tuple(row for row in rows if row["t"] > cutoff)
+        return settled, live
+
+    async def _fetch(self, symbol: str, timespan: str, start: date, end: date) -> list[dict]:
+        self.upstream_calls += 1
+        rows = await self.source.aggregates(symbol, timespan, start, end)
+        self.upstream_bars += len(rows)
+        return rows
+
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "open_series": len(self._entries),
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "upstream_bars": self.upstream_bars,
+            "bars_written": self.bars_written,
+            "rebuilds": self.rebuilds,
+            "stale_served": self.stale_served,
+            "errors": self.errors,
+        }
+
+
+# Global bar store
+bar_store = BarStore(
+    root=settings.BARS_DATA_DIR,
+    source=PolygonClient(base_url=settings.POLYGON_BASE_URL, api_key=settings.POLYGON_API_KEY),
+    tail_ttl_seconds=settings.BARS_TAIL_TTL_SECONDS,
+    settle_seconds=settings.BARS_SETTLE_SECONDS,
+    max_open_series=settings.BARS_MAX_OPEN_SERIES,
+)
@@ -0,0 +1,152 @@
+# backend/app/market/polygon.py
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+import httpx  # type: ignore
+from app.core.http import http_client
+
+
+class MarketDataError(RuntimeError):
+    """Raised when the upstream market-data API fails or answers with an error."""
+
+
+class MarketDataNotConfiguredError(MarketDataError):
+    """Raised when market data is requested without a POLYGON_API_KEY."""
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    """Latest known price data for one symbol, as served from the quote cache."""
+    symbol: str
+    price: Optional[float]
+    open: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    volume: Optional[float]
+    prev_close: Optional[float]
+    change: Optional[float]
+    change_percent: Optional[float]
+    updated_at: Optional[datetime]
+
+
+def _nonzero(*values) -> Optional[float]:
+    """First value that is set; Polygon reports 0 for bars that haven't traded yet."""
+    for value in values:
+        if value:
+            return float(value)
+    return None
+
+
+def parse_snapshot(ticker: dict) -> Quote:
+    """Map one entry of Polygon's snapshot `tickers` array to a Quote."""
+    day = ticker.get("day") or {}
+    prev = ticker.get("prevDay") or {}
+    minute = ticker.get("min") or {}
+    last_trade = ticker.get("lastTrade") or {}
+    updated = ticker.get("updated")  # Nanoseconds since the epoch
+
+    return Quote(
+        symbol=ticker["ticker"],
+        price=_nonzero(last_trade.get("p"), minute.get("c"), day.get("c"), prev.get("c")),
+        open=_nonzero(day.get("o")),
+        high=_nonzero(day.get("h")),
+        low=_nonzero(day.get("l")),
+        volume=_nonzero(day.get("v")),
+        prev_close=_nonzero(prev.get("c")),
+        change=ticker.get("todaysChange"),
+        change_percent=ticker.get("todaysChangePerc"),
+        updated_at=datetime.fromtimestamp(updated / 1e9, tz=timezone.utc) if updated else None,
+    )
+
+
+class PolygonClient:
+    """
+    Minimal Polygon.io REST client over the shared connection pool.
+    `base_url` can point at a local stand-in that serves the same routes.
+    """
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def snapshot(self, symbols: list[str]) -> dict[str, Quote]:
+        """
+        Quotes for many symbols in one call (full-market snapshot filtered by
+        `tickers`). Symbols Polygon doesn't know are absent from the result.
+        """
+        if not self.is_configured():
+            raise MarketDataNotConfiguredError("Market data not configured. Please set POLYGON_API_KEY.")
+        try:
+            response = await http_client.client.get(
+                f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers",
+                params={"tickers": ",".join(symbols), "apiKey": self.api_key},
+            )
+        except httpx.HTTPError as e:
+            raise MarketDataError(f"Polygon request failed: {e}") from e
+
+        if response.status_code != 200:
+            raise MarketDataError(f"Polygon answered {response.status_code}: {response.text[:200]}")
+
+        quotes = {}
+        for ticker in response.json().get("tickers") or []:
+            if ticker.get("ticker"):
+                quote = parse_snapshot(ticker)
+                quotes[quote.symbol] = quote
+        return quotes
+
+    async def reference_tickers(self, market: str = "stocks", page_size: int = 1000) -> list[dict]:
+        """
+        Every active ticker in `market` from /v3/reference/tickers, following
+        `next_url` pagination. Only used to rebuild the local symbol snapshot.
+        """
+        if not self.is_configured():
+            raise MarketDataNotConfiguredError("Market data not configured. Please set POLYGON_API_KEY.")
+
+        url: Optional[str] = f"{self.base_url}/v3/reference/tickers"
+        params = {"market": market, "active": "true", "limit": str(page_size), "apiKey": self.api_key}
+        tickers: list[dict] = []
+        while url:
+            try:
+                response = await http_client.client.get(url, params=params)
+            except httpx.HTTPError as e:
+                raise MarketDataError(f"Polygon request failed: {e}") from e
+            if response.status_code != 200:
+                raise MarketDataError(f"Polygon answered {response.status_code}: {response.text[:200]}")
+
+            data = response.json()
+            tickers.extend(data.get("results") or [])
+            # next_url carries the cursor but not the key
+            url = data.get("next_url")
+            params = {"apiKey": self.api_key}
+        return tickers
+
+    async def aggregates(self, symbol: str, timespan: str, start: date, end: date) -> list[dict]:
+        """
+        Adjusted OHLCV bars (1 `timespan` each) for [start, end], oldest first,
+        following `next_url` pagination. Rows are Polygon's {t, o, h, l, c, v}.
+        """
+        if not self.is_configured():
+            raise MarketDataNotConfiguredError("Market data not configured. Please set POLYGON_API_KEY.")
+
+        url: Optional[str] = (
+            f"{self.base_url}/v2/aggs/ticker/{symbol}/range/1/{timespan}/{start.isoformat()}/{end.isoformat()}"
+        )
+        params = {"adjusted": "true", "sort": "asc", "limit": "50000", "apiKey": self.api_key}
+        rows: list[dict] = []
+        while url:
+            try:
+                response = await http_client.client.get(url, params=params)
+            except httpx.HTTPError as e:
+                raise MarketDataError(f"Polygon request failed: {e}") from e
+            if response.status_code != 200:
+                raise MarketDataError(f"Polygon answered {response.status_code}: {response.text[:200]}")
+
+            data = response.json()
+            rows.extend(data.get("results") or [])
+            url = data.get("next_url")
+            params = {"apiKey": self.api_key}
+        return rows
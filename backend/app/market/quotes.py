@@ -0,0 +1,190 @@
+# backend/app/market/quotes.py
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from app.core.config import settings
+from app.market.polygon import MarketDataError, PolygonClient, Quote
+
+logger = logging.getLogger(__name__)
+
+# Exchange tickers plus share-class suffixes (BRK.B, BF-B)
+SYMBOL_PATTERN = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
+
+
+def normalize_symbols(symbols: list[str]) -> tuple[list[str], list[str]]:
+    """Upper-case, strip and de-duplicate symbols (order kept); returns (valid, invalid)."""
+    valid: dict[str, None] = {}
+    invalid: list[str] = []
+    for raw in symbols:
+        symbol = raw.strip().upper()
+        if SYMBOL_PATTERN.match(symbol):
+            valid[symbol] = None
+        else:
+            invalid.append(raw)
+    return list(valid), invalid
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    quote: Optional[Quote]  # None: upstream doesn't know the symbol
+    fetched_at: float
+
+
+class QuoteService:
+    """
+    TTL cache in front of the bulk quote upstream.
+
+    A request for N symbols is answered from the cache where possible; every
+    miss that no other request is already fetching goes upstream together in
+    one snapshot call (chunked at `upstream_batch_size`), and symbols another
+    request is fetching are awaited instead of fetched again. If the upstream
+    fails, quotes up to `stale_seconds` old are served rather than an error.
+    """
+
+    def __init__(
+        self,
+        source: PolygonClient,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        upstream_batch_size: int,
+    ):
+        self.source = source
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.upstream_batch_size = upstream_batch_size
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_symbols = 0
+        self.stale_served = 0
+        self.errors = 0
+
+    def is_configured(self) -> bool:
+        return self.source.is_configured()
+
+    async def get_quotes(self, symbols: list[str]) -> dict[str, Optional[Quote]]:
+        """
+        Quotes for already-normalized symbols; None for symbols the upstream
+        doesn't know. Raises MarketDataError if a miss can't be fetched and
+        there is no stale copy to fall back on.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (tests, benchmarks): futures from the old one are unusable
+            self._loop = loop
+            self._inflight.clear()
+
+        now = time.monotonic()
+        result: dict[str, Optional[Quote]] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        to_fetch: list[str] = []
+
+        for symbol in dict.fromkeys(symbols):
+            entry = self._cache.get(symbol)
+            if entry is not None and now - entry.fetched_at < self.ttl_seconds:
+                self._cache.move_to_end(symbol)
+                self.hits += 1
+                result[symbol] = entry.quote
+            elif symbol in self._inflight:
+                self.coalesced += 1
+                waiting[symbol] = self._inflight[symbol]
+            else:
+                self.misses += 1
+                to_fetch.append(symbol)
+
+        if to_fetch:
+            futures = {symbol: loop.create_future() for symbol in to_fetch}
+            self._inflight.update(futures)
+            waiting.update(futures)
+            # A task of its own, so a caller disconnecting doesn't abandon the others
+            loop.create_task(self._fetch(to_fetch, futures))
+
+        for symbol, future in waiting.items():
+            result[symbol] = await asyncio.shield(future)
+        return result
+
+    async def _fetch(self, symbols: list[str], futures: dict[str, asyncio.Future]) -> None:
+        try:
+            for start in range(0, len(symbols), self.upstream_batch_size):
+                chunk = symbols[start:start + self.upstream_batch_size]
+                try:
+                    self.upstream_calls += 1
+                    self.upstream_symbols += len(chunk)
+                    quotes = await self.source.snapshot(chunk)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"⚠️ Quote fetch for {len(chunk)} symbols failed: {e}")
+                    for symbol in chunk:
+                        self._fail(symbol, futures[symbol], e)
+                    continue
+
+                fetched_at = time.monotonic()
+                for symbol in chunk:
+                    quote = quotes.get(symbol)
+                    self._store(symbol, _Entry(quote, fetched_at))
+                    if not futures[symbol].done():
+                        futures[symbol].set_result(quote)
+        finally:
+            for symbol, future in futures.items():
+                if self._inflight.get(symbol) is future:
+                    del self._inflight[symbol]
+                if not future.done():
+                    future.set_exception(MarketDataError("Quote fetch was interrupted"))
+
+    def _fail(self, symbol: str, future: asyncio.Future, error: Exception) -> None:
+        if future.done():
+            return
+        entry = self._cache.get(symbol)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.stale_seconds:
+            self.stale_served += 1
+            future.set_result(entry.quote)
+        else:
+            future.set_exception(error if isinstance(error, MarketDataError) else MarketDataError(str(error)))
+            future.exception()  # Mark retrieved: callers that went away shouldn't log it
+
+    def _store(self, symbol: str, entry: _Entry) -> None:
+        self._cache[symbol] = entry
+        self._cache.move_to_end(symbol)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._cache),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "upstream_calls": self.upstream_calls,
+            "upstream_symbols": self.upstream_symbols,
+            "stale_served": self.stale_served,
+            "errors": self.errors,
+        }
+
+
+# Global quote service
+quote_service = QuoteService(
+    source=PolygonClient(base_url=settings.POLYGON_BASE_URL, api_key=settings.POLYGON_API_KEY),
+    ttl_seconds=settings.MARKET_QUOTE_TTL_SECONDS,
+    stale_seconds=settings.MARKET_QUOTE_STALE_SECONDS,
+    max_entries=settings.MARKET_QUOTE_CACHE_MAX_ENTRIES,
+    upstream_batch_size=settings.MARKET_UPSTREAM_BATCH_SIZE,
+)
@@ -0,0 +1,399 @@
+# backend/app/market/symbols.py
+"""
+In-memory ticker reference index.
+
+Built from a snapshot of Polygon's /v3/reference/tickers kept on disk at
+SYMBOLS_SNAPSHOT_PATH, so autocomplete and name lookups never leave the
+process. A background task re-downloads the snapshot once it is older than
+SYMBOLS_REFRESH_SECONDS and swaps in a new index whenever the file changes
+(it can also be dropped in place by a release job).
+
+    python -m app.market.symbols refresh   # download the snapshot now
+    python -m app.market.symbols search "apple"
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.market.polygon import PolygonClient
+from app.market.quotes import normalize_symbols
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Prefix matches examined per search before ranking; keeps "A" from walking thousands
+_PREFIX_SCAN = 200
+_FUZZY_CANDIDATES = 40
+_FUZZY_MIN_RATIO = 0.6
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolInfo:
+    ticker: str
+    name: str
+    exchange: Optional[str] = None
+    type: Optional[str] = None
+    active: bool = True
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _grams(text: str, n: int) -> set[str]:
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class SymbolIndex:
+    """
+    Immutable search structures over one snapshot:
+
+    - ticker -> SymbolInfo dict for O(1) lookups;
+    - sorted tickers and sorted name phrases (the name from each word on, so
+      "inc" and "apple i" both reach "Apple Inc.") for bisect prefix search;
+    - n-gram postings (bigrams for tickers, trigrams for name words) that
+      shortlist candidates for the typo-tolerant fallback.
+    """
+
+    def __init__(self, symbols: Iterable[SymbolInfo]):
+        self._by_ticker: dict[str, SymbolInfo] = {s.ticker: s for s in symbols}
+        self._tickers: list[str] = sorted(self._by_ticker)
+
+        phrases = []
+        words: dict[str, set[str]] = {}
+        for info in self._by_ticker.values():
+            name_words = _words(info.name)
+            for position in range(len(name_words)):
+                phrases.append((" ".join(name_words[position:]), position, info.ticker))
+            for word in name_words:
+                if len(word) >= 3:
+                    words.setdefault(word, set()).add(info.ticker)
+        phrases.sort()
+        self._phrases = phrases
+        self._phrase_keys = [p[0] for p in phrases]
+
+        self._ticker_grams: dict[str, list[str]] = {}
+        for ticker in self._tickers:
+            for gram in _grams(ticker.lower(), 2):
+                self._ticker_grams.setdefault(gram, []).append(ticker)
+
+        self._words = words
+        self._word_grams: dict[str, list[str]] = {}
+        for word in words:
+            for gram in _grams(word, 3):
+                self._word_grams.setdefault(gram, []).append(word)
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._by_ticker
+
+    def get(self, ticker: str) -> Optional[SymbolInfo]:
+        return self._by_ticker.get(ticker)
+
+    def name(self, ticker: str) -> Optional[str]:
+        info = self._by_ticker.get(ticker)
+        return info.name if info else None
+
+    def search(self, query: str, limit: int = 10) -> list[SymbolInfo]:
+        """
+        Exact ticker first, then ticker prefixes (shortest first), then names
+        containing a word-aligned prefix (names starting with it first). Only
+        when nothing matches does it fall back to typo-tolerant matching.
+        """
+        ticker_query = query.strip().upper()
+        name_query = " ".join(_words(query))
+        if not ticker_query or limit <= 0:
+            return []
+
+        found: dict[str, SymbolInfo] = {}
+
+        def add(tickers: Iterable[str]) -> bool:
+            for ticker in tickers:
+                if ticker not in found:
+                    found[ticker] = self._by_ticker[ticker]
+                    if len(found) >= limit:
+                        return True
+            return False
+
+        if ticker_query in self._by_ticker and add([ticker_query]):
+            return list(found.values())
+
+        start = bisect.bisect_left(self._tickers, ticker_query)
+        prefixed = []
+        for ticker in self._tickers[start:start + _PREFIX_SCAN]:
+            if not ticker.startswith(ticker_query):
+                break
+            prefixed.append(ticker)
+        if add(sorted(prefixed, key=lambda t: (len(t), t))):
+            return list(found.values())
+
+        if name_query:
+            start = bisect.bisect_left(self._phrase_keys, name_query)
+            matches = []
+            for phrase, position, ticker in self._phrases[start:start + _PREFIX_SCAN]:
+                if not phrase.startswith(name_query):
+                    break
+                matches.append((position, len(self._by_ticker[ticker].name), ticker))
+            if add(ticker for _, _, ticker in sorted(matches)):
+                return list(found.values())
+
+        if not found:
+            add(self._fuzzy(ticker_query, name_query))
+        return list(found.values())
+
+    def _fuzzy(self, ticker_query: str, name_query: str) -> list[str]:
+        """Tickers whose symbol or a name word is close to the query (e.g. APPL, microsft)."""
+        scored: dict[str, float] = {}
+
+        if len(ticker_query) <= 6:
+            query = ticker_query.lower()
+            overlap = Counter(
+                ticker for gram in _grams(query, 2) for ticker in self._ticker_grams.get(gram, ())
+            )
+            for ticker, _ in overlap.most_common(_FUZZY_CANDIDATES):
+                if abs(len(ticker) - len(query)) <= 1:
+                    ratio = SequenceMatcher(None, query, ticker.lower()).ratio()
+                    if ratio >= _FUZZY_MIN_RATIO:
+                        scored[ticker] = max(scored.get(ticker, 0.0), ratio)
+
+        # Score against the longest word typed; the rest are usually right
+        query = max(name_query.split(), key=len, default="")
+        if len(query) >= 3:
+            overlap = Counter(
+                word for gram in _grams(query, 3) for word in self._word_grams.get(gram, ())
+            )
+            for word, _ in overlap.most_common(_FUZZY_CANDIDATES):
+                ratio = SequenceMatcher(None, query, word).ratio()
+                if ratio >= _FUZZY_MIN_RATIO:
+                    for ticker in self._words[word]:
+                        scored[ticker] = max(scored.get(ticker, 0.0), ratio)
+
+        return sorted(scored, key=lambda t: (-scored[t], len(self._by_ticker[t].name), t))
+
+
+def parse_snapshot(data: dict) -> list[SymbolInfo]:
+    """Snapshot file contents -> active symbols (records without a ticker or name are dropped)."""
+    symbols = []
+    for record in data.get("tickers") or []:
+        ticker = (record.get("ticker") or "").strip().upper()
+        name = (record.get("name") or "").strip()
+        if ticker and name and record.get("active", True):
+            symbols.append(SymbolInfo(
+                ticker=ticker,
+                name=name,
+                exchange=record.get("primary_exchange"),
+                type=record.get("type"),
+            ))
+    return symbols
+
+
+class SymbolDirectory:
+    """Owns the current SymbolIndex and keeps it in step with the snapshot file."""
+
+    def __init__(self, path: str, source: PolygonClient, refresh_seconds: float, reload_check_seconds: float):
+        self.path = Path(path)
+        self.source = source
+        self.refresh_seconds = refresh_seconds
+        self.reload_check_seconds = reload_check_seconds
+        self.index = SymbolIndex([])
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.loaded_at: Optional[float] = None
+        self.load_ms = 0.0
+        self.reloads = 0
+        self.refreshes = 0
+        self.last_error: Optional[str] = None
+
+    def validate(self, symbols: Iterable[str]) -> tuple[list[str], list[str]]:
+        """
+        Normalize symbols and check each against the active-ticker set in O(1):
+        returns (valid, invalid), valid de-duplicated in order. Until a snapshot
+        has loaded (or with SYMBOLS_VALIDATE_WRITES off) only the ticker format
+        is checked, so a cold start doesn't block writes.
+        """
+        valid, invalid = normalize_symbols(list(symbols))
+        index = self.index
+        if settings.SYMBOLS_VALIDATE_WRITES and len(index):
+            invalid += [symbol for symbol in valid if symbol not in index]
+            valid = [symbol for symbol in valid if symbol in index]
+        return valid, invalid
+
+    def snapshot_age(self) -> Optional[float]:
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _read(self) -> Optional[tuple[float, SymbolIndex]]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if mtime == self._mtime:
+            return None
+        with self.path.open() as f:
+            return mtime, SymbolIndex(parse_snapshot(json.load(f)))
+
+    def _swap(self, loaded: Optional[tuple[float, SymbolIndex]], start: float) -> bool:
+        if loaded is None:
+            return False
+        self._mtime, self.index = loaded
+        self.loaded_at = time.time()
+        self.load_ms = (time.perf_counter() - start) * 1000
+        self.reloads += 1
+        print(f"✅ Symbol index loaded: {len(self.index)} tickers from {self.path} in {self.load_ms:.0f} ms")
+        return True
+
+    def load(self) -> bool:
+        """(Re)build the index if the snapshot file changed; True if it did."""
+        start = time.perf_counter()
+        try:
+            return self._swap(self._read(), start)
+        except (OSError, ValueError) as e:
+            self.last_error = f"load: {e}"
+            logger.warning(f"⚠️ Symbol snapshot {self.path} unreadable, keeping the current index: {e}")
+            return False
+
+    async def load_async(self) -> bool:
+        """load() with parsing and index building off the event loop."""
+        start = time.perf_counter()
+        try:
+            return self._swap(await asyncio.to_thread(self._read), start)
+        except (OSError, ValueError) as e:
+            self.last_error = f"load: {e}"
+            logger.warning(f"⚠️ Symbol snapshot {self.path} unreadable, keeping the current index: {e}")
+            return False
+
+    async def refresh(self) -> int:
+        """Download a fresh snapshot from Polygon, write it atomically and load it."""
+        tickers = await self.source.reference_tickers()
+        data = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "tickers": [
+                {key: t.get(key) for key in ("ticker", "name", "primary_exchange", "type", "active")}
+                for t in tickers
+            ],
+        }
+        await asyncio.to_thread(self._write, data)
+        self.refreshes += 1
+        await self.load_async()
+        return len(tickers)
+
+    def _write(self, data: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.path)  # Readers see the old or the new file, never half of one
+
+    def _is_stale(self) -> bool:
+        age = self.snapshot_age()
+        return age is None or age >= self.refresh_seconds
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._is_stale() and self.source.is_configured():
+                    count = await self.refresh()
+                    print(f"✅ Symbol snapshot refreshed from Polygon ({count} tickers)")
+                else:
+                    await self.load_async()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"refresh: {e}"
+                logger.warning(f"⚠️ Symbol snapshot refresh failed, keeping the current index: {e}")
+            await asyncio.sleep(self.reload_check_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        age = self.snapshot_age()
+        return {
+            "path": str(self.path),
+            "tickers": len(self.index),
+            "snapshot_age_seconds": round(age, 1) if age is not None else None,
+            "refresh_seconds": self.refresh_seconds,
+            "loaded_at": datetime.fromtimestamp(self.loaded_at, tz=timezone.utc).isoformat() if self.loaded_at else None,
+            "load_ms": round(self.load_ms, 1),
+            "reloads": self.reloads,
+            "refreshes": self.refreshes,
+            "last_error": self.last_error,
+        }
+
+
+# Global symbol directory
+symbol_directory = SymbolDirectory(
+    path=settings.SYMBOLS_SNAPSHOT_PATH,
+    source=PolygonClient(base_url=settings.POLYGON_BASE_URL, api_key=settings.POLYGON_API_KEY),
+    refresh_seconds=settings.SYMBOLS_REFRESH_SECONDS,
+    reload_check_seconds=settings.SYMBOLS_RELOAD_CHECK_SECONDS,
+)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.market.symbols", description="Ticker reference snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Download the snapshot from Polygon")
+    search = sub.add_parser("search", help="Query the local index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        async def refresh() -> int:
+            from app.core.http import http_client
+            try:
+                return await symbol_directory.refresh()
+            finally:
+                await http_client.close()
+
+        count = asyncio.run(refresh())
+        print(f"✅ Wrote {count} tickers to {symbol_directory.path}")
+        return 0
+
+    if not symbol_directory.load():
+        print(f"❌ No snapshot at {symbol_directory.path}; run `python -m app.market.symbols refresh`")
+        return 1
+    start = time.perf_counter()
+    results = symbol_directory.index.search(args.query, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for info in results:
+        print(f"{info.ticker:<8} {info.name}")
+    print(f"({len(results)} results in {elapsed:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
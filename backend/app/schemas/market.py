@@ -0,0 +1,61 @@
+# backend/app/schemas/market.py
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class QuotesRequest(BaseModel):
+    symbols: list[str]
+
+
+class QuoteResponse(BaseModel):
+    symbol: str
+    price: Optional[float] = None
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    volume: Optional[float] = None
+    prev_close: Optional[float] = None
+    change: Optional[float] = None
+    change_percent: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class QuotesResponse(BaseModel):
+    quotes: dict[str, QuoteResponse]
+    missing: list[str]  # Symbols the market-data provider doesn't know
+
+
+class SymbolResponse(BaseModel):
+    ticker: str
+    name: str
+    exchange: Optional[str] = None
+    type: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SymbolSearchResponse(BaseModel):
+    results: list[SymbolResponse]
+
+
+class SymbolNamesResponse(BaseModel):
+    names: dict[str, str]  # Only symbols found in the reference index
+
+
+class BarsResponse(BaseModel):
+    """Columnar OHLCV bars, oldest first; t is the bar start in epoch milliseconds."""
+    symbol: str
+    timespan: str
+    count: int
+    t: list[int]
+    o: list[float]
+    h: list[float]
+    l: list[float]
+    c: list[float]
+    v: list[float]
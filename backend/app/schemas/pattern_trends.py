@@ -20,3 +20,13 @@ class PatternTrendsItemResponse(BaseModel):
 class PatternTrendsResponse(BaseModel):
     items: list[PatternTrendsItemResponse]
 
+
+class PatternTrendsItemBatchCreate(BaseModel):
+    symbols: list[str]
+
+
+class PatternTrendsItemBatchResponse(BaseModel):
+    added: list[PatternTrendsItemResponse]
+    duplicates: list[str]  # Already in the list
+    invalid: list[str]  # Not a known, active ticker
+
@@ -2,6 +2,7 @@
 
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 
 class WatchlistItemCreate(BaseModel):
@@ -20,3 +21,24 @@ class WatchlistItemResponse(BaseModel):
 class WatchlistResponse(BaseModel):
     items: list[WatchlistItemResponse]
 
+
+class WatchlistItemBatchCreate(BaseModel):
+    symbols: list[str]
+
+
+class WatchlistItemBatchResponse(BaseModel):
+    added: list[WatchlistItemResponse]
+    duplicates: list[str]  # Already in the list
+    invalid: list[str]  # Not a known, active ticker
+
+
+class WatchlistItemQuoteResponse(WatchlistItemResponse):
+    name: Optional[str] = None  # From the local symbol index
+    price: Optional[float] = None  # None when the symbol has no quote
+    change_percent: Optional[float] = None
+    volume: Optional[float] = None
+
+
+class EnrichedWatchlistResponse(BaseModel):
+    items: list[WatchlistItemQuoteResponse]
+    quotes_error: Optional[str] = None  # Set when prices couldn't be loaded; items are still listed
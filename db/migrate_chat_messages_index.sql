@@ -0,0 +1,11 @@
+-- Migration script to add the composite chat history index
+-- Backs keyset pagination on GET /chat/messages (newest page first)
+
+-- For PostgreSQL (CONCURRENTLY avoids locking writes on large tables):
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_messages_user_id_created_at
+    ON chat_messages (user_id, created_at);
+
+-- Verify the change:
+-- SELECT indexname, indexdef
+-- FROM pg_indexes
+-- WHERE tablename = 'chat_messages';
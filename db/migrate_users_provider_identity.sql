@@ -0,0 +1,18 @@
+-- Migration script to add the unique OAuth identity index
+-- Backs the single-statement OAuth sign-in upsert: one account per (provider, provider_id)
+
+-- Check for duplicates first (must return no rows):
+-- SELECT provider, provider_id, COUNT(*)
+-- FROM users
+-- WHERE provider_id IS NOT NULL
+-- GROUP BY provider, provider_id
+-- HAVING COUNT(*) > 1;
+
+-- For PostgreSQL (CONCURRENTLY avoids locking writes on large tables):
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_users_provider_identity
+    ON users (provider, provider_id);
+
+-- Verify the change:
+-- SELECT indexname, indexdef
+-- FROM pg_indexes
+-- WHERE tablename = 'users';
@@ -3,20 +3,59 @@
 import React, { useState, useEffect, useRef } from "react";
 import { useTheme } from "@/context/ThemeContext";
 
+// Parse one Server-Sent Events frame ("event: ...\ndata: {...}")
+function parseSseFrame(frame: string): { event: string; data: any } | null {
+  let event = "message";
+  const dataLines: string[] = [];
+  for (const line of frame.split("\n")) {
+    if (line.startsWith("event:")) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith("data:")) {
+      dataLines.push(line.slice(5).trimStart());
+    }
+  }
+  if (dataLines.length === 0) return null;
+  try {
+    return { event, data: JSON.parse(dataLines.join("\n")) };
+  } catch {
+    return null;
+  }
+}
+
+type ChatMessage = { id?: number; role: string; content: string; timestamp: Date };
+
+const PAGE_SIZE = 50;
+
+// Convert backend messages to frontend format
+function formatMessages(messages: any[]): ChatMessage[] {
+  return messages.map((m: any) => ({
+    id: m.id,
+    role: m.role,
+    content: m.content,
+    timestamp: new Date(m.timestamp),
+  }));
+}
+
 export default function MarketChatPage() {
   const { theme } = useTheme();
   
-  const [messages, setMessages] = useState<Array<{ id?: number; role: string; content: string; timestamp: Date }>>([]);
+  const [messages, setMessages] = useState<ChatMessage[]>([]);
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
   const [loadingMessages, setLoadingMessages] = useState(true);
+  // History is paged newest first; nextBefore is the cursor for the previous page
+  const [hasMore, setHasMore] = useState(false);
+  const [nextBefore, setNextBefore] = useState<number | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const skipScrollRef = useRef(false);
+  const olderLoadedRef = useRef(false);
 
   // Load messages from backend on mount
   useEffect(() => {
     const fetchMessages = async () => {
       try {
-        const res = await fetch("/api/market-chat", {
+        const res = await fetch(`/api/market-chat?limit=${PAGE_SIZE}`, {
           method: "GET",
           credentials: "include",
         });
@@ -24,14 +63,9 @@ export default function MarketChatPage() {
         if (res.ok) {
           const data = await res.json();
           if (data.messages && data.messages.length > 0) {
-            // Convert backend messages to frontend format
-            const formattedMessages = data.messages.map((m: any) => ({
-              id: m.id,
-              role: m.role,
-              content: m.content,
-              timestamp: new Date(m.timestamp),
-            }));
-            setMessages(formattedMessages);
+            setMessages(formatMessages(data.messages));
+            setHasMore(Boolean(data.has_more));
+            setNextBefore(data.next_before ?? null);
           } else {
             // No messages - show welcome message
             setMessages([{
@@ -69,9 +103,38 @@ export default function MarketChatPage() {
   };
 
   useEffect(() => {
+    // Prepending older history shouldn't jump to the newest message
+    if (skipScrollRef.current) {
+      skipScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages]);
 
+  const loadOlder = async () => {
+    if (!hasMore || nextBefore === null || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const res = await fetch(`/api/market-chat?before=${nextBefore}&limit=${PAGE_SIZE}`, {
+        method: "GET",
+        credentials: "include",
+      });
+      if (res.ok) {
+        const data = await res.json();
+        const older = formatMessages(data.messages || []);
+        skipScrollRef.current = true;
+        olderLoadedRef.current = true;
+        setMessages((prev) => [...older, ...prev]);
+        setHasMore(Boolean(data.has_more));
+        setNextBefore(data.next_before ?? null);
+      }
+    } catch (err) {
+      console.error("❌ Error loading older messages:", err);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const handleSend = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!input.trim() || loading) return;
@@ -87,9 +150,20 @@ export default function MarketChatPage() {
     setInput("");
     setLoading(true);
 
+    // Streamed tokens go into the reply bubble, which is the last message
+    const appendToReply = (text: string, replace = false) => {
+      setMessages((prev) => {
+        const last = prev[prev.length - 1];
+        if (!last || last.role !== "assistant") {
+          return [...prev, { role: "assistant", content: text, timestamp: new Date() }];
+        }
+        return [...prev.slice(0, -1), { ...last, content: replace ? text : last.content + text }];
+      });
+    };
+
     try {
-      // ✅ Use API proxy route for chat
-      const res = await fetch("/api/market-chat", {
+      // ✅ Use the streaming API proxy route so tokens show up as they are generated
+      const res = await fetch("/api/market-chat/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -98,40 +172,68 @@ export default function MarketChatPage() {
         credentials: "include",
       });
 
-      const data = await res.json();
-      
-      if (!res.ok) {
+      if (!res.ok || !res.body) {
         // Use error message from API if available
+        const data = await res.json().catch(() => ({}));
         const errorContent = data.response || data.error || "Failed to get response";
         throw new Error(errorContent);
       }
 
-      const assistantMessage = {
-        role: "assistant",
-        content: data.response || "I'm sorry, I couldn't process that request.",
-        timestamp: new Date(),
-      };
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE frames are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const frame = parseSseFrame(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          if (!frame) continue;
+
+          if (frame.event === "token" && frame.data.token) {
+            appendToReply(frame.data.token);
+          } else if (frame.event === "error") {
+            console.error("❌ Chat stream error:", frame.data.detail);
+          } else if (frame.event === "done") {
+            // The final event carries the complete reply (or the error text)
+            appendToReply(frame.data.response || "I'm sorry, I couldn't process that request.", true);
+            finished = true;
+          }
+        }
+      }
+
+      if (!finished) {
+        throw new Error("The response was interrupted. Please try again.");
+      }
 
-      setMessages((prev) => [...prev, assistantMessage]);
-      
       // Reload messages from backend to get the stored versions with IDs
       // This ensures we have the latest state from the database
       setTimeout(async () => {
         try {
-          const refreshRes = await fetch("/api/market-chat", {
+          const refreshRes = await fetch(`/api/market-chat?limit=${PAGE_SIZE}`, {
             method: "GET",
             credentials: "include",
           });
           if (refreshRes.ok) {
             const refreshData = await refreshRes.json();
             if (refreshData.messages && refreshData.messages.length > 0) {
-              const formattedMessages = refreshData.messages.map((m: any) => ({
-                id: m.id,
-                role: m.role,
-                content: m.content,
-                timestamp: new Date(m.timestamp),
-              }));
-              setMessages(formattedMessages);
+              const newest = formatMessages(refreshData.messages);
+              const oldestId = newest[0].id ?? 0;
+              // Keep the older pages already loaded; the newest page replaces the rest
+              setMessages((prev) => [
+                ...prev.filter((m) => m.id !== undefined && m.id < oldestId),
+                ...newest,
+              ]);
+              if (!olderLoadedRef.current) {
+                setHasMore(Boolean(refreshData.has_more));
+                setNextBefore(refreshData.next_before ?? null);
+              }
             }
           }
         } catch (err) {
@@ -188,6 +290,22 @@ export default function MarketChatPage() {
           }`}
         >
           <div className="space-y-4">
+            {!loadingMessages && hasMore && (
+              <div className="flex justify-center">
+                <button
+                  type="button"
+                  onClick={loadOlder}
+                  disabled={loadingOlder}
+                  className={`text-sm px-4 py-1 rounded-lg border transition disabled:opacity-50 ${
+                    theme === 'dark'
+                      ? 'border-gray-700 text-gray-300 hover:bg-gray-800'
+                      : 'border-gray-200 text-gray-600 hover:bg-gray-100'
+                  }`}
+                >
+                  {loadingOlder ? "Loading..." : "Load older messages"}
+                </button>
+              </div>
+            )}
             {loadingMessages ? (
               <div className="flex justify-center items-center py-8">
                 <div className="text-gray-500">Loading chat history...</div>
@@ -227,7 +345,7 @@ export default function MarketChatPage() {
               </div>
               ))
             )}
-            {loading && (
+            {loading && messages[messages.length - 1]?.role === "user" && (
               <div className="flex justify-start">
                 <div
                   className={`rounded-lg p-3 ${
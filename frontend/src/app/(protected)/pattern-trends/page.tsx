@@ -6,6 +6,7 @@ import { useSearchParams } from 'next/navigation'
 import CandlestickChart from '@/components/CandlestickChart'
 import { X, Plus, TrendingUp, TrendingDown, AlertCircle } from 'lucide-react'
 import StockSearchAutocomplete from '@/components/StockSearchAutocomplete'
+import { fetchBars } from '@/lib/fetchBars'
 
 interface PatternTrendsItem {
   id: number
@@ -403,22 +404,8 @@ export default function PatternTrendsPage() {
         const toStr = toDate.toISOString().split('T')[0]
         
         // Use custom range
-        const res = await fetch(
-          `https://api.polygon.io/v2/aggs/ticker/${symbol}/range/1/day/${fromStr}/${toStr}?adjusted=true&sort=asc&apiKey=${polygonKey}`
-        )
-        
-        if (!res.ok) {
-          throw new Error(`HTTP ${res.status}: Failed to fetch candlestick data`)
-        }
-
-        const data = await res.json()
-        
-        // Check for Polygon API errors in response body
-        if (data.status === 'ERROR' || data.error) {
-          throw new Error(data.error || 'Failed to fetch candlestick data')
-        }
-        
-        const ohlc = data.results || []
+        // Local bar store: repeated views don't re-download the range
+        const ohlc = await fetchBars(symbol, fromStr, toStr)
 
         if (ohlc.length === 0) {
           throw new Error('No data available for this date range')
@@ -465,22 +452,8 @@ export default function PatternTrendsPage() {
       const fromStr = from.toISOString().split('T')[0]
       const toStr = now.toISOString().split('T')[0]
 
-      const res = await fetch(
-        `https://api.polygon.io/v2/aggs/ticker/${symbol}/range/1/day/${fromStr}/${toStr}?adjusted=true&sort=asc&apiKey=${polygonKey}`
-      )
-
-      if (!res.ok) {
-        throw new Error(`HTTP ${res.status}: Failed to fetch candlestick data`)
-      }
-
-      const data = await res.json()
-      
-      // Check for Polygon API errors in response body
-      if (data.status === 'ERROR' || data.error) {
-        throw new Error(data.error || 'Failed to fetch candlestick data')
-      }
-      
-      const ohlc = data.results || []
+      // Local bar store: repeated views don't re-download the range
+      const ohlc = await fetchBars(symbol, fromStr, toStr)
 
       if (ohlc.length === 0) {
         throw new Error('No data available for this date range')
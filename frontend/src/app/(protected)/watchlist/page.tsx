@@ -2,13 +2,17 @@
 
 import { useState, useEffect } from "react";
 import { useTheme } from "@/context/ThemeContext";
-import { fetchStockSummary, StockSummary } from "@/lib/fetchStockSummary";
+import { StockSummary } from "@/lib/fetchStockSummary";
 import StockSearchAutocomplete from "@/components/StockSearchAutocomplete";
 
 interface WatchlistItem {
   id: number;
   symbol: string;
   created_at: string;
+  name: string | null;
+  price: number | null;
+  change_percent: number | null;
+  volume: number | null;
 }
 
 export default function WatchlistPage() {
@@ -24,13 +28,14 @@ export default function WatchlistPage() {
   // ✅ Use your Polygon key from .env
   const polygonKey = process.env.NEXT_PUBLIC_POLYGON_API_KEY || "";
 
-  /* ─────────────── Load Watchlist from API ─────────────── */
-  const loadWatchlist = async () => {
-    setLoadingWatchlist(true);
+  /* ─────────────── Load Watchlist (with prices) from API ─────────────── */
+  const loadWatchlist = async (showLoading = true) => {
+    if (showLoading) setLoadingWatchlist(true);
     setError("");
     
     try {
-      const res = await fetch("/api/watchlist", {
+      // One request: the backend joins each item with its cached quote
+      const res = await fetch("/api/watchlist?enrich=true", {
         credentials: "include",
         cache: "no-store",
       });
@@ -45,12 +50,26 @@ export default function WatchlistPage() {
       }
 
       const data = await res.json();
-      const symbols = data.items?.map((item: WatchlistItem) => item.symbol) || [];
-      setTickers(symbols);
+      const items: WatchlistItem[] = data.items || [];
+      setTickers(items.map((item) => item.symbol));
+      setStockData(
+        items
+          .filter((item) => item.price !== null)
+          .map((item) => ({
+            symbol: item.symbol,
+            name: item.name ?? item.symbol,
+            price: item.price as number,
+            changePercent: item.change_percent ?? 0,
+          }))
+      );
+      if (data.quotes_error) {
+        setError("Failed to fetch stock data.");
+      }
     } catch (e) {
       console.error("Error loading watchlist:", e);
       setError("Failed to load watchlist. Please try again.");
       setTickers([]);
+      setStockData([]);
     } finally {
       setLoadingWatchlist(false);
     }
@@ -71,40 +90,16 @@ export default function WatchlistPage() {
     };
   }, []);
 
-  /* ─────────────── Fetch Stock Data ─────────────── */
-  const loadStockData = async () => {
-    if (!tickers.length) {
-      setStockData([]);
-      return;
-    }
-    
-    if (!polygonKey) {
-      setError("Polygon API key not configured.");
-      return;
-    }
-    
+  /* ─────────────── Refresh Prices ─────────────── */
+  const refreshPrices = async () => {
     setRefreshing(true);
     try {
-      const data = await fetchStockSummary(tickers, polygonKey);
-      setStockData(data);
-      setError("");
-    } catch (err) {
-      console.error(err);
-      setError("Failed to fetch stock data.");
+      await loadWatchlist(false);
     } finally {
       setRefreshing(false);
     }
   };
 
-  useEffect(() => {
-    if (!loadingWatchlist && tickers.length > 0) {
-      loadStockData();
-    } else if (!loadingWatchlist) {
-      setStockData([]);
-    }
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [tickers, loadingWatchlist]);
-
   /* ─────────────── Add / Remove ─────────────── */
   const handleStockSelect = async (ticker: string, name: string) => {
     if (!ticker) {
@@ -112,11 +107,6 @@ export default function WatchlistPage() {
       return;
     }
     
-    if (!polygonKey) {
-      setError("Polygon API key not configured.");
-      return;
-    }
-    
     setError("");
     setLoading(true);
     try {
@@ -127,13 +117,7 @@ export default function WatchlistPage() {
         return;
       }
       
-      // ✅ Quick validation via Polygon API
-      const check = await fetchStockSummary([ticker], polygonKey);
-      if (check.length === 0) {
-        throw new Error("Invalid ticker.");
-      }
-      
-      // Add to backend
+      // Add to backend (it rejects unknown tickers against its symbol index)
       const res = await fetch("/api/watchlist", {
         method: "POST",
         headers: {
@@ -251,7 +235,7 @@ export default function WatchlistPage() {
 
           <button
             type="button"
-            onClick={loadStockData}
+            onClick={refreshPrices}
             disabled={refreshing || tickers.length === 0 || loadingWatchlist}
             className={`px-4 py-2 rounded-lg disabled:opacity-50 transition-all ${
               theme === "dark"
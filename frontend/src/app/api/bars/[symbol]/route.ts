@@ -0,0 +1,49 @@
+// frontend/src/app/api/bars/[symbol]/route.ts
+
+import { NextRequest, NextResponse } from "next/server";
+
+export const runtime = "nodejs";
+
+const backend =
+    process.env.API_URL_INTERNAL?.trim() ||
+    process.env.NEXT_PUBLIC_API_URL_BROWSER?.trim() ||
+    "http://localhost:8000";
+
+// GET - OHLCV bars from the backend bar store (?from=YYYY-MM-DD&to=YYYY-MM-DD&timespan=day)
+export async function GET(
+    req: NextRequest,
+    { params }: { params: Promise<{ symbol: string }> }
+) {
+    try {
+        const { symbol } = await params;
+        const cookie = req.headers.get("cookie") ?? "";
+        const authHeader = req.headers.get("authorization");
+
+        const response = await fetch(`${backend}/bars/${encodeURIComponent(symbol)}${req.nextUrl.search}`, {
+            method: "GET",
+            headers: {
+                ...(authHeader ? { Authorization: authHeader } : {}),
+                ...(cookie ? { Cookie: cookie } : {}),
+            },
+            credentials: "include",
+            cache: "no-store",
+        });
+
+        const data = await response.json();
+        const nextRes = NextResponse.json(data, { status: response.status });
+
+        // Forward cookies
+        const setCookie = response.headers.get("set-cookie");
+        if (setCookie) {
+            nextRes.headers.set("set-cookie", setCookie);
+        }
+
+        return nextRes;
+    } catch (err) {
+        console.error("❌ /api/bars/[symbol] GET error:", err);
+        return NextResponse.json(
+            { detail: "Failed to fetch bars" },
+            { status: 500 }
+        );
+    }
+}
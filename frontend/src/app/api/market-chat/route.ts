@@ -15,8 +15,8 @@ export async function GET(req: NextRequest) {
         // ✅ Forward cookies for authentication
         const cookie = req.headers.get("cookie") ?? "";
 
-        // ✅ Call backend to get chat messages
-        const response = await fetch(`${backend}/chat/messages`, {
+        // ✅ Call backend to get a page of chat messages (?before=<id>&limit=<n> pass through)
+        const response = await fetch(`${backend}/chat/messages${req.nextUrl.search}`, {
             method: "GET",
             headers: {
                 "Content-Type": "application/json",
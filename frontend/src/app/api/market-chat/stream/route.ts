@@ -0,0 +1,91 @@
+// frontend/src/app/api/market-chat/stream/route.ts
+
+import { NextRequest, NextResponse } from "next/server";
+
+export const runtime = "nodejs";
+export const dynamic = "force-dynamic";
+
+// POST - Stream a chat reply (Server-Sent Events) from the backend as it is generated
+export async function POST(req: NextRequest) {
+    try {
+        const body = await req.json();
+        const { message } = body;
+
+        if (!message || typeof message !== "string") {
+            return NextResponse.json(
+                { error: "Message is required" },
+                { status: 400 }
+            );
+        }
+
+        // ✅ Determine backend URL: use internal URL if available, otherwise public URL
+        const backend =
+            process.env.API_URL_INTERNAL?.trim() ||
+            process.env.NEXT_PUBLIC_API_URL_BROWSER?.trim() ||
+            "http://localhost:8000";
+
+        // ✅ Forward cookies for authentication
+        const cookie = req.headers.get("cookie") ?? "";
+
+        // ✅ Abort the backend stream when the browser goes away
+        const response = await fetch(`${backend}/chat/message/stream`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                Accept: "text/event-stream",
+                ...(cookie ? { Cookie: cookie } : {}),
+            },
+            body: JSON.stringify({ message }),
+            credentials: "include",
+            cache: "no-store",
+            signal: req.signal,
+        }).catch((err) => {
+            console.error("❌ Network error calling backend:", err);
+            return null;
+        });
+
+        if (!response) {
+            return NextResponse.json(
+                {
+                    error: "Failed to connect to chat service. Please try again later.",
+                    response: "I'm having trouble connecting right now. Please check your connection and try again."
+                },
+                { status: 503 }
+            );
+        }
+
+        if (!response.ok || !response.body) {
+            // Errors before the stream starts (auth, 429, 503) come back as JSON
+            const errorData = await response.json().catch(() => ({}));
+            const errorMessage = errorData.detail || errorData.error || "Failed to process chat message";
+
+            return NextResponse.json(
+                {
+                    error: errorMessage,
+                    response: `Sorry, I encountered an error: ${errorMessage}. Please try again.`
+                },
+                { status: response.status || 502 }
+            );
+        }
+
+        // ✅ Pass the event stream through untouched; no buffering anywhere on the way
+        const headers = new Headers({
+            "Content-Type": "text/event-stream; charset=utf-8",
+            "Cache-Control": "no-cache, no-transform",
+            "X-Accel-Buffering": "no",
+            Connection: "keep-alive",
+        });
+        const setCookie = response.headers.get("set-cookie");
+        if (setCookie) {
+            headers.set("set-cookie", setCookie);
+        }
+
+        return new Response(response.body, { status: 200, headers });
+    } catch (err) {
+        console.error("❌ Market Chat stream error:", err);
+        return NextResponse.json(
+            { error: "Failed to process chat message" },
+            { status: 500 }
+        );
+    }
+}
@@ -8,70 +8,27 @@ function yyyymmdd(d = new Date()) {
   return `${y}-${m}-${day}`
 }
 
-// Fetch company name using ticker search (works on free tier)
-async function fetchTickerName(symbol: string, apiKey: string): Promise<string> {
-  try {
-    // Method 1: Try the direct ticker endpoint first
-    const directUrl = `https://api.polygon.io/v3/reference/tickers/${encodeURIComponent(symbol)}?apiKey=${apiKey}`
-    const directRes = await fetch(directUrl, { cache: 'no-store' })
-    if (directRes.ok) {
-      const data = await directRes.json()
-      if (data?.results?.name) {
-        return data.results.name
-      }
-    }
-    
-    // Method 2: Fallback to search endpoint
-    const searchUrl = `https://api.polygon.io/v3/reference/tickers?ticker=${encodeURIComponent(symbol)}&active=true&limit=1&apiKey=${apiKey}`
-    const searchRes = await fetch(searchUrl, { cache: 'no-store' })
-    if (searchRes.ok) {
-      const data = await searchRes.json()
-      const results = data?.results ?? []
-      if (results.length > 0 && results[0]?.name) {
-        return results[0].name
-      }
-    }
-  } catch {
-    // Silently fail
-  }
-  return ''
-}
+const backend =
+  process.env.API_URL_INTERNAL?.trim() ||
+  process.env.NEXT_PUBLIC_API_URL_BROWSER?.trim() ||
+  'http://localhost:8000'
 
-// Fetch company names for multiple symbols in parallel with concurrency control
-async function fetchTickerNames(symbols: string[], apiKey: string): Promise<Record<string, string>> {
-  const nameMap: Record<string, string> = {}
-  
-  if (!symbols.length) return nameMap
-  
-  // Deduplicate symbols
+// Fetch company names for many symbols in one call to the backend's local symbol index
+async function fetchTickerNames(symbols: string[]): Promise<Record<string, string>> {
   const uniqueSymbols = [...new Set(symbols.filter(Boolean))]
-  
-  // Process in parallel batches to avoid overwhelming the API
-  const concurrency = 15 // Process 15 at a time
-  
-  for (let i = 0; i < uniqueSymbols.length; i += concurrency) {
-    const batch = uniqueSymbols.slice(i, i + concurrency)
-    
-    const results = await Promise.allSettled(
-      batch.map(async (symbol) => {
-        const name = await fetchTickerName(symbol, apiKey)
-        return { symbol, name }
-      })
-    )
-    
-    for (const result of results) {
-      if (result.status === 'fulfilled' && result.value.name) {
-        nameMap[result.value.symbol] = result.value.name
-      }
-    }
-    
-    // Small delay between batches to respect rate limits
-    if (i + concurrency < uniqueSymbols.length) {
-      await new Promise(resolve => setTimeout(resolve, 100))
+  if (!uniqueSymbols.length) return {}
+
+  try {
+    const url = `${backend}/symbols/names?symbols=${encodeURIComponent(uniqueSymbols.join(','))}`
+    const res = await fetch(url, { cache: 'no-store' })
+    if (res.ok) {
+      const data = await res.json()
+      return data?.names ?? {}
     }
+  } catch {
+    // Names are cosmetic; show the table without them
   }
-  
-  return nameMap
+  return {}
 }
 
 export async function GET() {
@@ -101,8 +58,8 @@ export async function GET() {
         ...loserData.map((x: any) => x?.ticker ?? x?.T ?? '')
       ].filter(Boolean)
       
-      // Fetch company names in parallel
-      const nameMap = await fetchTickerNames(allSymbols, key)
+      // Fetch company names (one backend call, no Polygon reference lookups)
+      const nameMap = await fetchTickerNames(allSymbols)
 
       // ✅ Map with names included
       const pick = (arr: any[] = [], n = 50) =>
@@ -159,7 +116,7 @@ export async function GET() {
       ...sortedLosers.map(r => r.symbol)
     ].filter(Boolean)
     
-    const nameMap = await fetchTickerNames(allSymbols, key)
+    const nameMap = await fetchTickerNames(allSymbols)
     
     // Add names to results
     const gainersWithNames = sortedGainers.map(r => ({
@@ -0,0 +1,29 @@
+// frontend/src/app/api/symbols/search/route.ts
+
+import { NextRequest, NextResponse } from "next/server";
+
+export const runtime = "nodejs";
+
+const backend =
+    process.env.API_URL_INTERNAL?.trim() ||
+    process.env.NEXT_PUBLIC_API_URL_BROWSER?.trim() ||
+    "http://localhost:8000";
+
+// GET - Autocomplete from the backend's local symbol index
+export async function GET(req: NextRequest) {
+    try {
+        const response = await fetch(`${backend}/symbols/search${req.nextUrl.search}`, {
+            method: "GET",
+            cache: "no-store",
+        });
+
+        const data = await response.json();
+        return NextResponse.json(data, { status: response.status });
+    } catch (err) {
+        console.error("❌ /api/symbols/search GET error:", err);
+        return NextResponse.json(
+            { detail: "Failed to search symbols" },
+            { status: 500 }
+        );
+    }
+}
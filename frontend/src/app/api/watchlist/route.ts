@@ -9,13 +9,13 @@ const backend =
     process.env.NEXT_PUBLIC_API_URL_BROWSER?.trim() ||
     "http://localhost:8000";
 
-// GET - Fetch user's watchlist
+// GET - Fetch user's watchlist (?enrich=true adds prices from the backend quote cache)
 export async function GET(req: NextRequest) {
     try {
         const cookie = req.headers.get("cookie") ?? "";
         const authHeader = req.headers.get("authorization");
 
-        const response = await fetch(`${backend}/watchlist`, {
+        const response = await fetch(`${backend}/watchlist${req.nextUrl.search}`, {
             method: "GET",
             headers: {
                 ...(authHeader ? { Authorization: authHeader } : {}),
@@ -0,0 +1,41 @@
+// lib/fetchBars.ts
+// Daily OHLCV bars from the backend bar store (local disk reads; upstream only for new bars)
+
+export interface Bar {
+  t: number; // Bar start, epoch milliseconds
+  o: number;
+  h: number;
+  l: number;
+  c: number;
+  v: number;
+}
+
+/**
+ * Fetch bars for a symbol between two days (inclusive)
+ * @param symbol - Ticker symbol (e.g., "AAPL")
+ * @param from - First day, YYYY-MM-DD
+ * @param to - Last day, YYYY-MM-DD
+ * @returns Promise<Bar[]> - Bars oldest first, in the same shape as Polygon aggregates
+ */
+export async function fetchBars(symbol: string, from: string, to: string): Promise<Bar[]> {
+  const params = new URLSearchParams({ from, to, timespan: "day" });
+  const res = await fetch(`/api/bars/${encodeURIComponent(symbol)}?${params}`, {
+    credentials: "include",
+    cache: "no-store",
+  });
+
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data?.detail || `HTTP ${res.status}: Failed to fetch bars`);
+  }
+
+  // The backend answers column-wise; turn it back into rows
+  return (data.t as number[]).map((t, i) => ({
+    t,
+    o: data.o[i],
+    h: data.h[i],
+    l: data.l[i],
+    c: data.c[i],
+    v: data.v[i],
+  }));
+}
@@ -1,4 +1,6 @@
 // lib/fetchStockData.ts
+import { fetchBars } from "@/lib/fetchBars";
+
 export async function fetchStockData(symbol: string, rangeDays: number, polygonKey: string) {
   try {
     const now = new Date();
@@ -8,18 +10,21 @@ export async function fetchStockData(symbol: string, rangeDays: number, polygonK
     const to = now.toISOString().split("T")[0];
 
     // 🧠 Batch API calls concurrently to save time
-    const [refRes, tradeRes, chartRes, newsRes] = await Promise.all([
+    // Chart bars come from the backend bar store instead of a full Polygon range download
+    const [refRes, tradeRes, chartBars, newsRes] = await Promise.all([
       fetch(`https://api.polygon.io/v3/reference/tickers/${symbol}?apiKey=${polygonKey}`),
       fetch(`https://api.polygon.io/v2/last/trade/${symbol}?apiKey=${polygonKey}`),
-      fetch(`https://api.polygon.io/v2/aggs/ticker/${symbol}/range/1/day/${from}/${to}?adjusted=true&sort=asc&apiKey=${polygonKey}`),
+      fetchBars(symbol, from, to).catch((err) => {
+        console.error(`❌ Error fetching bars for ${symbol}:`, err);
+        return [];
+      }),
       fetch(`https://api.polygon.io/v2/reference/news?ticker=${symbol}&limit=5&apiKey=${polygonKey}`)
     ]);
 
     // Parse all JSONs together
-    const [refData, tradeData, chartData, newsData] = await Promise.all([
+    const [refData, tradeData, newsData] = await Promise.all([
       refRes.json(),
       tradeRes.json(),
-      chartRes.json(),
       newsRes.json()
     ]);
 
@@ -27,12 +32,10 @@ export async function fetchStockData(symbol: string, rangeDays: number, polygonK
     return {
       name: refData?.results?.name || symbol,
       price: tradeData?.results?.p || "N/A",
-      chart: chartData?.results
-        ? chartData.results.map((d: any) => ({
-            date: new Date(d.t).toLocaleDateString(),
-            price: d.c,
-          }))
-        : [],
+      chart: chartBars.map((d) => ({
+        date: new Date(d.t).toLocaleDateString(),
+        price: d.c,
+      })),
       news: newsData?.results || []
     };
   } catch (error) {
@@ -9,33 +9,33 @@ export interface StockSearchResult {
 }
 
 /**
- * Search for stocks by company name or ticker symbol using Polygon API
+ * Search for stocks by company name or ticker symbol using the backend's
+ * local symbol index (no Polygon call per keystroke)
  * @param query - Company name (e.g., "Apple") or ticker (e.g., "AAPL")
- * @param polygonKey - Polygon API key
+ * @param _polygonKey - Unused; kept so existing callers don't change
  * @returns Promise<StockSearchResult[]> - Array of matching stocks
  */
 export async function searchStock(
   query: string,
-  polygonKey: string
+  _polygonKey?: string
 ): Promise<StockSearchResult[]> {
-  if (!query.trim() || !polygonKey) {
+  if (!query.trim()) {
     return [];
   }
 
   try {
-    // Use Polygon's tickers search endpoint
-    const searchUrl = `https://api.polygon.io/v3/reference/tickers?search=${encodeURIComponent(query)}&active=true&limit=10&apiKey=${polygonKey}`;
+    const searchUrl = `/api/symbols/search?q=${encodeURIComponent(query.trim())}&limit=10`;
     
-    const response = await fetch(searchUrl, { cache: 'no-store' });
+    const response = await fetch(searchUrl);
     
     if (!response.ok) {
-      console.error('Polygon search API error:', response.status);
+      console.error('Symbol search API error:', response.status);
       return [];
     }
 
     const data = await response.json();
     
-    if (data.status === 'ERROR' || !data.results) {
+    if (!data.results) {
       return [];
     }
 
@@ -43,8 +43,8 @@ export async function searchStock(
     return data.results.map((ticker: any) => ({
       ticker: ticker.ticker || '',
       name: ticker.name || '',
-      market: ticker.market,
-      primary_exchange: ticker.primary_exchange,
+      market: 'stocks',
+      primary_exchange: ticker.exchange ?? undefined,
     }));
   } catch (error) {
     console.error('Error searching stocks:', error);
@@ -57,36 +57,21 @@ export async function searchStock(
  * If query is already a valid ticker, returns it
  * Otherwise, searches for matching companies and returns the best match
  * @param query - Company name or ticker
- * @param polygonKey - Polygon API key
+ * @param _polygonKey - Unused; kept so existing callers don't change
  * @returns Promise<string | null> - Ticker symbol or null if not found
  */
 export async function resolveTicker(
   query: string,
-  polygonKey: string
+  _polygonKey?: string
 ): Promise<string | null> {
-  if (!query.trim() || !polygonKey) {
+  if (!query.trim()) {
     return null;
   }
 
   const trimmedQuery = query.trim().toUpperCase();
 
-  // First, try direct ticker lookup (fast path)
-  try {
-    const tickerUrl = `https://api.polygon.io/v3/reference/tickers/${trimmedQuery}?apiKey=${polygonKey}`;
-    const tickerRes = await fetch(tickerUrl, { cache: 'no-store' });
-    
-    if (tickerRes.ok) {
-      const tickerData = await tickerRes.json();
-      if (tickerData.results?.ticker) {
-        return tickerData.results.ticker;
-      }
-    }
-  } catch (error) {
-    // Fall through to search
-  }
-
-  // If direct lookup fails, search by name
-  const results = await searchStock(query, polygonKey);
+  // The backend ranks an exact ticker match first
+  const results = await searchStock(query);
   
   if (results.length === 0) {
     return null;
@@ -101,4 +86,3 @@ export async function resolveTicker(
   // Otherwise, return the first result (best match)
   return results[0].ticker;
 }
-